@@ -0,0 +1,242 @@
+import csv
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from gpkit import ureg as u
+import numpy as np
+
+from .Store import ResultStore
+from .Sweep import Sweep, design_model
+from ..Performance.Mission import MISSION_PROFILE
+
+
+# Case columns that change the model's structure (anything else is a substitution, see split_case)
+# Mission columns apply to the design cruise - the first Cruise leg of the profile
+STRUCTURE       = ("emp_config",)
+MISSION         = {"cruise_range": ("cruise_range", u.km), "cruise_alt": ("alt", u.ft), "cruise_mach": ("mach", None)}
+
+# Aircraft.setup hyperparameters are Variables, so they're substituted rather than rebuilt
+HYPERPARAMETERS = ("CL_max", "CL_clean", "AR", "e")
+
+RESULT_COLUMNS  = ("cost", "feasible", "error")
+
+
+def read_cases(path):
+    """
+    Design cases from a CSV (one case per row, header = column names) or JSON file (a list of
+    objects, or {"cases": [...]}) - returns a list of {column: value}, numbers as floats.
+    Empty CSV cells are left out, so that case gets the model's default.
+    """
+    path = Path(path)
+
+    if path.suffix.lower() == ".json":
+        cases = json.loads(path.read_text())
+        cases = cases["cases"] if isinstance(cases, dict) else cases
+
+    else:
+        with open(path, newline="") as f:
+            cases = [{k.strip(): number(v) for k, v in row.items() if v not in ("", None)} for row in csv.DictReader(f)]
+
+    return [dict(case) for case in cases]
+
+
+def number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value.strip()
+
+
+def split_case(case):
+    """(structure, substitutions) for a case - structure is the design_model kwargs, hashable"""
+    structure       = {k: case[k] for k in STRUCTURE if k in case}
+    mission         = {k: case[k] for k in MISSION if k in case}
+    substitutions   = {f"Aircraft.{k}" if k in HYPERPARAMETERS else k: v for k, v in case.items()
+                       if k not in STRUCTURE and k not in MISSION and k != "case"}
+
+    if mission:
+        structure["profile"] = mission_profile(**mission)
+
+    return tuple(sorted(structure.items(), key=lambda kv: kv[0])), substitutions
+
+
+def mission_profile(profile=MISSION_PROFILE, **mission):
+    """MISSION_PROFILE with the design cruise changed, e.g. mission_profile(cruise_range=3000) - units as in MISSION"""
+    profile = [(segment, dict(kwargs)) for segment, kwargs in profile]
+    cruise  = next(kwargs for segment, kwargs in profile if segment == "Cruise")
+
+    for column, value in mission.items():
+        name, units     = MISSION[column]
+        cruise[name]    = value * units if units else value
+
+    # Tuples all the way down, so the profile can key the per-worker model cache
+    return tuple((segment, tuple(sorted(kwargs.items()))) for segment, kwargs in profile)
+
+
+
+# One Sweep per builder, outputs and model structure per worker process - built the first time a case needs it
+_models     = {}
+_outputs    = ()
+_builder    = design_model
+
+
+def _init_worker(outputs, builder=design_model):
+    global _outputs, _builder
+    _outputs, _builder = tuple(outputs), builder
+
+
+def _model(structure):
+    key = (_builder, _outputs, structure)
+
+    if key not in _models:
+        kwargs = dict(structure)
+        if "profile" in kwargs:
+            kwargs["profile"] = [(segment, dict(items)) for segment, items in kwargs["profile"]]
+
+        _models[key] = Sweep(_builder(**kwargs), outputs=_outputs, warm_start=False)
+
+    return _models[key]
+
+
+def _solve_cases(index, cases):
+    """Solves cases on this worker - failures come back as rows with an error, never as exceptions"""
+    rows = []
+
+    for i, case in zip(index, cases):
+        row = {"case": int(i), **case, **{o: np.nan for o in _outputs}, "cost": np.nan, "feasible": False, "error": ""}
+
+        try:
+            structure, substitutions = split_case(case)
+            table   = _model(structure).run({name: [value] for name, value in substitutions.items()})
+            row.update({name: np.asarray(table[name][0]).tolist() for name in (*_outputs, "cost", "feasible", "error")})
+        except Exception as err:                                    # noqa - anything the solver throws is recorded
+            row["error"] = repr(err)
+
+        rows.append(row)
+
+    return rows
+
+
+def solve_cases(cases, outputs=("Aircraft.M_0", "Aircraft.T0_W0"), workers=None, chunksize=4, builder=design_model):
+    """
+    Solves design cases on a process pool - yields one row per case as it finishes
+
+    Cases are sorted by structure (see split_case) before they're chunked, so a chunk mostly needs
+    one model - each worker builds a model the first time it meets that structure, and keeps it.
+    Rows carry the case index ("case"), its columns, the outputs, cost, feasible and error ("" if
+    it solved). workers=1 solves in this process. builder(**structure) builds the model - a
+    module-level function, so the pool can pickle it.
+    """
+    workers = workers or os.cpu_count()
+    order   = sorted(range(len(cases)), key=lambda i: repr(split_case(cases[i])[0]))
+    chunks  = [order[i:i + chunksize] for i in range(0, len(order), chunksize)]
+
+    if workers == 1:
+        _init_worker(outputs, builder)
+        for chunk in chunks:
+            yield from _solve_cases(chunk, [cases[i] for i in chunk])
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(tuple(outputs), builder)) as pool:
+        futures = [pool.submit(_solve_cases, chunk, [cases[i] for i in chunk]) for chunk in chunks]
+
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+
+class CSVResults:
+    """Streams rows to a CSV file (or stdout for "-"), flushing every row"""
+
+    def __init__(self, path, columns):
+        self.file   = sys.stdout if str(path) == "-" else open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=list(columns), extrasaction="ignore")
+        self.writer.writeheader()
+
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+
+class ParquetResults:
+    """Streams rows to a Parquet file, one row group every batch rows - needs pyarrow"""
+
+    def __init__(self, path, columns, batch=64):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as err:
+            raise ImportError("Parquet output needs pyarrow - pip install pyarrow, or write .csv") from err
+
+        self.pa, self.pq    = pa, pq
+        self.path           = path
+        self.columns        = list(columns)
+        self.batch          = batch
+        self.rows           = []
+        self.writer         = None
+
+
+    def write(self, row):
+        self.rows.append({c: row.get(c) for c in self.columns})
+        if len(self.rows) >= self.batch:
+            self.flush()
+
+
+    def flush(self):
+        if not self.rows:
+            return
+
+        # Schema is fixed by the first row group - later ones are cast to it
+        table       = self.pa.Table.from_pylist(self.rows, schema=self.writer.schema if self.writer else None)
+        self.writer = self.writer or self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.rows   = []
+
+
+    def close(self):
+        self.flush()
+        if self.writer:
+            self.writer.close()
+
+
+
+def results_writer(path, columns):
+    """CSVResults, ParquetResults or a ResultStore directory, by the file extension"""
+    suffix = Path(str(path)).suffix.lower()
+    if suffix == ".parquet":
+        return ParquetResults(path, columns)
+    if suffix == ".store":
+        return ResultStore(path)
+
+    return CSVResults(path, columns)
+
+
+def run_batch(cases, output="-", outputs=("Aircraft.M_0", "Aircraft.T0_W0"), workers=None, chunksize=4, builder=design_model):
+    """Solves cases and streams the rows to output - returns (solved, failed) counts"""
+    columns = ["case", *dict.fromkeys(k for case in cases for k in case), *outputs, *RESULT_COLUMNS]
+    writer  = results_writer(output, columns)
+    solved  = failed = 0
+
+    try:
+        for row in solve_cases(cases, outputs, workers, chunksize, builder):
+            writer.write(row)
+            solved += row["feasible"]
+            failed += not row["feasible"]
+
+            if row["error"]:
+                logging.warning(f"Case {row['case']} failed: {row['error']}")
+    finally:
+        writer.close()
+
+    return solved, failed
@@ -0,0 +1,584 @@
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import time
+
+import gpkit
+from gpkit import ureg as u
+from gpkit.constraints.gp import DEFAULT_SOLVER_KWARGS, MonoEqualityIndexes, _get_solver, fulfill_meq_bounds, gen_meq_bounds
+from gpkit.constraints.set import ConstraintSet
+from gpkit.exceptions import Infeasible, PrimalInfeasible, UnboundedGP, UnknownInfeasible
+from gpkit.globals import NamedVariables
+from gpkit.keydict import KeySet
+from gpkit.nomials.substitution import parse_subs
+from gpkit.small_classes import CootMatrix
+import numpy as np
+
+from .Sweep import design_model
+
+
+# Model source that decides the structure of the compiled program - any edit here invalidates the cache
+MODEL_PACKAGES  = ("Components", "Performance", "Subsystems", "Regulations")
+MODELS_DIR      = Path(__file__).resolve().parent.parent
+CACHE_FORMAT    = 3                                         # Bump when CompiledProgram.save changes
+
+DEFAULT_CACHE   = Path(os.environ.get("PYAVD_CACHE", Path.home() / ".cache" / "pyavd" / "programs"))
+SOLUTION_CACHE  = os.environ.get("PYAVD_SOLUTION_CACHE")     # Directory for SolutionCache's disk tier - off if unset
+
+
+def structure_key(builder=design_model, **structure):
+    """
+    Content hash of everything that decides a program's structure - the model source files,
+    the builder (and the file it's in) and its (structural) arguments, gpkit and the cache format.
+    Computed without building anything, so a cache hit never touches the model tree.
+    """
+    sha = hashlib.sha256()
+
+    for package in MODEL_PACKAGES:
+        for path in sorted((MODELS_DIR / package).glob("*.py")):
+            sha.update(path.name.encode())
+            sha.update(path.read_bytes())
+
+    source = inspect.getsourcefile(builder)
+    if source:
+        sha.update(Path(source).read_bytes())
+
+    sha.update(f"{builder.__module__}.{builder.__qualname__}".encode())
+    sha.update(repr(sorted(structure.items())).encode())
+    sha.update(f"gpkit {gpkit.__version__} format {CACHE_FORMAT}".encode())
+
+    return sha.hexdigest()[:32]
+
+
+def magnitude(value, units):
+    """Plain float in the variable's own units"""
+    if hasattr(value, "to"):
+        return float(value.to(units or "dimensionless").magnitude)
+
+    return float(value)
+
+
+def compile_rows(hmaps, varkeys, substitutions, context=None):
+    """
+    Posynomial hmaps (<= 1) --> (names, units, c, row, col, data, k, meq, defaults, linked, default_units) - the
+    CompiledProgram arguments, columns in order of first appearance like gpkit's own varlocs
+
+    context is any other fixed values ({name: value}) linked functions might read
+    """
+    columns = {}
+    for hmap in hmaps:
+        for exp in hmap:
+            for vk in exp:
+                columns.setdefault(vk, len(columns))
+
+    names   = [str(vk) for vk in columns]
+    if len(set(names)) != len(names):
+        raise ValueError("Variable names aren't unique - the program can't be cached by name")
+
+    c, row, col, data, k, meq = [], [], [], [], [], []
+    for hmap in hmaps:
+        if getattr(hmap, "from_meq", False):
+            meq.append(len(c))
+
+        k.append(len(hmap))
+        for exp, coeff in hmap.items():
+            for vk, power in exp.items():
+                row.append(len(c))
+                col.append(columns[vk])
+                data.append(power)
+            c.append(coeff)
+
+    # Fixed values and linked functions, in each variable's own units
+    constants, sweep, linked = parse_subs(varkeys, substitutions)
+    if sweep:
+        raise ValueError("Sweeping substitutions can't be compiled - use Sweep instead")
+
+    # (constants that only feed linked functions never make it into A, but are still kept here)
+    defaults    = {str(vk): magnitude(v, vk.units) for vk, v in constants.items()}
+    units       = {str(vk): str(vk.units or "") for vk in constants}
+    linked      = {str(vk): LinkedFunction.from_function(fn, {**(context or {}), **defaults}) for vk, fn in linked.items()}
+
+    return names, [str(vk.units or "") for vk in columns], c, row, col, data, k, meq, defaults, linked, units
+
+
+
+class LinkedFunction:
+    """
+    A linked Variable's function (e.g. lambda c: c[e] + de) stored as numbers - every linked
+    function in the models is affine in the variables it reads, so it's kept as an intercept plus
+    a slope per input, found by calling it at compile time. Nothing but numbers goes to disk.
+    """
+
+    def __init__(self, intercept, slopes):
+        self.intercept  = float(intercept)
+        self.slopes     = dict(slopes)
+
+    @classmethod
+    def from_function(cls, fn, values):
+        """Probes fn around values ({name: value}, which has to hold everything fn reads)"""
+        reads   = _Reads(values)
+        try:
+            base = magnitude(fn(reads), None)
+        except KeyError as err:
+            raise TypeError(f"Linked function reads {err} which has no fixed value") from None
+
+        slopes      = {name: magnitude(fn(_Reads({**values, name: values[name] + 1})), None) - base for name in reads.names}
+        intercept   = base - sum(slope * values[name] for name, slope in slopes.items())
+        linked      = cls(intercept, slopes)
+
+        # Anything nonlinear shows up away from the probe point
+        other = {name: 1.5 * values[name] + 0.37 for name in reads.names}
+        if not np.isclose(linked({**values, **other}), magnitude(fn(_Reads({**values, **other})), None), rtol=1e-9, atol=1e-12):
+            raise TypeError("Can't cache a linked function that isn't affine in its inputs")
+
+        return linked
+
+    def __call__(self, values):
+        return self.intercept + sum(slope * values[name] for name, slope in self.slopes.items())
+
+
+class _Reads(dict):
+    """{name: value} that linked functions index with Variables - records which names they read"""
+
+    def __init__(self, values):
+        super().__init__(values)
+        self.names = []
+
+    def __getitem__(self, key):
+        name = str(getattr(key, "key", key))
+        if name not in self.names:
+            self.names.append(name)
+
+        return super().__getitem__(name)
+
+
+
+class CompiledProgram:
+    """
+    A GP compiled with nothing substituted - exponents over every variable (free and fixed),
+    so new substitutions are folded into the coefficients at solve time without the model tree
+
+    Columns of A are variables (names/units), rows are monomials, k counts monomials per
+    posynomial (cost first), meq marks the first monomial of each monomial-equality half.
+    default_units are the units of the fixed values, columns or not.
+    """
+
+    def __init__(self, names, units, c, row, col, data, k, meq, defaults, linked, default_units=None):
+        self.names      = list(names)
+        self.units      = list(units)
+        from scipy.sparse import csr_matrix
+
+        self.c          = np.asarray(c, dtype=float)
+        self.A          = csr_matrix((data, (row, col)), shape=(len(self.c), len(self.names)))
+        self.k          = np.asarray(k, dtype=int)
+        self.meq        = list(meq)
+        self.defaults   = dict(defaults)
+        self.linked     = dict(linked)
+        self.default_units = dict(default_units or {})
+        self.index      = {n: i for i, n in enumerate(self.names)}
+
+
+    @classmethod
+    def from_model(cls, model):
+        """Compiles model - raises InvalidGPConstraint for signomial models"""
+        return cls(*compile_rows([model.cost.hmap] + list(ConstraintSet.as_hmapslt1(model, {})), model.varkeys, model.substitutions))
+
+
+    @classmethod
+    def from_blocks(cls, blocks):
+        """
+        Splices compiled blocks (see ProgramBlock) into one program - columns are matched by variable
+        name, so a block can be recompiled on its own and spliced back in. The cost's block goes first.
+        """
+        names   = list(dict.fromkeys(name for block in blocks for name in block.names))
+        index   = {name: i for i, name in enumerate(names)}
+        units   = {name: unit for block in blocks for name, unit in zip(block.names, block.units)}
+
+        c, row, col, data, k, meq = [], [], [], [], [], []
+        defaults, linked, default_units, offset = {}, {}, {}, 0
+
+        for block in blocks:
+            c.append(block.c)
+            row.append(block.row + offset)
+            col.append(np.array([index[name] for name in block.names], dtype=int)[block.col] if block.names else block.col)
+            data.append(block.data)
+            k.append(block.k)
+            meq.extend(np.asarray(block.meq, dtype=int) + offset)
+            defaults.update(block.defaults)
+            linked.update(block.linked)
+            default_units.update(block.default_units)
+            offset += len(block.c)
+
+        return cls(names, [units[name] for name in names], np.concatenate(c), np.concatenate(row), np.concatenate(col),
+                   np.concatenate(data), np.concatenate(k), [int(i) for i in meq], defaults, linked, default_units)
+
+
+    def save(self, path):
+        A       = self.A.tocoo()
+        meta    = {"names": self.names, "units": self.units, "meq": self.meq, "defaults": self.defaults,
+                   "linked": {n: [f.intercept, f.slopes] for n, f in self.linked.items()}, "default_units": self.default_units}
+
+        # Write-then-rename so a concurrent reader never sees half a file
+        tmp     = Path(f"{path}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, c=self.c, row=A.row, col=A.col, data=A.data, k=self.k, meta=np.array(json.dumps(meta)))
+        os.replace(tmp, path)
+
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as npz:
+            meta    = json.loads(str(npz["meta"]))
+            linked  = {n: LinkedFunction(*args) for n, args in meta["linked"].items()}
+
+            return cls(meta["names"], meta["units"], npz["c"], npz["row"], npz["col"], npz["data"], npz["k"],
+                       meta["meq"], meta["defaults"], linked, meta["default_units"])
+
+
+    def values(self, substitutions=None):
+        """Fixed values by name - defaults, then substitutions (names or {name: quantity}), then linked functions"""
+        values = dict(self.defaults)
+
+        for name, value in (substitutions or {}).items():
+            name = str(getattr(name, "key", name))
+            if name not in self.index and name not in self.defaults:
+                raise KeyError(f"'{name}' is not a variable of this program")
+            units        = self.units[self.index[name]] if name in self.index else self.default_units.get(name)
+            values[name] = magnitude(value, units or None)
+
+        for name, fn in self.linked.items():
+            values[name] = fn(values)
+
+        return values
+
+
+    def substitute(self, substitutions=None):
+        """
+        Folds fixed values into the coefficients - returns (c, A, k, meq_idxs, free names),
+        ready for a gpkit solver. Posynomials left without free variables are checked and dropped.
+        """
+        values  = self.values(substitutions)
+        fixed   = np.zeros(len(self.names), dtype=bool)
+        logv    = np.zeros(len(self.names))
+
+        for name, value in values.items():
+            if name in self.index:
+                fixed[self.index[name]] = True
+                logv[self.index[name]]  = np.log(value)
+
+        c       = self.c * np.exp(self.A @ logv)
+        A       = self.A[:, ~fixed].tocsr()
+        free    = [n for n, f in zip(self.names, fixed) if not f]
+        nfree   = np.diff(A.indptr)
+
+        starts  = np.concatenate([[0], np.cumsum(self.k)[:-1]])
+        keep, k, meq_idxs = [], [], MonoEqualityIndexes()
+
+        for p, (start, n) in enumerate(zip(starts, self.k)):
+            rows = np.arange(start, start + n)
+
+            if p and not nfree[rows].any():
+                if c[rows].sum() > 1 + 1e-9:
+                    raise PrimalInfeasible(f"Posynomial {p} became the infeasible constant {c[rows].sum():.4g} <= 1")
+                continue
+
+            if start in self.meq:
+                meq_idxs.all.add(len(keep))
+                if len(meq_idxs.all) > 2 * len(meq_idxs.first_half):
+                    meq_idxs.first_half.add(len(keep))
+
+            keep.extend(rows)
+            k.append(int(n))
+
+        A       = A[keep].tocoo()
+        row, col, data = list(A.row), list(A.col), list(A.data)
+
+        # Space out A with constant monomials, as gpkit does for mosek
+        for i in np.flatnonzero(np.diff(A.tocsr().indptr) == 0):
+            row.append(int(i)); col.append(0); data.append(0.0)
+
+        return c[keep], CootMatrix(row, col, data), k, meq_idxs, free
+
+
+    @staticmethod
+    def check_bounds(A, meq_idxs, free):
+        """Raises UnboundedGP if a free variable has no upper or lower bound - GeometricProgram.check_bounds on substitute()'s output"""
+        exps = [{} for _ in range(max(A.row, default=-1) + 1)]
+        for i, j, x in zip(A.row, A.col, A.data):
+            if x:
+                exps[i][free[j]] = x
+
+        missing = {}
+        for name in free:
+            signs = {np.sign(exp[name]) for i, exp in enumerate(exps) if name in exp and i not in meq_idxs.all}
+            if 1 not in signs:
+                missing[(name, "upper")] = "."
+            if -1 not in signs:
+                missing[(name, "lower")] = "."
+
+        if missing:
+            fulfill_meq_bounds(missing, gen_meq_bounds(missing, exps, meq_idxs))
+        if missing:
+            raise UnboundedGP("\n\n".join(f"{name} has no {bound} bound{why}" for (name, bound), why in missing.items()))
+
+
+    def solve(self, substitutions=None, solver=None, **kwargs):
+        """
+        Solves with new substitutions - returns {"cost", "variables" (by name), "soltime"}. Fails like
+        GeometricProgram.solve - UnboundedGP before solving, Infeasible (or a subclass) if the solver can't.
+        """
+        c, A, k, meq_idxs, free = self.substitute(substitutions)
+        p_idxs  = np.repeat(np.arange(len(k)), k).astype("int32")
+        self.check_bounds(A, meq_idxs, free)
+
+        solvername, solverfn = _get_solver(solver, kwargs)
+        kwargs  = {**DEFAULT_SOLVER_KWARGS.get(solvername, {}), **kwargs}
+        tic     = time()
+
+        # Solvers print their iterations - keep that out of the way, like GeometricProgram.solve does
+        try:
+            with redirect_stdout(io.StringIO()):
+                out = solverfn(c=c, A=A, k=k, meq_idxs=meq_idxs, p_idxs=p_idxs, **kwargs)
+        except Infeasible as err:
+            raise err.__class__(f"{solvername} couldn't solve the program ({err!r})") from err
+        except Exception as err:                                    # noqa - as gpkit does, anything else is unknown
+            raise UnknownInfeasible("Something unexpected went wrong.") from err
+
+        variables = self.values(substitutions)
+        variables.update(zip(free, np.exp(out["primal"])))
+
+        return {"cost": float(out["objective"]), "variables": variables, "soltime": time() - tic, "solver": solvername}
+
+
+
+class ProgramBlock:
+    """
+    Compiled rows of part of a model (a list of constraints, or just the cost) - columns are local
+    and named, so blocks are recompiled independently and spliced with CompiledProgram.from_blocks
+
+    Fixed values live in the Models rather than the constraints, so they're passed in - only those
+    of the constraints' variables and the extra varkeys (e.g. ones only linked functions use) are kept.
+    context is fixed values from other blocks, for linked functions that read across (see compile_rows).
+    """
+
+    def __init__(self, constraints=(), cost=None, substitutions=None, varkeys=(), context=None):
+        constraints = ConstraintSet(list(constraints))
+        hmaps       = ([cost.hmap] if cost is not None else []) + list(constraints.as_hmapslt1({}))
+        varkeys     = KeySet([*constraints.varkeys, *varkeys])
+
+        (self.names, self.units, c, row, col, data, k, meq,
+         self.defaults, self.linked,
+         self.default_units)            = compile_rows(hmaps, varkeys, substitutions if substitutions is not None else constraints.substitutions, context)
+
+        self.c      = np.asarray(c, dtype=float)
+        self.row    = np.asarray(row, dtype=int)
+        self.col    = np.asarray(col, dtype=int)
+        self.data   = np.asarray(data, dtype=float)
+        self.k      = np.asarray(k, dtype=int)
+        self.meq    = list(meq)
+
+
+    def __len__(self):
+        return len(self.c)
+
+
+
+class ProgramCache:
+    """
+    Content-addressed, on-disk cache of compiled programs
+
+    >>> cache   = ProgramCache()
+    >>> program = cache.load(design_model, emp_config="T-tail")     # builds + compiles on the first run only
+    >>> sol     = program.solve({"Aircraft.AR": 9.0})
+
+    Only structural arguments go to load() - anything that is a Variable goes in the substitutions.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self.hits   = 0
+        self.misses = 0
+
+
+    def path(self, key):
+        return self.directory / f"{key}.npz"
+
+
+    def load(self, builder=design_model, **structure):
+        key     = structure_key(builder, **structure)
+        path    = self.path(key)
+
+        if path.exists():
+            try:
+                program = CompiledProgram.load(path)
+                self.hits += 1
+                return program
+            except (OSError, ValueError, KeyError) as err:
+                logging.warning(f"Corrupt program cache entry {path.name} ({err!r}) - rebuilding")
+
+        self.misses += 1
+
+        # Programs are keyed by name, so the model numbers start again - "Aircraft.M_0" whatever was built before
+        NamedVariables.reset_modelnumbers()
+        program = CompiledProgram.from_model(builder(**structure))
+
+        try:
+            program.save(path)
+        except OSError as err:
+            logging.warning(f"Couldn't write program cache entry {path.name}: {err!r}")
+
+        return program
+
+
+    def clear(self):
+        for path in self.directory.glob("*.npz"):
+            path.unlink()
+
+
+
+def canonical(value):
+    """JSON-ready, order-independent form of substitutions / structure - quantities in base units"""
+    if isinstance(value, dict):
+        return {str(getattr(k, "key", k)): canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(getattr(kv[0], "key", kv[0])))}
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if hasattr(value, "to_base_units"):
+        value = value.to_base_units()
+        return {"value": canonical(value.magnitude), "units": str(value.units)}
+    if isinstance(value, np.ndarray):
+        return canonical(value.tolist())
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.number)):
+        return repr(float(value))
+
+    return str(value)
+
+
+
+class SolutionCache:
+    """
+    Solutions by everything that decides them - the model source, the builder and its structure
+    (including the mission profile) and the substitutions - in a size-bounded LRU in memory, and
+    optionally on disk behind it
+
+    Solving goes through a ProgramCache, so a miss doesn't rebuild the model tree either (after
+    the first time). Failed solves aren't cached. Safe to share between threads, e.g. every
+    Streamlit session served by one process (see solution_cache).
+
+    >>> cache   = SolutionCache(directory="~/.cache/pyavd/solutions")
+    >>> sol     = cache.solve({"Aircraft.AR": 9.0}, emp_config="T-tail")
+    >>> sol["variables"]["Aircraft.M_0"]
+    """
+
+    def __init__(self, max_entries=256, directory=SOLUTION_CACHE, programs=None):
+        self.max_entries    = max_entries
+        self.directory      = Path(directory).expanduser() if directory else None
+        self.programs       = programs or ProgramCache()
+        self.entries        = OrderedDict()
+        self.lock           = threading.Lock()
+        self.sources        = {}        # structure_key(builder) - the model source is only hashed once per process
+
+        self.hits   = 0
+        self.misses = 0
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+
+    def key(self, substitutions=None, builder=design_model, **structure):
+        if builder not in self.sources:
+            self.sources[builder] = structure_key(builder)
+
+        payload = {"model": self.sources[builder], "structure": canonical(structure), "substitutions": canonical(substitutions or {})}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:32]
+
+
+    def get(self, key):
+        """Cached solution or None - memory first, then disk (which promotes it back into memory)"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        path = self.directory / f"{key}.json" if self.directory else None
+        if path and path.exists():
+            try:
+                sol = json.loads(path.read_text())
+            except (OSError, ValueError) as err:
+                logging.warning(f"Corrupt solution cache entry {path.name} ({err!r}) - ignoring it")
+                return None
+
+            self.put(key, sol, disk=False)
+            return sol
+
+        return None
+
+
+    def put(self, key, sol, disk=True):
+        with self.lock:
+            self.entries[key] = sol
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        if disk and self.directory:
+            # Write-then-rename, like ProgramCache, so another process never reads half a file
+            path    = self.directory / f"{key}.json"
+            tmp     = Path(f"{path}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                tmp.write_text(json.dumps(sol))
+                os.replace(tmp, path)
+            except OSError as err:
+                logging.warning(f"Couldn't write solution cache entry {path.name}: {err!r}")
+
+
+    def solve(self, substitutions=None, builder=design_model, solver=None, **structure):
+        """CompiledProgram.solve's {"cost", "variables", "soltime", "solver"} - from the cache if it's been solved before"""
+        key = self.key(substitutions, builder, **structure)
+        sol = self.get(key)
+
+        if sol is not None:
+            self.hits += 1
+            return sol
+
+        self.misses += 1
+        sol = self.programs.load(builder, **structure).solve(substitutions, solver)
+        self.put(key, sol)
+
+        return sol
+
+
+    def clear(self, disk=False):
+        with self.lock:
+            self.entries.clear()
+
+        if disk and self.directory:
+            for path in self.directory.glob("*.json"):
+                path.unlink()
+
+
+
+# One SolutionCache per process, shared by everything in it - see solution_cache
+_solutions = None
+_solutions_lock = threading.Lock()
+
+
+def solution_cache(**kwargs):
+    """The process-wide SolutionCache, made with kwargs (see SolutionCache) the first time it's asked for"""
+    global _solutions
+
+    with _solutions_lock:
+        if _solutions is None:
+            _solutions = SolutionCache(**kwargs)
+
+    return _solutions
@@ -0,0 +1,109 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .Sweep import Sweep, design_model
+
+
+# One Sweep (and so one model tree) per worker process, built by the pool initializer
+_worker = None
+
+
+def _init_worker(builder, structure, outputs):
+    global _worker
+    _worker = Sweep(builder(**structure), outputs=outputs)
+
+
+def _solve_chunk(index, points):
+    """Solves a chunk of points on this worker's model - failures come back as rows, never as exceptions"""
+    try:
+        table = _worker.run(points)
+    except Exception as err:                                        # noqa - anything the solver throws is recorded
+        n       = len(index)
+        table   = {**points, **{o: np.full(n, np.nan) for o in _worker.outputs}, "cost": np.full(n, np.nan),
+                   "feasible": np.zeros(n, dtype=bool), "error": np.full(n, repr(err))}
+
+    return [{"index": int(i), **{name: np.asarray(column[j]).tolist() for name, column in table.items() if name != "warm_start"}}
+            for j, i in enumerate(index)]
+
+
+def explore(axes, outputs=("Aircraft.M_0",), builder=design_model, structure=None, workers=None, chunksize=8):
+    """
+    Full-factorial design-space exploration on a process pool
+
+    axes is {parameter: 1D values}, e.g. {"Aircraft.W0_S": ..., "Aircraft.T0_W0": ..., "Aircraft.AR": ...}.
+    Each worker builds builder(**structure) once and re-solves it for every point it's handed
+    (see Sweep). Yields one row per point in completion order - "index" is the flat (C-order)
+    grid index, infeasible points have feasible=False and NaN outputs.
+    """
+    points  = Sweep.grid(**axes)
+    n       = len(next(iter(points.values())))
+    workers = workers or os.cpu_count()
+
+    # Neighbouring points go to the same worker, which keeps its warm starts useful
+    chunks  = [np.arange(i, min(i + chunksize, n)) for i in range(0, n, chunksize)]
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(builder, structure or {}, tuple(outputs))) as pool:
+        futures = [pool.submit(_solve_chunk, idx, {name: v[idx] for name, v in points.items()}) for idx in chunks]
+
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def collect(rows, axes, output="Aircraft.M_0"):
+    """Puts streamed rows back on the grid - returns an array of shape (len(axis) for axis in axes), NaN where infeasible"""
+    grid = np.full([len(v) for v in axes.values()], np.nan)
+
+    for row in rows:
+        if row["feasible"]:
+            grid.flat[row["index"]] = row[output]
+
+    infeasible = np.isnan(grid).sum()
+    if infeasible:
+        logging.info(f"{infeasible} of {grid.size} points were infeasible")
+
+    return grid
+
+
+def carpet(z, a, b, cheater=1.0):
+    """
+    Carpet plot lines for z(a, b) - a 2D slice of a collected grid
+
+    The horizontal axis is the usual 'cheater' axis x = i + cheater * j (i, j are the indices
+    into a and b), so lines of constant a and constant b form the carpet. Returns
+    {"a": [(value, x, z), ...], "b": [(value, x, z), ...]} - NaNs (infeasible) break the lines.
+    """
+    i, j    = np.meshgrid(np.arange(len(a)), np.arange(len(b)), indexing="ij")
+    x       = i + cheater * j
+
+    return {"a": [(a[n], x[n, :], z[n, :]) for n in range(len(a))],
+            "b": [(b[n], x[:, n], z[:, n]) for n in range(len(b))]}
+
+
+def carpet_plot(grid, axes, output="Aircraft.M_0", cheater=1.0):
+    """One carpet (first two axes) per value of the third axis - returns the matplotlib figure"""
+    import matplotlib.pyplot as plt
+
+    (a_name, a), (b_name, b), (c_name, c) = list(axes.items())[:3]
+    fig, subplots = plt.subplots(1, len(c), figsize=(5 * len(c), 4), sharey=True, squeeze=False)
+
+    for n, ax in enumerate(subplots[0]):
+        lines = carpet(grid[:, :, n], a, b, cheater)
+
+        for value, x, z in lines["a"]:
+            ax.plot(x, z, "b-")
+            ax.annotate(f"{a_name.split('.')[-1]}={value:.3g}", (x[-1], z[-1]), fontsize=7, color="b")
+
+        for value, x, z in lines["b"]:
+            ax.plot(x, z, "r-")
+            ax.annotate(f"{b_name.split('.')[-1]}={value:.3g}", (x[0], z[0]), fontsize=7, color="r")
+
+        ax.set_title(f"{c_name.split('.')[-1]} = {c[n]:.3g}")
+        ax.set_xticks([])
+
+    subplots[0][0].set_ylabel(output)
+    fig.tight_layout()
+
+    return fig
@@ -0,0 +1,178 @@
+import contextlib
+import logging
+from time import perf_counter
+
+from gpkit import Model, Vectorize
+from gpkit.constraints.set import ConstraintSet
+from gpkit.globals import NamedVariables
+
+from .Cache import CompiledProgram, ProgramBlock
+from ..Components import Aircraft
+from ..Performance import Mission
+from ..Performance.Mission import MISSION_PROFILE
+from ..Performance.Segments import Segment
+
+
+@contextlib.contextmanager
+def rebuilding(model, vectorize=None):
+    """
+    Builds in model's place in the tree - same lineage and model number, so the new model's VarKeys
+    equal the old one's and every constraint outside it still refers to the right variables
+    """
+    parent, (name, num) = model.lineage[:-1], model.lineage[-1]
+    lineage             = NamedVariables.lineage
+    count               = NamedVariables.modelnums[(parent, name)]
+
+    # Counters below the old model start again, so its children come back with their old numbers too
+    below = {key: n for key, n in NamedVariables.modelnums.items() if key[0][:len(model.lineage)] == model.lineage}
+    for key in below:
+        del NamedVariables.modelnums[key]
+
+    NamedVariables.lineage                      = parent
+    NamedVariables.modelnums[(parent, name)]    = num
+
+    try:
+        with Vectorize(vectorize) if vectorize else contextlib.nullcontext():
+            yield
+    finally:
+        NamedVariables.lineage                      = lineage
+        NamedVariables.modelnums[(parent, name)]    = count
+        for key, n in below.items():
+            NamedVariables.modelnums[key] = max(n, NamedVariables.modelnums[key])
+
+
+
+class IncrementalModel:
+    """
+    The Aircraft + Mission design model (see design_model) compiled in blocks, so an edit only
+    rebuilds and recompiles the part of the model tree it touches
+
+    Blocks are the cost, Aircraft's own constraints, each component, Mission's own constraints,
+    each Segment (one per segment type, with its State and AircraftPerformance) and each
+    component's dynamic model in each Segment. Editing a leg rebuilds its Segment; editing a
+    component rebuilds it and its dynamic models. Everything else keeps its compiled rows, and
+    the program is spliced back together by variable name (CompiledProgram.from_blocks).
+
+    The gpkit tree isn't patched up after an edit - solve through program, not the Models.
+
+    >>> model = IncrementalModel()
+    >>> model.edit_leg(2, cruise_range=3000*u.km)       # rebuilds the Cruise segment only
+    >>> model.program.solve({"Aircraft.AR": 9.0})
+    """
+
+    def __init__(self, profile=MISSION_PROFILE, **hyperparameters):
+        self.aircraft   = Aircraft(**hyperparameters)
+        self.mission    = Mission(self.aircraft, profile=profile)
+        self.cost       = self.aircraft.M_0 * self.aircraft.T0_W0
+
+        self.blocks     = {("cost",): ProgramBlock(cost=self.cost)}
+        self.rebuilt    = self.compile(self.roots())
+        self.program    = CompiledProgram.from_blocks(list(self.blocks.values()))
+
+
+    @property
+    def dynamic_components(self):
+        # Same order AircraftPerformance builds them in, so they zip with its perf_models
+        return [c for c in self.aircraft.components if hasattr(c, "dynamic")]
+
+
+    def roots(self):
+        """{block key: root model} - every block, with the model its constraints are walked from"""
+        roots = {("Aircraft",): self.aircraft, ("Mission",): self.mission}
+        roots.update({("component", type(c).__name__): c for c in self.aircraft.components})
+
+        for segment, model in self.mission.segments.items():
+            roots[("segment", segment)] = model
+            for component, dynamic in zip(self.dynamic_components, model.aircraftp.perf_models):
+                roots[("dynamic", segment, type(component).__name__)] = dynamic
+
+        return roots
+
+
+    def block(self, root):
+        """
+        Compiles everything under root, down to (not into) the models that are blocks of their own -
+        fixed values come from the Models walked through (and the other blocks, for linked functions)
+        """
+        blocks      = (Aircraft, Mission, Segment, *{type(c) for c in self.aircraft.components},
+                       *{c.dynamic for c in self.dynamic_components})
+        constraints = []
+        varkeys     = set()
+
+        def walk(item):
+            if isinstance(item, Model):
+                if item is not root and isinstance(item, blocks):
+                    return
+                varkeys.update(item.unique_varkeys)
+
+            if isinstance(item, dict):
+                for value in item.values():
+                    walk(value)
+            elif isinstance(item, (ConstraintSet, list, tuple)):
+                for value in item:
+                    walk(value)
+            else:
+                constraints.append(item)
+
+        walk(root)
+        context = {name: value for block in self.blocks.values() for name, value in block.defaults.items()}
+        return ProgramBlock(constraints, substitutions=root.substitutions, varkeys=varkeys, context=context)
+
+
+    def compile(self, roots):
+        """Recompiles the blocks of roots ({key: model}) - returns their keys"""
+        for key, root in roots.items():
+            self.blocks[key] = self.block(root)
+
+        return list(roots)
+
+
+    def splice(self, roots):
+        tic             = perf_counter()
+        self.rebuilt    = self.compile(roots)
+        self.program    = CompiledProgram.from_blocks(list(self.blocks.values()))
+
+        logging.debug(f"Rebuilt {len(roots)} of {len(self.blocks)} blocks in {perf_counter() - tic:.3f} s")
+        return self.program
+
+
+    def edit_leg(self, i, **kwargs):
+        """
+        Changes profile leg i's kwargs (see MISSION_PROFILE) - rebuilds the Segment flying it, and
+        only that. Returns the new program.
+        """
+        segment, old    = self.mission.legs[i]
+        mission         = self.mission
+
+        mission.legs[i] = (segment, {**old, **kwargs})
+        with rebuilding(mission.segments[segment]):
+            mission.build_segment(segment)
+
+        roots = self.roots()
+        return self.splice({key: model for key, model in roots.items() if key[0] in ("segment", "dynamic") and key[1] == segment})
+
+
+    def edit_component(self, name, *args, **kwargs):
+        """
+        Rebuilds the component at Aircraft.<name> (e.g. "H_tail") with new setup arguments, and its
+        dynamic model in every Segment. Returns the new program.
+        """
+        old     = getattr(self.aircraft, name)
+        with rebuilding(old):
+            new = type(old)(*args, **kwargs)
+
+        components = self.aircraft.components
+        components[next(i for i, c in enumerate(components) if c is old)] = new
+        setattr(self.aircraft, name, new)
+
+        if hasattr(new, "dynamic"):
+            for segment, model in self.mission.segments.items():
+                perf_models = model.aircraftp.perf_models
+                j           = next(j for j, c in enumerate(self.dynamic_components) if c is new)
+                legs        = len(self.mission.leg_index(segment))
+
+                with rebuilding(perf_models[j], legs if legs > 1 else None):
+                    perf_models[j] = new.dynamic(new, model.state)
+
+        cls = type(new).__name__
+        return self.splice({key: model for key, model in self.roots().items() if key[-1] == cls and key[0] in ("component", "dynamic")})
@@ -0,0 +1,106 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .Sweep import lookup, magnitude
+from .Uncertainty import sample
+
+
+# Box the initial guesses are spread over - {free variable: (low, high)}, in the variable's units
+START_BOUNDS = {
+    "Aircraft.M_0":     (5e3,   5e4),           # [kg]
+    "Aircraft.W0_S":    (1500,  7000),          # [N/m^2]
+    "Aircraft.T0_W0":   (0.2,   0.6),
+}
+
+# One model per worker process, built by the pool initializer
+_worker = None
+
+
+def starts(bounds=START_BOUNDS, n=16, method="sobol", seed=0):
+    """n space-filling initial guesses inside bounds - log-uniform, as every variable is positive"""
+    logs = {name: ("uniform", np.log(lo), np.log(hi)) for name, (lo, hi) in bounds.items()}
+
+    return {name: np.exp(values) for name, values in sample(logs, n, method, seed).items()}
+
+
+def _init_worker(builder, structure):
+    global _worker
+    _worker = builder(**structure)
+
+
+def _localsolve(i, x0, solver=None, **kwargs):
+    """One localsolve from x0 ({name: value}) on this worker's model - failures come back as results too"""
+    result = {"start": i, "x0": x0, "cost": np.nan, "iterations": 0, "soltime": np.nan, "variables": {}, "error": ""}
+
+    # The last start's program would otherwise be counted for a start that fails before building its own
+    _worker.program = None
+
+    try:
+        sol = _worker.localsolve(solver, verbosity=0, x0={lookup(_worker, name): value for name, value in x0.items()}, **kwargs)
+        result.update({"cost": float(magnitude(sol["cost"])), "soltime": sol["soltime"],
+                       "variables": {str(vk): np.asarray(magnitude(v), dtype=float).tolist() for vk, v in sol["freevariables"].items()}})
+    except Exception as err:                                        # noqa - anything the solver throws is recorded
+        result["error"] = repr(err)
+
+    program                 = getattr(_worker, "program", None)
+    result["iterations"]    = len(getattr(program, "gps", ()))
+
+    return result
+
+
+def same_optimum(a, b, rtol):
+    return np.isfinite(a["cost"]) and np.isfinite(b["cost"]) and abs(a["cost"] - b["cost"]) <= rtol * abs(b["cost"])
+
+
+def multistart(builder, n=16, bounds=START_BOUNDS, method="sobol", seed=0, duplicates=3, rtol=1e-4,
+               structure=None, workers=None, solver=None, **kwargs):
+    """
+    localsolve from n space-filling initial guesses (see starts) on a process pool - returns
+    {"best": the lowest-cost result, "starts": every start's result, in start order}
+
+    An SP only finds a local optimum near where it starts, so the best of several starts is a
+    better bet than any one. Each result has the start's x0, cost, GP iterations, soltime, free
+    variable values by name (lists for vector variables) and any error. Once duplicates starts have converged on the best
+    cost so far (within rtol) the optimum is taken as found and the unsolved starts are cancelled.
+
+    Each worker builds builder(**structure) once - it has to be a signomial model (one built
+    inside SignomialsEnabled), and a module-level function so the pool can pickle it.
+    workers=1 solves in this process. kwargs go to localsolve (e.g. reltol, iteration_limit).
+    """
+    x0      = starts(bounds, n, method, seed)
+    jobs    = [{name: float(v[i]) for name, v in x0.items()} for i in range(n)]
+    results = []
+
+    def done(result):
+        results.append(result)
+        best = min((r for r in results if np.isfinite(r["cost"])), key=lambda r: r["cost"], default=None)
+
+        return best is not None and sum(same_optimum(r, best, rtol) for r in results) >= duplicates
+
+    if workers == 1:
+        _init_worker(builder, structure or {})
+        for i, guess in enumerate(jobs):
+            if done(_localsolve(i, guess, solver, **kwargs)):
+                break
+    else:
+        with ProcessPoolExecutor(workers or os.cpu_count(), initializer=_init_worker, initargs=(builder, structure or {})) as pool:
+            futures = [pool.submit(_localsolve, i, guess, solver, **kwargs) for i, guess in enumerate(jobs)]
+
+            for future in as_completed(futures):
+                if done(future.result()):
+                    for f in futures:
+                        f.cancel()
+                    break
+
+    results.sort(key=lambda r: r["start"])
+    best = min((r for r in results if np.isfinite(r["cost"])), key=lambda r: r["cost"], default=None)
+
+    if best is None:
+        logging.warning(f"None of the {len(results)} starts converged")
+    else:
+        logging.info(f"Best cost {best['cost']:.6g} from start {best['start']} ({len(results)} of {n} starts solved)")
+
+    return {"best": best, "starts": results}
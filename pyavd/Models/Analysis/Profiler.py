@@ -0,0 +1,228 @@
+import contextlib
+import json
+import os
+import re
+from pathlib import Path
+from time import perf_counter
+
+from gpkit import Model
+from gpkit.constraints.gp import GeometricProgram
+from gpkit.constraints.set import ConstraintSet
+from gpkit.nomials.variables import Variable         # the scalar base - gpkit.Variable only picks scalar / vector
+
+from .Sweep import design_model
+
+
+# PYAVD_PROFILE=path profiles the CLI run and writes path (JSON) and path.folded (flame graph)
+PROFILE_ENV     = "PYAVD_PROFILE"
+
+# cvxopt prints one " 12: pcost dcost ..." line per iteration
+ITERATION_LINE  = re.compile(r"^\s*\d+:\s")
+
+
+def own_constraints(constraints):
+    """The constraints a model declares itself - nested ConstraintSets are walked, child Models are theirs"""
+    for item in constraints:
+        if isinstance(item, Model):
+            continue
+        if isinstance(item, dict):
+            yield from own_constraints(item.values())
+        elif isinstance(item, (ConstraintSet, list, tuple)):
+            yield from own_constraints(item)
+        elif hasattr(item, "left"):
+            yield item
+
+
+
+class Node:
+    """One model in the build tree - times are inclusive of its children unless they say self"""
+
+    def __init__(self, name):
+        self.name           = name
+        self.children       = []
+        self.build          = 0.0       # [s]
+        self.variable_time  = 0.0       # [s]   Declaring Variables, i.e. the lines parse_variables generates
+        self.variables      = 0
+        self.constraints    = 0
+        self.posynomials    = 0
+        self.monomials      = 0
+
+
+    def count(self, model):
+        self.variables = len(getattr(model, "unique_varkeys", ()))
+
+        for constraint in own_constraints(model):
+            sides               = [len(getattr(side, "hmap", ())) for side in (constraint.left, constraint.right)]
+            self.constraints    += 1
+            self.monomials      += sum(sides)
+            self.posynomials    += any(n > 1 for n in sides)
+
+
+    @property
+    def self_time(self):
+        return self.build - sum(child.build for child in self.children)
+
+
+    def report(self):
+        return {"name": self.name, "build": self.build, "self": self.self_time, "variable_time": self.variable_time,
+                "variables": self.variables, "constraints": self.constraints, "posynomials": self.posynomials,
+                "monomials": self.monomials, "children": [child.report() for child in self.children]}
+
+
+    def folded(self, stack=()):
+        """'root;child;grandchild microseconds' lines - self time, so the flame graph adds up"""
+        stack = (*stack, self.name)
+        yield f"{';'.join(stack)} {max(round(self.self_time * 1e6), 0)}"
+
+        for child in self.children:
+            yield from child.folded(stack)
+
+
+
+class Profiler:
+    """
+    Build / compile / solve instrumentation - patches gpkit while installed (see profiled)
+
+    Every Model built records its build time, the time spent declaring Variables, and its own
+    variable, constraint, posynomial and monomial counts, nested as the models are. Every
+    GeometricProgram records its compile (gp()) time, size, solve time and solver iterations.
+    """
+
+    def __init__(self):
+        self.roots      = []
+        self.stack      = []
+        self.programs   = []
+        self.patched    = {}
+
+
+    def install(self):
+        profiler    = self
+        model_init  = self.patched[Model, "__init__"]                   = Model.__init__
+        var_init    = self.patched[Variable, "__init__"]                = Variable.__init__
+        gp_init     = self.patched[GeometricProgram, "__init__"]        = GeometricProgram.__init__
+        gp_solve    = self.patched[GeometricProgram, "solve"]           = GeometricProgram.solve
+
+        def model(self, *args, **kwargs):
+            node = Node(type(self).__name__)
+            (profiler.stack[-1].children if profiler.stack else profiler.roots).append(node)
+            profiler.stack.append(node)
+
+            tic = perf_counter()
+            try:
+                model_init(self, *args, **kwargs)
+            finally:
+                node.build = perf_counter() - tic
+                profiler.stack.pop()
+
+            node.count(self)
+
+        def variable(self, *args, **kwargs):
+            tic = perf_counter()
+            var_init(self, *args, **kwargs)
+            if profiler.stack:
+                profiler.stack[-1].variable_time += perf_counter() - tic
+
+        def compile(self, *args, **kwargs):
+            tic     = perf_counter()
+            record  = {"id": id(self)}
+            profiler.programs.append(record)
+            try:
+                gp_init(self, *args, **kwargs)
+                record.update({"free_variables": len(self.varlocs), "posynomials": len(self.k), "monomials": len(self.cs)})
+            finally:
+                record["compile"] = perf_counter() - tic
+
+        def solve(self, *args, **kwargs):
+            tic = perf_counter()
+            try:
+                return gp_solve(self, *args, **kwargs)
+            finally:
+                log     = getattr(self, "solve_log", None)
+                lines   = log.lines() if hasattr(log, "lines") else []
+                record  = next((p for p in reversed(profiler.programs) if p.get("id") == id(self)), None)
+                if record is None:
+                    record = {"id": id(self), "compile": None}
+                    profiler.programs.append(record)
+
+                record.update({"solve": perf_counter() - tic, "iterations": sum(bool(ITERATION_LINE.match(l)) for l in lines),
+                               "solver": getattr(self, "solver_out", {}).get("solver")})
+
+        Model.__init__, Variable.__init__ = model, variable
+        GeometricProgram.__init__, GeometricProgram.solve = compile, solve
+
+
+    def uninstall(self):
+        for (cls, name), original in self.patched.items():
+            setattr(cls, name, original)
+        self.patched = {}
+
+
+    def report(self):
+        """JSON-ready report - the model tree, every program and the totals"""
+        programs = [{k: v for k, v in p.items() if k != "id"} for p in self.programs]
+
+        return {"models": [root.report() for root in self.roots], "programs": programs, "totals": {
+            "build":    sum(root.build for root in self.roots),
+            "compile":  sum(p.get("compile") or 0 for p in programs),
+            "solve":    sum(p.get("solve") or 0 for p in programs),
+        }}
+
+
+    def folded(self):
+        """Flame graph lines (flamegraph.pl / speedscope 'collapsed stack' format) [microseconds]"""
+        lines = [line for root in self.roots for line in root.folded()]
+
+        for i, p in enumerate(self.programs):
+            for stage in ("compile", "solve"):
+                if p.get(stage):
+                    lines.append(f"{stage};program {i} {round(p[stage] * 1e6)}")
+
+        return lines
+
+
+    def save(self, path):
+        """Writes path (JSON report) and path.folded"""
+        path = Path(path)
+        path.write_text(json.dumps(self.report(), indent=2))
+        path.with_name(path.name + ".folded").write_text("\n".join(self.folded()) + "\n")
+
+
+
+@contextlib.contextmanager
+def profiled(path=None):
+    """
+    Profiles everything built and solved inside the block - saved to path if given
+
+    >>> with profiled("profile.json") as profiler:
+    ...     design_model().solve()
+    """
+    profiler = Profiler()
+    profiler.install()
+
+    try:
+        yield profiler
+    finally:
+        profiler.uninstall()
+        if path:
+            profiler.save(path)
+
+
+def from_env():
+    """profiled(path) if PYAVD_PROFILE is set, else a do-nothing context"""
+    path = os.environ.get(PROFILE_ENV)
+
+    return profiled(path) if path else contextlib.nullcontext()
+
+
+def profile_model(builder=design_model, solve=True, path=None, **structure):
+    """Builds (and solves) builder(**structure) once under the profiler - returns the report"""
+    with profiled(path) as profiler:
+        model = builder(**structure)
+
+        if solve:
+            try:
+                model.solve(verbosity=0)
+            except Exception as err:                                # noqa - a failed solve is still worth the profile
+                profiler.programs.append({"error": repr(err)})
+
+    return profiler.report()
@@ -0,0 +1,169 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+# Columns that aren't float64 - everything else numeric is stored as <f8, text goes to text.jsonl
+DTYPES      = {"feasible": "|b1", "index": "<i8", "case": "<i8", "warm_start": "<i8"}
+META        = "meta.json"
+TEXT        = "text.jsonl"
+
+
+class ResultStore:
+    """
+    Columnar on-disk store for sweep results - one raw binary file per column, memory-mapped on read
+
+    Only what's asked for is kept (a Sweep's outputs, sensitivities and metadata), at 8 bytes per
+    value, so 1e6 points x a dozen columns is ~100 MB on disk and nothing in memory until read.
+    append() takes a table of columns or a list of rows, and can be called while a sweep runs -
+    meta.json is only rewritten once the data is down, so readers (even in another process) only
+    see whole rows. Column reads are lazy np.memmap views. Text (solver errors, emp_config) goes
+    to text.jsonl as {"row", "column", "value"} lines - NaN in the column if it has numbers too.
+
+    >>> store = ResultStore("sweep.store")
+    >>> for rows in chunks: store.append(rows)
+    >>> store["Aircraft.M_0"][store["feasible"]].mean()
+    """
+
+    def __init__(self, path):
+        self.path   = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        meta        = self.path / META
+        self.meta   = json.loads(meta.read_text()) if meta.exists() else {"rows": 0, "columns": {}}
+        self.pending = []
+
+
+    def __len__(self):
+        return self.meta["rows"]
+
+
+    @property
+    def columns(self):
+        return list(self.meta["columns"])
+
+
+    def file(self, name):
+        # Column names are variable names ("Aircraft.M_0", "Mission.M") - safe as file names apart from slashes
+        return self.path / (name.replace("/", "_") + ".bin")
+
+
+    def append(self, table):
+        """Appends a {column: values} table (equal first axis) or a list of row dicts - returns the new row count"""
+        if isinstance(table, (list, tuple)):
+            names = dict.fromkeys(k for row in table for k in row)
+            table = {name: [row.get(name) for row in table] for name in names}
+
+        n = len(next(iter(table.values()))) if table else 0
+        if not n:
+            return len(self)
+
+        text = []
+        for name, values in table.items():
+            if not isinstance(values, np.ndarray) or values.dtype.kind in "OUS":
+                # Row by row - strings (errors, emp_config) go to the text file, None is missing
+                rows    = list(values)
+                text   += [{"row": len(self) + i, "column": name, "value": v} for i, v in enumerate(rows) if isinstance(v, str) and v]
+                if all(isinstance(v, str) or v is None for v in rows):
+                    continue
+
+                empty   = np.full(np.shape(next(v for v in rows if v is not None and not isinstance(v, str))), np.nan)
+                values  = np.array([empty if v is None or isinstance(v, str) else v for v in rows], dtype=float)
+
+            column = self.meta["columns"].setdefault(name, {"dtype": DTYPES.get(name, "<f8"), "shape": list(values.shape[1:])})
+
+            # A column first seen part way through is back-filled, so every file stays row aligned
+            missing = len(self) - self.stored(name)
+            with open(self.file(name), "ab") as f:
+                if missing:
+                    self.blank(name, missing).tofile(f)
+                values.astype(column["dtype"]).tofile(f)
+
+        # Columns this table didn't have are padded for its rows
+        for name in self.meta["columns"]:
+            if name not in table and self.stored(name) < len(self) + n:
+                with open(self.file(name), "ab") as f:
+                    self.blank(name, len(self) + n - self.stored(name)).tofile(f)
+
+        if text:
+            with open(self.path / TEXT, "a") as f:
+                f.writelines(json.dumps(t) + "\n" for t in text)
+
+        self.meta["rows"] += n
+        self.write_meta()
+
+        return len(self)
+
+
+    def stored(self, name):
+        """Rows written to a column's file so far (may run ahead of meta.json while appending)"""
+        column  = self.meta["columns"][name]
+        path    = self.file(name)
+        size    = np.dtype(column["dtype"]).itemsize * int(np.prod(column["shape"], dtype=int))
+
+        return path.stat().st_size // size if path.exists() else 0
+
+
+    def blank(self, name, n):
+        column = self.meta["columns"][name]
+        fill   = {"b": False, "i": -1}.get(np.dtype(column["dtype"]).kind, np.nan)
+
+        return np.full((n, *column["shape"]), fill, dtype=column["dtype"])
+
+
+    def write_meta(self):
+        tmp = self.path / (META + ".tmp")
+        tmp.write_text(json.dumps(self.meta))
+        os.replace(tmp, self.path / META)
+
+
+    def refresh(self):
+        """Re-reads meta.json - picks up rows another process has appended since"""
+        self.meta = json.loads((self.path / META).read_text())
+        return self
+
+
+    def __getitem__(self, name):
+        """A column as a read-only memmap over the committed rows - nothing is read until it's used"""
+        column = self.meta["columns"][name]
+        if not len(self):
+            return np.zeros((0, *column["shape"]), dtype=column["dtype"])
+
+        return np.memmap(self.file(name), dtype=column["dtype"], mode="r", shape=(len(self), *column["shape"]))
+
+
+    def load(self, names=None):
+        """{column: array} copies for names (default all) - e.g. pd.DataFrame(store.load([...]))"""
+        return {name: np.array(self[name]) for name in (names or self.columns)}
+
+
+    def text(self):
+        """{row: {column: text}} for every committed row that had text (e.g. solver errors)"""
+        out     = {}
+        path    = self.path / TEXT
+        if path.exists():
+            for line in path.read_text().splitlines():
+                e = json.loads(line)
+                if e["row"] < len(self):
+                    out.setdefault(e["row"], {})[e["column"]] = e["value"]
+
+        return out
+
+
+    # Batch writer interface (see results_writer) - rows are buffered and appended in blocks
+    def write(self, row, batch=256):
+        self.pending.append(row)
+        if len(self.pending) >= batch:
+            self.flush()
+
+
+    def flush(self):
+        if self.pending:
+            self.append(self.pending)
+            self.pending = []
+
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,196 @@
+import logging
+
+from gpkit import Model
+from gpkit.exceptions import InvalidGPConstraint, UnboundedGP
+import numpy as np
+
+from ..Components import Aircraft
+from ..Performance import Mission
+from ..Performance.Mission import MISSION_PROFILE, Missions
+
+
+def design_model(profile=MISSION_PROFILE, missions=None, **hyperparameters):
+    """
+    Builds the Aircraft + Mission GP that PyAVD.py solves - hyperparameters go straight to Aircraft.setup.
+    missions ({name: (profile, payload fraction)}, see MISSIONS) sizes for all of them at once instead of profile.
+    """
+    AC          = Aircraft(**hyperparameters)
+    MISSION     = Missions(AC, missions) if missions else Mission(AC, profile=profile)
+
+    return Model(AC.M_0 * AC.T0_W0, [MISSION, AC])
+
+
+def lookup(model, name):
+    """
+    Finds the VarKey for a Variable, a full name ("Aircraft.AR") or a unique trailing
+    part of one ("Engine.sfc_cruise" --> "Aircraft.Engine.sfc_cruise")
+    """
+    if not isinstance(name, str):
+        return getattr(name, "key", name)
+
+    try:
+        return model[name].key
+    except (KeyError, ValueError):
+        matches = [vk for vk in model.varkeys if str(vk) == name or str(vk).endswith("." + name)]
+
+    if len(matches) != 1:
+        raise KeyError(f"'{name}' matches {len(matches)} variables in {model.__class__.__name__} - use a longer name")
+
+    return matches[0]
+
+
+def is_signomial(model):
+    """True if the model needs localsolve (i.e. it was built inside SignomialsEnabled)"""
+    try:
+        model.gp(checkbounds=False)     # bounds are checked when it solves
+    except InvalidGPConstraint:
+        return True
+
+    return False
+
+
+def restore(model, original, varkeys):
+    """Puts back the substitutions of varkeys as they were in original ({varkey: value}) - any not in it are removed"""
+    for vk in varkeys:
+        if vk in original:
+            model.substitutions[vk] = original[vk]
+        elif vk in model.substitutions:
+            del model.substitutions[vk]             # KeyDict's del, which keeps its keymap in step
+
+
+def magnitude(value):
+    return getattr(value, "magnitude", value)
+
+
+class Sweep:
+    """Re-solves one model over many substitution points
+
+    The model tree is built once - each point only changes substitutions. Points are visited
+    along a nearest-neighbour path through (log) parameter space, and each solve is warm-started
+    from the closest point already solved. Only localsolve (SP path) accepts an initial guess,
+    the GP solvers are stateless interior point methods, so on the GP path this just orders the solves.
+
+    Parameters and outputs are given as Variables or names (see lookup). Results come back as a
+    tidy table - a dict of equal-length columns - in the order the points were given, so
+    pd.DataFrame(sweep.run(...)) just works. Vector outputs (e.g. "Mission.M") are (points, ...) columns.
+    sensitivities are fixed variables whose cost sensitivity is kept, as "sensitivity.<name>" columns.
+    """
+
+    def __init__(self, model=None, outputs=("Aircraft.M_0", "Aircraft.T0_W0"), solver=None, warm_start=True, sensitivities=()):
+        self.model          = model if model is not None else design_model()
+        self.outputs        = {str(o): lookup(self.model, o) for o in outputs}
+        self.sensitivities  = {f"sensitivity.{s}": lookup(self.model, s) for s in sensitivities}
+        self.solver         = solver
+        self.warm_start     = warm_start
+        self.signomial      = is_signomial(self.model)
+
+        # Log-space parameter vectors, free variables and row index of every point solved so far
+        self.solved_x       = []
+        self.solved_sol     = []
+        self.solved_index   = []
+
+
+    @staticmethod
+    def grid(**axes):
+        """Full-factorial points from 1D axes, e.g. Sweep.grid(AR=[7, 8, 9], e=[0.8, 0.9])"""
+        mesh = np.meshgrid(*[np.asarray(v, dtype=float) for v in axes.values()], indexing="ij")
+        return {name: m.ravel() for name, m in zip(axes, mesh)}
+
+
+    def order(self, X):
+        """Greedy nearest-neighbour path through the (normalised) points - starts at the first point"""
+        n       = len(X)
+        if n < 3:
+            return np.arange(n)
+
+        span    = np.ptp(X, axis=0)
+        Xn      = X / np.where(span > 0, span, 1)
+
+        path        = [0]
+        remaining   = np.ones(n, dtype=bool)
+        remaining[0] = False
+
+        for _ in range(n - 1):
+            d           = np.where(remaining, ((Xn - Xn[path[-1]])**2).sum(axis=1), np.inf)
+            nxt         = int(np.argmin(d))
+            remaining[nxt] = False
+            path.append(nxt)
+
+        return np.array(path)
+
+
+    def nearest(self, x):
+        """Index into self.solved_* of the closest solved point, or None"""
+        if not self.solved_x:
+            return None
+
+        return int(np.argmin(((np.array(self.solved_x) - x)**2).sum(axis=1)))
+
+
+    def solve_point(self, subs, x0=None, verbosity=0):
+        self.model.substitutions.update(subs)
+
+        if self.signomial:
+            return self.model.localsolve(self.solver, verbosity=verbosity, x0=x0)
+
+        return self.model.solve(self.solver, verbosity=verbosity)
+
+
+    def run(self, points, verbosity=0):
+        """
+        Solves every point - points is a dict of {parameter: values} with equal-length values
+        (zipped, use Sweep.grid for a full factorial) - {} solves the model once as it stands.
+        Values are in the variable's own units.
+        Infeasible (or unbounded) points are kept as NaN rows with feasible=False and the solver's
+        exception in "error" ("" for the points that solved).
+        """
+        params  = {str(p): lookup(self.model, p) for p in points}
+        values  = {str(p): np.atleast_1d(np.asarray(v, dtype=float)) for p, v in points.items()}
+        n       = len(next(iter(values.values()))) if values else 1
+
+        if any(len(v) != n for v in values.values()):
+            raise ValueError("All sweep parameters need the same number of points")
+
+        # Parameters are all positive (it's a GP) so neighbours are measured in log space
+        X       = np.log(np.column_stack(list(values.values()))) if values else np.zeros((n, 0))
+        table   = {**values, **{o: np.full((n, *(getattr(vk, "shape", None) or ())), np.nan) for o, vk in self.outputs.items()}}
+        table.update({name: np.full(n, np.nan) for name in self.sensitivities})
+        table.update({"cost": np.full(n, np.nan), "feasible": np.zeros(n, dtype=bool), "warm_start": np.full(n, -1), "soltime": np.full(n, np.nan),
+                      "error": np.full(n, "", dtype=object)})
+
+        # Substitutions are restored afterwards (swept free variables freed again), so the model can be reused
+        original = {vk: self.model.substitutions[vk] for vk in params.values() if vk in self.model.substitutions}
+
+        try:
+            for i in self.order(X):
+                subs        = {vk: values[name][i] for name, vk in params.items()}
+                neighbour   = self.nearest(X[i]) if self.warm_start else None
+                x0          = self.solved_sol[neighbour] if neighbour is not None else None
+
+                try:
+                    sol = self.solve_point(subs, x0=x0, verbosity=verbosity)
+                except (UnboundedGP, RuntimeWarning) as err:              # Infeasible is a RuntimeWarning
+                    logging.warning(f"Sweep point {i} ({subs}) failed: {err!r}")
+                    table["error"][i] = repr(err)
+                    continue
+
+                table["cost"][i]        = magnitude(sol["cost"])
+                table["feasible"][i]    = True
+                table["warm_start"][i]  = -1 if neighbour is None else self.solved_index[neighbour]
+                table["soltime"][i]     = sol["soltime"]
+
+                for name, vk in self.outputs.items():
+                    table[name][i] = magnitude(sol(vk))
+
+                for name, vk in self.sensitivities.items():
+                    table[name][i] = sol["sensitivities"]["variables"][vk]
+
+                self.solved_x.append(X[i])
+                self.solved_sol.append(sol["freevariables"])
+                self.solved_index.append(i)
+
+        finally:
+            restore(self.model, original, params.values())
+            self.solved_x, self.solved_sol, self.solved_index = [], [], []
+
+        return table
@@ -0,0 +1,121 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from . import Explore
+from .Sweep import design_model
+
+
+# Empirical constants and their spread - {parameter: (distribution, a, b)}, in the variable's units
+# normal: (mean, standard deviation), uniform: (low, high)
+UNCERTAIN = {
+    "Aircraft.K_LD":                ("normal",  15.5,   0.5),
+    "Aircraft.Sw_Sref":             ("uniform", 5.5,    6.5),
+    "Aircraft.Engine.sfc_cruise":   ("normal",  0.8,    0.04),      # [1/hr]
+    "Takeoff.fuel_frac":            ("uniform", 0.96,   0.98),
+    "Climb.fuel_frac":              ("uniform", 0.98,   0.99),
+    "Climb_GoAround.fuel_frac":     ("uniform", 0.98,   0.99),
+    "Landing.fuel_frac":            ("uniform", 0.99,   0.997),
+}
+
+PERCENTILES = (5, 50, 95)
+
+
+def sample(distributions=UNCERTAIN, n=256, method="lhs", seed=0):
+    """
+    n samples of every parameter - {parameter: values}, ready for Sweep.run
+
+    method is "lhs" (Latin hypercube) or "sobol" (scrambled - n a power of 2 keeps it balanced),
+    both space filling, so the percentiles settle in fewer samples than plain random ones.
+    """
+    from scipy.stats import norm, qmc
+
+    names   = list(distributions)
+    engine  = {"lhs": qmc.LatinHypercube, "sobol": qmc.Sobol}[method](d=len(names), seed=seed)
+    U       = engine.random(n)
+
+    out = {}
+    for j, name in enumerate(names):
+        kind, a, b = distributions[name]
+
+        if kind == "normal":
+            out[name] = norm.ppf(U[:, j], loc=a, scale=b)
+        elif kind == "uniform":
+            out[name] = a + U[:, j] * (b - a)
+        else:
+            raise ValueError(f"Unknown distribution '{kind}' for {name} - use normal or uniform")
+
+    return out
+
+
+def summarize(rows, outputs, percentiles=PERCENTILES):
+    """Percentiles of each output over the feasible rows - {"samples", "feasible", output: {percentile: value}}"""
+    feasible    = [row for row in rows if row["feasible"]]
+    summary     = {"samples": len(rows), "feasible": len(feasible)}
+
+    for output in outputs:
+        values          = np.array([row[output] for row in feasible], dtype=float)
+        summary[output] = dict(zip(percentiles, np.percentile(values, percentiles) if len(values) else np.full(len(percentiles), np.nan)))
+
+    return summary
+
+
+def settled(previous, current, outputs, rtol):
+    """True if no percentile of any output moved by more than rtol between two summaries"""
+    if previous is None or not current["feasible"]:
+        return False
+
+    return all(abs(current[o][p] - previous[o][p]) <= rtol * abs(previous[o][p]) for o in outputs for p in current[o])
+
+
+def monte_carlo(n=1024, distributions=UNCERTAIN, outputs=("Aircraft.M_0", "Aircraft.T0_W0"), method="lhs", seed=0,
+                percentiles=PERCENTILES, rtol=None, patience=3, builder=design_model, structure=None, workers=None, chunksize=16):
+    """
+    Monte Carlo over the empirical constants - yields a running summary (see summarize) every time a
+    chunk of samples is solved, with the rows so far under "rows"
+
+    Each worker builds the model once and re-solves it for every sample (see Explore), so a sample
+    costs one solve. Stop whenever the summary is good enough - break out of the loop, or give rtol
+    and it stops itself once the percentiles have moved less than that for patience chunks in a row.
+    Unsolved chunks are cancelled either way. workers=1 solves in this process.
+    """
+    points  = sample(distributions, n, method, seed)
+    chunks  = [np.arange(i, min(i + chunksize, n)) for i in range(0, n, chunksize)]
+    jobs    = [(idx, {name: v[idx] for name, v in points.items()}) for idx in chunks]
+
+    rows, previous, calm = [], None, 0
+
+    def update(chunk_rows):
+        nonlocal previous, calm
+        rows.extend(chunk_rows)
+        summary     = summarize(rows, outputs, percentiles)
+        calm        = calm + 1 if rtol is not None and settled(previous, summary, outputs, rtol) else 0
+        previous    = summary
+
+        return {**summary, "rows": rows, "converged": rtol is not None and calm >= patience}
+
+    if workers == 1:
+        Explore._init_worker(builder, structure or {}, tuple(outputs))
+        for idx, chunk in jobs:
+            summary = update(Explore._solve_chunk(idx, chunk))
+            yield summary
+            if summary["converged"]:
+                return
+        return
+
+    pool = ProcessPoolExecutor(workers or os.cpu_count(), initializer=Explore._init_worker,
+                               initargs=(builder, structure or {}, tuple(outputs)))
+    try:
+        futures = [pool.submit(Explore._solve_chunk, idx, chunk) for idx, chunk in jobs]
+
+        for future in as_completed(futures):
+            summary = update(future.result())
+            yield summary
+
+            if summary["converged"]:
+                logging.info(f"Monte Carlo converged after {summary['samples']} samples")
+                return
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
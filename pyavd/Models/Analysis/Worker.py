@@ -0,0 +1,302 @@
+import itertools
+import logging
+import math
+import multiprocessing
+import queue
+import threading
+
+import numpy as np
+from gpkit.globals import NamedVariables
+
+from .Profiler import ITERATION_LINE
+from .Sweep import Sweep, design_model, lookup, magnitude, restore
+
+
+# Seconds close() waits for the worker process before killing it
+SHUTDOWN_TIMEOUT = 5
+
+# Cancel flags shared with the worker process, by job id modulo this - far more than are ever outstanding at once
+CANCEL_SLOTS     = 4096
+
+
+class Cancelled(Exception):
+    """Raised inside the worker process when its job has been superseded or cancelled"""
+
+
+
+def _install_progress(events, cancelled, job):
+    """
+    Patches gpkit in the worker process (it's the only thing running there) so every solver
+    iteration and every GP solve is reported - and a superseded job stops at its next iteration
+
+    gpkit has no iteration callback, so iterations come from the solver's printed log, and only
+    cvxopt's format is parsed - with mosek (or anything else) iteration stays 0 and a cancel only
+    lands between GP solves. The GP-level progress uses solver_out, which every solver fills in.
+    The patches never leave this process - the caller's gpkit is untouched.
+    """
+    from gpkit.constraints import gp as gp_module
+    from gpkit.constraints.gp import GeometricProgram
+    from gpkit.small_classes import SolverLog
+
+    def check():
+        if cancelled[job[0] % CANCEL_SLOTS]:
+            raise Cancelled(job[0])
+
+    class ProgressLog(SolverLog):
+        # cvxopt prints " k: pcost dcost gap pres dres" per iteration - pcost is log(cost)
+        def write(self, writ):
+            super().write(writ)
+            for line in writ.splitlines():
+                if ITERATION_LINE.match(line):
+                    k, pcost = line.split()[:2]
+                    events.put((job[0], "iteration", {"iteration": int(k.rstrip(":")), "cost": math.exp(float(pcost))}))
+                    check()
+
+    gp_solve = GeometricProgram.solve
+
+    def solve(self, *args, **kwargs):
+        check()
+        out     = gp_solve(self, *args, **kwargs)
+        job[1] += 1
+        job[2]  = self.solver_out.get("solver")
+
+        # The solution so far - for a localsolve, this GP's; for a GP, the answer
+        primal  = np.exp(self.solver_out["primal"])
+        events.put((job[0], "gp", {"gp": job[1], "cost": float(self.solver_out["objective"]),
+                                   "best": {str(vk): float(primal[i]) for vk, i in self.varidxs.items()}}))
+        check()
+        return out
+
+    gp_module.SolverLog     = ProgressLog
+    GeometricProgram.solve  = solve
+
+
+def _serve(jobs, events, cancelled):
+    """Worker process main loop - one Sweep per structure, kept for every later job with the same one"""
+    job     = [0, 0, None]                  # [id, GP solves so far, solver] of the job running, for the progress hooks
+    sweeps  = {}
+    _install_progress(events, cancelled, job)
+
+    while True:
+        request = jobs.get()
+        if request is None:
+            return
+
+        job[:]  = [request["id"], 0, request["solver"]]
+        if cancelled[job[0] % CANCEL_SLOTS]:
+            events.put((job[0], "cancelled", None))
+            continue
+
+        events.put((job[0], "running", None))
+        try:
+            key = (request["builder"], repr(sorted(request["structure"].items())))
+            if key not in sweeps:
+                # Model numbers start again, so results are keyed "Aircraft.M_0" whatever else this process
+                # (or the one it was forked from) has built - each structure's model is its own
+                NamedVariables.reset_modelnumbers()
+                sweeps[key] = Sweep(request["builder"](**request["structure"]), outputs=(), solver=request["solver"])
+
+            sweep       = sweeps[key]
+            subs        = {lookup(sweep.model, name): value for name, value in request["substitutions"].items()}
+            original    = {vk: sweep.model.substitutions[vk] for vk in subs if vk in sweep.model.substitutions}
+
+            try:
+                sol = sweep.solve_point(subs)
+            finally:
+                restore(sweep.model, original, subs)
+
+            result = {"cost": float(magnitude(sol["cost"])), "soltime": sol["soltime"], "solver": job[2],
+                      "variables": {str(vk): np.asarray(magnitude(v), dtype=float).tolist() for vk, v in sol["variables"].items()}}
+            events.put((job[0], "done", result))
+
+        except Exception as err:                                    # noqa - anything the solver throws goes back to the job
+            stopped = bool(cancelled[job[0] % CANCEL_SLOTS])
+            events.put((job[0], "cancelled" if stopped else "failed", None if stopped else repr(err)))
+
+
+
+class SolveJob:
+    """
+    Handle on a background solve (see SolveWorker.submit)
+
+    status goes queued --> running --> done / failed / cancelled. While it runs, iteration and
+    cost follow the solver (cost is its current estimate - cvxopt only, see _install_progress),
+    gp counts GP solves (one for a GP, one per iteration of a localsolve) and best is the
+    latest GP's free variables by name.
+    """
+
+    def __init__(self, worker, id, inputs, owner=None):
+        self.worker     = worker
+        self.id         = id
+        self.inputs     = inputs
+        self.owner      = owner
+        self.status     = "queued"
+        self.iteration  = 0
+        self.gp         = 0
+        self.cost       = None
+        self.best       = None
+        self.result     = None
+        self.error      = None
+        self.finished   = threading.Event()
+
+
+    @property
+    def progress(self):
+        return {"status": self.status, "iteration": self.iteration, "gp": self.gp, "cost": self.cost}
+
+
+    def update(self, kind, payload):
+        if kind == "iteration":
+            self.iteration, self.cost = payload["iteration"], payload["cost"]
+        elif kind == "gp":
+            self.gp, self.cost, self.best = payload["gp"], payload["cost"], payload["best"]
+        elif kind == "running":
+            self.status = "running"
+        else:
+            self.status = kind
+            self.result = payload if kind == "done" else None
+            self.error  = payload if kind == "failed" else None
+            self.finished.set()
+
+
+    def done(self):
+        return self.finished.is_set()
+
+
+    def wait(self, timeout=None):
+        """The result once it's done (None if it failed or was cancelled) - None on timeout too"""
+        self.finished.wait(timeout)
+        return self.result
+
+
+    def cancel(self):
+        self.worker.cancel(self)
+
+
+
+class SolveWorker:
+    """
+    Solves in a background process, one job at a time, so the caller (e.g. a Streamlit script)
+    never blocks on the solver
+
+    Jobs are solved in the order they come in. Submitting supersedes the same owner's unfinished
+    job (e.g. one Streamlit session's last inputs) - it stops at its next solver iteration, or is
+    skipped if it hasn't started, and the process moves on, keeping the models it has built (one
+    per structure) for the next job. Other owners' jobs are left alone. Submitting the same inputs
+    as that owner's unfinished job hands back that job instead. Progress comes back as it happens
+    (see SolveJob); results are CompiledProgram.solve-style dicts, so they can go straight into a
+    SolutionCache.
+
+    >>> job = solve_worker().submit({"Aircraft.AR": 9.0}, owner=session_id)
+    >>> while job.wait(0.25) is None and not job.done(): show(job.progress)
+    """
+
+    def __init__(self):
+        self.context    = multiprocessing.get_context()
+        self.lock       = threading.Lock()
+        self.ids        = itertools.count(1)
+        self.jobs       = {}
+        self.owners     = {}
+        self.process    = None
+
+
+    def start(self):
+        self.requests   = self.context.Queue()
+        self.events     = self.context.Queue()
+        self.cancelled  = self.context.Array("b", CANCEL_SLOTS)
+        self.process    = self.context.Process(target=_serve, args=(self.requests, self.events, self.cancelled), daemon=True)
+        self.process.start()
+
+        threading.Thread(target=self.pump, args=(self.events, self.process), daemon=True).start()
+
+
+    def pump(self, events, process):
+        """Hands the worker's events to their jobs - any job left hanging when the process dies fails"""
+        while process.is_alive() or not events.empty():
+            try:
+                id, kind, payload = events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            with self.lock:
+                job = self.jobs.get(id)
+                if job is not None:
+                    job.update(kind, payload)
+                    if job.done():
+                        self.forget(job)
+
+        with self.lock:
+            for job in [job for job in self.jobs.values() if job.worker.process is process]:
+                job.update("failed", f"Worker process exited ({process.exitcode})")
+                self.forget(job)
+
+
+    def forget(self, job):
+        """Drops a finished job - call with the lock held"""
+        del self.jobs[job.id]
+        if self.owners.get(job.owner) is job:
+            del self.owners[job.owner]
+
+
+    def submit(self, substitutions=None, builder=design_model, solver=None, owner=None, **structure):
+        """
+        Queues a solve of builder(**structure) with substitutions ({name: value}) - returns its SolveJob.
+        Supersedes owner's (any hashable) unfinished job, see SolveWorker.
+        """
+        inputs = (builder, repr(sorted(structure.items())), repr(sorted((str(k), v) for k, v in (substitutions or {}).items())), solver)
+
+        with self.lock:
+            if self.process is None or not self.process.is_alive():
+                self.start()
+
+            previous = self.owners.get(owner)
+            if previous is not None and previous.inputs == inputs:
+                return previous
+
+            job                 = SolveJob(self, next(self.ids), inputs, owner)
+            self.jobs[job.id]   = job
+            self.owners[owner]  = job
+            self.cancelled[job.id % CANCEL_SLOTS] = 0
+
+            if previous is not None:
+                self.cancelled[previous.id % CANCEL_SLOTS] = 1
+
+        self.requests.put({"id": job.id, "builder": builder, "structure": structure, "solver": solver,
+                           "substitutions": {str(getattr(k, "key", k)): v for k, v in (substitutions or {}).items()}})
+        return job
+
+
+    def cancel(self, job=None):
+        """Stops job (default every unfinished one) at its next solver iteration, or before it starts"""
+        with self.lock:
+            for job in [job] if job is not None else list(self.jobs.values()):
+                self.cancelled[job.id % CANCEL_SLOTS] = 1
+
+
+    def close(self):
+        if self.process is None:
+            return
+
+        self.cancel()
+        self.requests.put(None)
+        self.process.join(SHUTDOWN_TIMEOUT)
+        if self.process.is_alive():
+            logging.warning("Solve worker didn't stop - terminating it")
+            self.process.terminate()
+
+
+
+# One SolveWorker per process, shared by everything in it - see solve_worker
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def solve_worker():
+    """The process-wide SolveWorker (its process starts with the first job)"""
+    global _worker
+
+    with _worker_lock:
+        if _worker is None:
+            _worker = SolveWorker()
+
+    return _worker
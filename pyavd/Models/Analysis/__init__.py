@@ -0,0 +1,10 @@
+from .Sweep import Sweep, design_model
+from .Cache import CompiledProgram, ProgramBlock, ProgramCache, SolutionCache, solution_cache
+from .Incremental import IncrementalModel
+from .Explore import explore, collect, carpet, carpet_plot
+from .Batch import read_cases, solve_cases, run_batch
+from .Store import ResultStore
+from .Uncertainty import sample, monte_carlo
+from .MultiStart import multistart
+from .Profiler import profiled, profile_model
+from .Worker import SolveJob, SolveWorker, solve_worker
@@ -5,19 +5,30 @@ from .Engine        import *
 from .UC            import *
 from .Empennage     import *
 
-from gpkit import Model, Vectorize, VectorVariable, parse_variables, ureg as u
+from gpkit import Model, Variable, Vectorize, VectorVariable, parse_variables, ureg as u
 from gpkit.constraints.tight import Tight
 import numpy as np
 
 
+# Fraction of (CL_max - CL_clean) available at takeoff / initial climb - shared with Segments' closed-form boundaries
+CL_BLEND        = 0.7
+
+# Minimum group masses of the components with no mass model yet, as fractions of M_0 [-] - business jet averages (Roskam Part V)
+MASS_FRACTIONS  = {
+    "wing":         0.090,
+    "fuse":         0.105,
+    "H_tail":       0.012,
+    "V_tail":       0.010,
+    "uc":           0.035,
+}
+
+
 class AircraftPerformance(Model):
     """Aircraft performance model
 
     Variables
     ---------
     Cd0                         [-]             Zero-lift drag coefficient
-    x_cg                        [m]             Longitudinal centre of gravity location
-    z_cg                        [m]             Vertical centre of gravity location
     Vstall_TO                   [m/s]           Stall speed (Takeoff)
     Vstall_LD                   [m/s]           Stall speed (Landing)
 
@@ -37,8 +48,8 @@ class AircraftPerformance(Model):
         # perf_models     += aircraft.fuselage.dynamic(aircraft.fuselage, state)
         # perf_models     += aircraft.uc.dynamic(aircraft.uc, state)
 
-        # Add dynamic models to each component, even if blank (None)
-        [perf_models.append(model.dynamic(model, state)) for model in aircraft.components]
+        # Add dynamic models to each component that has one (Payload, Fuselage and UC don't yet)
+        [perf_models.append(model.dynamic(model, state)) for model in aircraft.components if hasattr(model, "dynamic")]
 
         # Whole aircraft performance constraints
         W               = aircraft.M_0 * 9.81 * (u.m/u.s**2)
@@ -47,13 +58,10 @@ class AircraftPerformance(Model):
         rho             = state.rho
 
 
-        # xcg constraints - derived from the weighted average of the aircraft components and systems x_cg
-        constraints.update({"Longitudinal CG" : Tight([
-                    x_cg >= (sum(c.x_cg * c.M for c in aircraft.components) + sum(s.x_cg * s.M for s in aircraft.systems)) / aircraft.M_dry                       ])})
-
-        # Same for z_cg
-        constraints.update({"Vertical CG" : Tight([
-                    z_cg >= (sum(c.z_cg * c.M for c in aircraft.components) + sum(s.z_cg * s.M for s in aircraft.systems)) / aircraft.M_dry                       ])})
+        # No CG constraints - x_cg >= (weighted average of the components) has nothing in the cost pulling it back
+        # down, so it was unbounded above, and some components sit below the z datum, which a GP can't hold.
+        # The CG sizes nothing yet, so it's worked out after the solve (see LoadingDiagram) until a
+        # stability margin constraint needs it in here
 
 
         # TODO: make a drag model for the aircraft - ie topic 4 eqns go here
@@ -88,6 +96,11 @@ class Aircraft(Model):
     l_f             13.5        [m]             Length of the Fuselage
     w_f             1.70        [m]             Length of the Wing
     n_engines       2           [-]             Number of Engines
+    CL_max          CL_max      [-]             Maximum Lift Coefficient
+    CL_clean        CL_clean    [-]             Clean Lift Coefficient
+    AR              AR          [-]             Aspect Ratio
+    e               e           [-]             Oswald Efficiency
+    Cd0             0.02        [-]             Zero-lift Drag Coefficient
 
 
     Upper Unbounded
@@ -112,20 +125,24 @@ class Aircraft(Model):
         systems         = self.systems      = []
         constraints     = self.constraints  = {}
 
-        # Hyperparameters from the user - TODO: remove these
-        self.CL_max     = CL_max
-        self.CL_clean   = CL_clean
-        self.AR         = AR
-        self.e          = e
+        # Hyperparameters from the user - CL_max, CL_clean, AR and e are fixed Variables so sweeps can substitute them
         self.emp_config = emp_config
 
+        # States of the segments flying this aircraft, by flight condition - see State.cached
+        self.states     = {}
+
+        # Lift coefficient blends for takeoff / initial climb - linked so they follow CL_max and CL_clean substitutions,
+        # and built here rather than in the (possibly vectorized) segments so there's one value per aircraft
+        CL_max_TO       = self.CL_max_TO    = Variable("CL_max_TO",     lambda c: c[CL_clean] + CL_BLEND * (c[CL_max] - c[CL_clean]),   "",     "Maximum Lift Coefficient | Takeoff")
+        CL_climb        = self.CL_climb     = Variable("CL_climb",      lambda c: c[CL_clean] + CL_BLEND * (c[CL_max] - c[CL_clean]),   "",     "Lift Coefficient | Initial Climb")
+
         # Note that {str_} = Starboard, {prt_} = Port
         # Also order of initialization is important - some components depend on quantities from others!
         payload         = self.payload      = Payload()     
         fuse            = self.fuse         = Fuselage()
         wing            = self.wing         = Wing()
         engine          = self.engine       = Engine()
-        H_tail          = self.H_tail       = H_Tail()
+        H_tail          = self.H_tail       = H_Tail(emp_config)
         V_tail          = self.V_tail       = V_Tail()
         uc              = self.uc           = UC()
 
@@ -133,15 +150,21 @@ class Aircraft(Model):
         
 
         constraints.update({"Dry Mass" : Tight([
-                    M_dry >= sum(c.M for c in components) + sum(s.M for s in systems)])})
+                    M_dry >= sum(c.M for c in components) + sum(s.M for s in systems) + payload.M_crew])})
         
 
         constraints.update({"Total Mass" : Tight([
                     M_0 >= M_fuel + M_dry])})
 
         # Stuff from S1 initial sizing
-        # constraints.update({"LDmax ratio (approx)" : [
-        #             LD_max == K_LD * (AR/Sw_Sref)**0.5          ]})
+        constraints.update({"LDmax ratio (approx)" : [
+                    LD_max == K_LD * (AR/Sw_Sref)**0.5          ]})
+
+        # Component masses can't go below their statistical share of M_0 until they get their own mass models
+        # (the fuselage's is its cabin's, which is the part that's free)
+        masses          = {"wing": wing.M, "fuse": fuse.cabin.M, "H_tail": H_tail.M, "V_tail": V_tail.M, "uc": uc.M}
+        constraints.update({"Component Masses" : [
+                    masses[name] >= fraction * M_0 for name, fraction in MASS_FRACTIONS.items()]})
 
         # Add bounding constraints - temporary
         self.boundingConstraints()
@@ -23,11 +23,10 @@ class H_TailAero(Model):
     #TODO: make ac_h update as we change the tailplane position; i.e. define it as 0.20 of the tailplane chord pos and then get the x value of that
 
     @parse_variables(__doc__, globals())
-    def setup(self, aircraft, state):
+    def setup(self, H_tail, state):
         
-        aircraft    = self.aircraft
-        state       = self.aircraft
-        wing        = aircraft.wing
+        self.H_tail = H_tail
+        self.state  = state
 
         constraints = {}
         components = self.components = []
@@ -35,8 +34,8 @@ class H_TailAero(Model):
         #TODO: airfoil class to re-use for tailplane, wing, cannard etc
         # airfoil = self.airfoil = NACA0015() or whatever
 
-        if aircraft.emp_config     == "T-Tail":    constraints.update({"Tailplane efficiency": [eta_h == 1.0]})
-        elif aircraft.emp_config   == "Low-Tail":  constraints.update({"Tailplane efficiency": [eta_h == 0.9]})
+        if H_tail.emp_config     == "T-Tail":    constraints.update({"Tailplane efficiency": [eta_h == 1.0]})
+        elif H_tail.emp_config   == "Low-Tail":  constraints.update({"Tailplane efficiency": [eta_h == 0.9]})
 
         return constraints
 
@@ -56,9 +55,10 @@ class H_Tail(Model):
 
     """
     @parse_variables(__doc__, globals())
-    def setup(self):
+    def setup(self, emp_config="T-tail"):
         constraints = []
         components = self.components = []
+        self.emp_config = emp_config
 
         # Empennage weight is sum of its components - note the tight constraint
         if len(components) > 0:
@@ -76,11 +76,10 @@ class V_TailAero(Model):
 
     """
     @parse_variables(__doc__, globals())
-    def setup(self, aircraft, state):
+    def setup(self, V_tail, state):
         
-        aircraft    = self.aircraft
-        state       = self.aircraft
-        wing        = aircraft.wing
+        self.V_tail = V_tail
+        self.state  = state
 
         constraints = {}
 
@@ -3,13 +3,27 @@ from gpkit.constraints.tight import Tight
 import numpy as np
 
 
+# CG stations (x, z) [m] of the loadable items - from the notes at the bottom, used by the loading diagram
+CG_STATIONS = {
+    "crew":                 (2.4,   0.6),
+    "passengers":           (6.25,  0.6),
+    "luggage":              (8.0,   0.42),
+    "wing fuel":            (6.65,  0.0),
+    "self-sealing fuel":    (4.5,   -0.0511),
+}
+M_PAX       = 100           # [kg]      Assumed Passenger Weight
+M_CREW      = 100           # [kg]      Assumed Crew Member Weight
+M_LUGGAGE   = 27            # [kg]      Assumed Luggage Weight
+
+
 class Payload(Model):
     """Payload model
 
     Variables
     ---------
-    M                           [kg]          Total Payload mass
-    M_pax                       [kg]          Total Mass of passengers + crew
+    M                           [kg]          Total Payload mass (passengers + luggage)
+    M_pax                       [kg]          Total Mass of passengers
+    M_crew                      [kg]          Total Mass of crew
     M_luggage                   [kg]          Total Mass of luggage
     g                9.81       [m/s^2]       Gravitational Acceleration
     x_cg                        [m]           x Center of Gravity location
@@ -18,16 +32,23 @@ class Payload(Model):
     """
     @parse_variables(__doc__, globals())
     def setup(self, pax=4, crew=2):
+        self.pax, self.crew = pax, crew
+
         # Constraints dictionary
         constraints = {}
 
         # Humans
-        m_pax = Variable('m_pax', 100, 'kg', 'Assumed Passenger Weight')
-        constraints.update({"Passengers + Crew Mass" : [
-                    M_pax == m_pax * (pax + crew)                                    ]})
+        m_pax = Variable('m_pax', M_PAX, 'kg', 'Assumed Passenger Weight')
+        constraints.update({"Passengers Mass" : [
+                    M_pax == m_pax * pax                                             ]})
+
+        # Crew are part of the operating empty mass rather than the payload - Aircraft adds them to M_dry
+        m_crew = Variable('m_crew', M_CREW, 'kg', 'Assumed Crew Member Weight')
+        constraints.update({"Crew Mass" : [
+                    M_crew == m_crew * crew                                          ]})
 
         # Luggage
-        m_luggage = Variable('m_luggage', 27, 'kg', 'Assumed Luggage Weight')
+        m_luggage = Variable('m_luggage', M_LUGGAGE, 'kg', 'Assumed Luggage Weight')
         constraints.update({"Luggage Mass" : [
                     M_luggage == m_luggage * pax                                     ]})
 
@@ -9,8 +9,6 @@ class UC(Model):
     Variables
     ---------
     M                           [kg]            Mass
-    x_cg                        [ft]            X position of centre of gravity
-    z_cg                        [ft]            Z position of centre of gravity
     x_mg                        [ft]            X position of main gear
     x_ng                        [ft]            X position of nose gear
     y_mg                        [ft]            Y position of main gears
@@ -18,8 +16,8 @@ class UC(Model):
     Fuselage_upsweep            [-]             Fuselage upsweep angle
     Fuselage_upsweep_length     [ft]            Fuselage upsweep length
     h_UC                        [ft]            Height of UC from ground to base of fuselage
-    x_cg                        [m]             x Center of Gravity location
-    z_cg                        [m]             z Center of Gravity location
+    x_cg                        [m]             X position of centre of gravity
+    z_cg                        [m]             Z position of centre of gravity
 
     """
     @parse_variables(__doc__, globals())
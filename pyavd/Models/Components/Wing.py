@@ -1,3 +1,5 @@
+import logging
+
 from gpkit import Model, Variable, VectorVariable, Vectorize, parse_variables
 from gpkit.constraints.tight import Tight
 from gpkit import ureg as u
@@ -47,11 +49,10 @@ class WingAero(Model):
         mu      = state.mu
 
         # Aerodynamic properties
-        print(f"rho:{rho}, U:{U}, c:{c}, mu:{mu}, Re:{rho * U * c / mu}")
-
         self.Re = rho * U * c / mu
         self.D  = 0.5 * rho * U**2 * Sref * CD
         self.CL = 0.5 * rho * U**2 * Sref * CL_alpha_w
+        logging.debug("rho:%s, U:%s, c:%s, mu:%s, Re:%s", rho, U, c, mu, self.Re)
 
         # constraints.update({"Reynolds": [Re >= rho * U * c / mu]})
         # constraints.update({"Drag": [D >= 0.5 * rho * U**2 * Sref * CD]})
@@ -0,0 +1,117 @@
+import numpy as np
+
+from .Envelope import thrust_lapse
+from .Field import GAMMA_MIN
+from .ISA import atmosphere, TABLE_CEILING
+from .Segments import Climb
+from .Mission import expand_legs
+
+
+SERVICE_ROC     = 500 * 0.3048 / 60     # [m/s]     Service ceiling rate of climb, 500 ft/min
+
+# FAR25.121 minimum climb gradients - indexed by n_engines, like Field.GAMMA_MIN
+FAR25_GRADIENTS = {
+    "second segment":   GAMMA_MIN,                                          # OEI, takeoff
+    "approach":         np.array([np.nan, np.nan, 0.021, 0.024, 0.027]),    # OEI, go-around
+    "landing":          np.array([np.nan, np.nan, 0.032, 0.032, 0.032]),    # AEO, go-around
+}
+
+# Which checks each climb segment of the mission profile has to meet, and with how many engines out
+FAR25_CHECKS    = {
+    "Climb":                (("second segment", 1),),
+    "Climb (Go Around)":    (("approach", 1), ("landing", 0)),
+}
+
+
+def climb(V, alt, WS, TW, alpha=1.0, Cd0=0.02, AR=7.5, e=0.9, thrust=1.0, dT=0.0):
+    """
+    Rate of climb [m/s] and climb gradient [rad] at speeds V [m/s] and altitudes alt [m]
+
+    WS [N/m^2] and TW (static) are at the design weight, alpha = W / W0 and thrust is the share
+    of it available (e.g. (N - 1) / N with an engine out). Everything broadcasts - speed x altitude
+    x weight x design grids are one call.
+    """
+    air     = atmosphere(alt, dT)
+    q       = 0.5 * air.density * np.asarray(V) ** 2
+    W_S     = alpha * WS
+
+    T_W     = thrust * thrust_lapse(air.h, air.sigma) * TW / alpha
+    D_W     = q * Cd0 / W_S + W_S / (q * np.pi * AR * e)
+
+    gamma   = np.arcsin(np.clip(T_W - D_W, -1, 1))
+
+    return V * np.sin(gamma), gamma
+
+
+def best_climb(alt, WS, TW, alpha=1.0, Cd0=0.02, AR=7.5, e=0.9, thrust=1.0, dT=0.0):
+    """
+    (speed [m/s], rate of climb [m/s]) for the fastest climb at altitudes alt [m] - parabolic polar
+    closed form, V = sqrt(W/S / (3 rho Cd0) * (T/W + sqrt((T/W)^2 + 12 Cd0 K)))
+    """
+    air     = atmosphere(alt, dT)
+    W_S     = alpha * WS
+    K       = 1 / (np.pi * AR * e)
+
+    T_W     = thrust * thrust_lapse(air.h, air.sigma) * TW / alpha
+    V       = np.sqrt(W_S / (3 * air.density * Cd0) * (T_W + np.sqrt(T_W**2 + 12 * Cd0 * K)))
+
+    return V, climb(V, alt, WS, TW, alpha, Cd0, AR, e, thrust, dT)[0]
+
+
+def ceiling(WS, TW, rate=SERVICE_ROC, alt_max=TABLE_CEILING, tol=0.1, **kwargs):
+    """
+    Altitude [m] where the best rate of climb drops to rate [m/s] - bisection over every design at once
+
+    rate=SERVICE_ROC is the service ceiling, rate=0 the absolute one. WS, TW and kwargs (see
+    best_climb) broadcast; each bisection step is one vectorized best_climb call, so a sweep's
+    worth of designs costs about log2(alt_max / tol) calls. NaN where even sea level can't make
+    rate, alt_max where the ceiling is above it.
+    """
+    shape   = np.broadcast(np.asarray(WS), np.asarray(TW), *map(np.asarray, kwargs.values())).shape
+    lo      = np.zeros(shape)
+    hi      = np.full(shape, float(alt_max))
+
+    excess  = lambda h: best_climb(h, WS, TW, **kwargs)[1] - rate
+    below   = excess(lo) < 0
+    above   = excess(hi) >= 0
+
+    for _ in range(int(np.ceil(np.log2(alt_max / tol)))):
+        mid         = 0.5 * (lo + hi)
+        climbing    = excess(mid) >= 0
+        lo          = np.where(climbing, mid, lo)
+        hi          = np.where(climbing, hi, mid)
+
+    return np.where(below, np.nan, np.where(above, alt_max, 0.5 * (lo + hi)))
+
+
+def far25_gradients(M_segments, profile, WS, TW, CL_max=2.1, CL_clean=1.5, Cd0=0.02, AR=7.5, e=0.9, n_engines=2):
+    """
+    FAR25.121 climb gradient checks at the mission's own segment weights
+
+    M_segments is the Mission's segment boundary masses [kg] (e.g. Sweep output "Mission.M"), any
+    leading design axes first, the profile's legs last. Each climb leg is checked (FAR25_CHECKS) at
+    its starting weight with the same CD / CL as its GP constraint (Climb.boundary). Design
+    parameters broadcast over the leading axes. Returns {"<segment> <check>": {"gradient",
+    "required", "ok"}}, each shaped like the leading axes.
+    """
+    M_segments  = np.asarray(M_segments, dtype=float)
+    n_engines   = np.asarray(n_engines)
+    out         = {}
+
+    for i, (segment, kwargs) in enumerate(expand_legs(profile)):
+        if segment not in FAR25_CHECKS:
+            continue
+
+        alpha   = M_segments[..., i] / M_segments[..., 0]
+        shape   = np.broadcast(alpha, WS, CL_max, CL_clean, Cd0, AR, e, n_engines).shape
+        CD_CL   = Climb.boundary(np.zeros(shape), CL_max, CL_clean, AR, e, Cd0, kwargs.get("dCd0", 0), kwargs.get("de", 0), 0,
+                                 goAround=segment == "Climb (Go Around)")
+
+        for check, out_engines in FAR25_CHECKS[segment]:
+            gradient    = (n_engines - out_engines) / n_engines * TW / alpha - CD_CL
+            required    = FAR25_GRADIENTS[check][np.clip(n_engines, 0, 4)]
+            label       = f"{segment} {check}" if f"{segment} {check}" not in out else f"{segment} {check} {i}"
+
+            out[label]  = {"gradient": gradient, "required": required, "ok": gradient >= required}
+
+    return out
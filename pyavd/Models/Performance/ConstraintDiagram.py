@@ -0,0 +1,138 @@
+import inspect
+
+import numpy as np
+
+from .ISA import atmosphere
+from .Mission import MISSION_PROFILE, SEGMENT_DEFAULTS, expand_legs
+from .Segments import Takeoff, Climb, Climb_GoAround, Cruise, Landing
+from ..Components.Aircraft import Aircraft
+
+
+def aircraft_defaults(names=("CL_max", "CL_clean", "AR", "e", "Cd0")):
+    """
+    Aircraft's fixed values by name, without building one - from its Variables docstring, or
+    setup's default where the value is a hyperparameter (e.g. "CL_max  CL_max  [-]")
+    """
+    hyperparameters = {k: p.default for k, p in inspect.signature(Aircraft.setup).parameters.items()}
+    values          = {}
+
+    for line in Aircraft.__doc__.splitlines():
+        fields = line.split()
+        if len(fields) > 2 and fields[0] in names and fields[2].startswith("["):
+            values[fields[0]] = float(hyperparameters.get(fields[1], fields[1]))
+
+    return values
+
+
+def si(value):
+    return value.to_base_units().magnitude if hasattr(value, "to_base_units") else value
+
+
+class ConstraintDiagram:
+    """T/W vs W/S constraint diagram, without the GP
+
+    Every boundary is the segment class's own closed form (Takeoff.boundary etc.), which use the
+    same coefficients as the GP constraints, so the two can't drift apart. The profile is Mission's
+    (legs expanded, Segment's defaults filled in, SI floats) and anything not given comes from
+    Aircraft's own Variables. All evaluation is broadcast NumPy over the W/S grid - a 1e5 point
+    diagram takes a few milliseconds.
+    """
+
+    def __init__(self, profile=MISSION_PROFILE, **aircraft):
+        values          = {**aircraft_defaults(), **aircraft}
+
+        self.CL_max     = values["CL_max"]
+        self.CL_clean   = values["CL_clean"]
+        self.AR         = values["AR"]
+        self.e          = values["e"]
+        self.Cd0        = values["Cd0"]
+        self.profile    = [(name, {k: si(v) for k, v in {**SEGMENT_DEFAULTS, **kw}.items()}) for name, kw in expand_legs(profile)]
+
+        # Atmosphere only depends on the profile, so look it up once rather than on every redraw
+        self.atmosphere = {i: atmosphere(kw["alt"]) for i, (name, kw) in enumerate(self.profile) if name == "Cruise"}
+
+
+    def boundaries(self, WS):
+        """Required T/W for each segment of the profile over WS [N/m^2] - {label: array like WS}"""
+        WS      = np.asarray(WS, dtype=float)
+        out     = {}
+
+        for i, (name, kw) in enumerate(self.profile):
+            # Field length is Takeoff / Landing's own default unless the profile sets one
+            fl = {"fl": kw["fl"]} if "fl" in kw else {}
+
+            if name == "Takeoff":
+                TW = Takeoff.boundary(WS, self.CL_max, self.CL_clean, **fl)
+
+            elif name in ("Climb", "Climb (Go Around)"):
+                model   = Climb_GoAround if name == "Climb (Go Around)" else Climb
+                TW      = model.boundary(WS, self.CL_max, self.CL_clean, self.AR, self.e, self.Cd0, kw["dCd0"], kw["de"], kw["climb_gradient"])
+
+            elif name == "Cruise":
+                atmos   = self.atmosphere[i]
+                vel     = atmos.speed_of_sound * kw["mach"] if "mach" in kw else kw["vel"]
+                TW      = Cruise.boundary(WS, kw["alt"], vel, atmos.density, self.AR, self.e, self.Cd0, kw["alpha"], kw["n"])
+
+            elif name == "Landing":
+                TW = Landing.boundary(WS, self.CL_max, **fl)
+
+            else:
+                raise ValueError(f"No closed-form boundary for segment '{name}'")
+
+            # Repeated segment types get numbered, like gpkit does for model lineage
+            label       = name if name not in out else f"{name} {sum(k.startswith(name) for k in out) + 1}"
+            out[label]  = TW
+
+        return out
+
+
+    def evaluate(self, WS):
+        """
+        Boundaries, the feasible envelope and the optimum corner over WS [N/m^2]
+
+        The envelope is the max required T/W at each W/S (infinite where W/S is infeasible).
+        The optimum is the lowest T/W on the envelope - ties go to the highest W/S (smaller wing).
+        """
+        WS          = np.asarray(WS, dtype=float)
+        boundaries  = self.boundaries(WS)
+        stacked     = np.stack([np.broadcast_to(TW, WS.shape) for TW in boundaries.values()])
+
+        envelope    = stacked.max(axis=0)
+        active      = stacked.argmax(axis=0)
+        feasible    = np.isfinite(envelope)
+
+        if not feasible.any():
+            return {"WS": WS, "boundaries": boundaries, "envelope": envelope, "feasible": feasible, "optimum": None}
+
+        # Highest W/S among the minimum-T/W points - flip so argmin picks the last occurrence
+        best        = len(WS) - 1 - np.argmin(envelope[::-1])
+        optimum     = {"WS": WS[best], "TW": envelope[best], "active": list(boundaries)[active[best]]}
+
+        return {"WS": WS, "boundaries": boundaries, "envelope": envelope, "feasible": feasible, "optimum": optimum}
+
+
+    def plot(self, WS, ax=None):
+        """Draws the diagram with the feasible region shaded - returns the matplotlib axes"""
+        import matplotlib.pyplot as plt
+
+        result  = self.evaluate(WS)
+        ax      = ax or plt.subplots()[1]
+        top     = np.nanmax(np.where(result["feasible"], result["envelope"], np.nan)) * 1.5
+
+        for label, TW in result["boundaries"].items():
+            if label.startswith("Landing"):
+                ax.axvline(WS[np.flatnonzero(np.isfinite(TW))[-1]], label=label, linestyle="--")
+            else:
+                ax.plot(WS, np.broadcast_to(TW, WS.shape), label=label)
+
+        ax.fill_between(WS, np.where(result["feasible"], result["envelope"], top), top, alpha=0.2, label="Feasible")
+
+        if result["optimum"]:
+            ax.plot(result["optimum"]["WS"], result["optimum"]["TW"], "k*", markersize=12, label="Design point")
+
+        ax.set_xlabel("W/S [N/m^2]")
+        ax.set_ylabel("T/W [-]")
+        ax.set_ylim(0, top)
+        ax.legend()
+
+        return ax
@@ -0,0 +1,119 @@
+import numpy as np
+
+from .ISA import atmosphere
+from .Segments import LAPSE_TROPO, LAPSE_STRATO, TROPOPAUSE
+
+
+# Default grid - 0 to 50,000 ft and up to M 1
+ALT_MAX         = 15240         # [m]
+MACH_MAX        = 1.0           # [-]
+PS_LEVELS       = np.arange(0, 61, 5)   # [m/s]
+
+
+def thrust_lapse(alt, sigma):
+    """T / T_static at altitudes alt [m] - the same lapse the Cruise GP constraint uses"""
+    return np.where(alt <= TROPOPAUSE, sigma ** LAPSE_TROPO, LAPSE_STRATO * sigma)
+
+
+
+class FlightEnvelope:
+    """
+    Specific excess power and the level flight envelope over an altitude x Mach grid
+
+    Uses the aircraft's parabolic drag polar (Cd0, AR, e) and the Cruise thrust lapse, at a
+    weight fraction alpha = W / W0 of the design WS [N/m^2] and TW (static). The atmosphere is
+    looked up once per altitude and everything else broadcasts over (alt, mach), so a 500 x 500
+    grid is a few milliseconds - quick enough to redraw on every slider move.
+
+    >>> envelope = FlightEnvelope(WS=4500, TW=0.3, alpha=0.9)
+    >>> data = envelope.contours()
+    """
+
+    def __init__(self, WS, TW, CL_max_clean=1.5, Cd0=0.02, AR=7.5, e=0.9, alpha=1.0, n=1.0,
+                 alt=None, mach=None, dT=0.0, points=500):
+        self.WS             = WS
+        self.TW             = TW
+        self.CL_max_clean   = CL_max_clean
+        self.Cd0            = Cd0
+        self.K              = 1 / (np.pi * AR * e)
+        self.alpha          = alpha
+        self.n              = n
+
+        self.alt            = np.linspace(0, ALT_MAX, points) if alt is None else np.asarray(alt, dtype=float)
+        self.mach           = np.linspace(0.05, MACH_MAX, points) if mach is None else np.asarray(mach, dtype=float)
+
+        air                 = atmosphere(self.alt, dT)
+        self.rho            = air.density
+        self.a              = air.speed_of_sound
+        self.beta           = thrust_lapse(self.alt, air.sigma)
+
+
+    def Ps(self):
+        """Specific excess power V (T - D) / W [m/s] over the (alt, mach) grid"""
+        V   = self.a[:, None] * self.mach[None, :]
+        q   = 0.5 * self.rho[:, None] * V**2
+        W_S = self.alpha * self.WS
+
+        T_W = self.beta[:, None] * self.TW / self.alpha
+        D_W = q * self.Cd0 / W_S + self.K * self.n**2 * W_S / q
+
+        return V * (T_W - D_W)
+
+
+    def stall(self):
+        """Stall Mach number at each altitude (1 g, clean)"""
+        V_s = np.sqrt(2 * self.alpha * self.WS / (self.rho * self.CL_max_clean))
+
+        return V_s / self.a
+
+
+    def thrust_limits(self):
+        """
+        (min, max) thrust-limited Mach at each altitude - the two roots of T = D in level flight
+
+        T/W = q Cd0 / W_S + K W_S / q is a quadratic in q; NaN above the absolute ceiling.
+        """
+        W_S     = self.alpha * self.WS
+        T_W     = self.beta * self.TW / self.alpha
+
+        with np.errstate(invalid="ignore"):
+            root    = np.sqrt(T_W**2 - 4 * self.Cd0 * self.K * self.n**2)
+            q       = (T_W + np.array([[-1], [1]]) * root) * W_S / (2 * self.Cd0)
+            M       = np.sqrt(2 * q / self.rho) / self.a
+
+        return M[0], M[1]
+
+
+    def contours(self, levels=PS_LEVELS):
+        """
+        Contour data as plain arrays - {"alt", "mach", "Ps", "levels", "M_stall", "M_min", "M_max"}
+
+        Ps is NaN outside the envelope (below stall), the boundaries are per altitude.
+        """
+        Ps              = self.Ps()
+        M_stall         = self.stall()
+        M_min, M_max    = self.thrust_limits()
+
+        return {"alt": self.alt, "mach": self.mach, "Ps": np.where(self.mach[None, :] >= M_stall[:, None], Ps, np.nan),
+                "levels": np.asarray(levels), "M_stall": M_stall, "M_min": M_min, "M_max": M_max}
+
+
+    def plot(self, levels=PS_LEVELS, ax=None):
+        """Ps contours with the stall and thrust boundaries - returns the matplotlib axes"""
+        import matplotlib.pyplot as plt
+
+        data    = self.contours(levels)
+        ax      = ax or plt.subplots()[1]
+        alt_ft  = data["alt"] / 0.3048
+
+        lines   = ax.contour(data["mach"], alt_ft, data["Ps"], levels=data["levels"], colors="k", linewidths=0.8)
+        ax.clabel(lines, fmt="%g m/s")
+        ax.plot(data["M_stall"], alt_ft, "r-", label="Stall")
+        ax.plot(data["M_max"], alt_ft, "b-", label="Max speed")
+
+        ax.set_xlabel("Mach")
+        ax.set_ylabel("Altitude [ft]")
+        ax.set_xlim(data["mach"][0], data["mach"][-1])
+        ax.legend()
+
+        return ax
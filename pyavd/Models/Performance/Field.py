@@ -0,0 +1,246 @@
+import numpy as np
+
+from .ISA import atmosphere
+
+
+# FAR25 obstacle heights (see Regulations) [m]
+H_OBS_TAKEOFF   = 35 * 0.3048
+H_OBS_LAND      = 50 * 0.3048
+
+G               = 9.81          # [m/s^2]
+MU_ROLL         = 0.03          # [-]       Rolling friction, dry concrete
+MU_BRAKE        = 0.3           # [-]       Wheel braking - conservative end of 0.3 to 0.5
+ROTATION_RATE   = np.radians(3) # [rad/s]
+N_PULLUP        = 1.2           # [-]       Load factor in the transition / flare
+GAMMA_APPROACH  = np.radians(3) # [rad]
+T_FREE_ROLL     = 3             # [s]       Worst case of 1 to 3 s
+TO_FACTOR       = 1.15          # [-]       Required / actual takeoff distance
+LD_FACTOR       = 1.666         # [-]       Required / actual landing distance
+
+
+def ground_run(K_T, K_A, V_start, V_end, g=G):
+    """
+    Distance to go from V_start to V_end under a = g (K_T + K_A V^2) - Raymer 17.99
+
+    Evaluated everywhere at once: K_A ~ 0 takes the constant-acceleration limit, and points that
+    never reach V_end (the log argument isn't positive) are NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        small   = np.abs(K_A) < 1e-9
+        K_A_    = np.where(small, 1.0, K_A)
+        ratio   = (K_T + K_A_ * V_end**2) / (K_T + K_A_ * V_start**2)
+
+        S       = np.where(small, (V_end**2 - V_start**2) / (2 * g * K_T), np.log(ratio) / (2 * g * K_A_))
+        valid   = np.where(small, True, ratio > 0) & (S >= 0) & np.isfinite(S)
+
+    return np.where(valid, S, np.nan)
+
+
+
+class FieldPerformance:
+    """
+    Takeoff and landing distances over whole grids of designs and airfields at once
+
+    Every input may be a float or an array - they're broadcast together, so e.g. WS[:, None, None],
+    TW[None, :, None], elevation[None, None, :] gives every distance on the full 3D grid in one pass.
+    SI units throughout (WS [N/m^2], elevation [m], dT [K] ISA offset, angles in radians).
+    The former scalar if/else branches (transition above / below the obstacle, thrust reversers,
+    wheel brakes) are np.where masks, and impossible cases come back as NaN.
+    """
+
+    def __init__(self, WS, TW, CL_max, elevation=0.0, dT=0.0, CL_max_landing=None, Cd0=0.02, AR=7.5, e=0.9,
+                 CL_ground=0.3, CL_landing=None, LD_TO=10.0, dalpha_rotation=np.radians(10), landing_fraction=0.85,
+                 rev_thrust=False, wheel_braking=True):
+
+        CL_max_landing  = CL_max if CL_max_landing is None else CL_max_landing
+        CL_landing      = CL_ground if CL_landing is None else CL_landing
+
+        (self.WS, self.TW, self.CL_max, self.CL_max_landing, self.elevation, self.dT, self.Cd0, self.AR, self.e,
+         self.CL_ground, self.CL_landing, self.LD_TO, self.dalpha_rotation, self.landing_fraction, self.rev_thrust,
+         self.wheel_braking) = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (
+            WS, TW, CL_max, CL_max_landing, elevation, dT, Cd0, AR, e, CL_ground, CL_landing, LD_TO, dalpha_rotation,
+            landing_fraction, rev_thrust, wheel_braking)])
+
+        self.rho        = atmosphere(self.elevation, self.dT).density
+        self.K          = 1 / (np.pi * self.AR * self.e)
+
+        # Landing at landing_fraction of takeoff weight
+        self.WS_landing = self.WS * self.landing_fraction
+
+        self.V_stall_TO = np.sqrt(2 * self.WS / (self.rho * self.CL_max))
+        self.V_stall_LD = np.sqrt(2 * self.WS_landing / (self.rho * self.CL_max_landing))
+        self.V_lof      = 1.1 * self.V_stall_TO
+        self.V_tr       = 1.15 * self.V_stall_TO
+        self.V_td       = 1.15 * self.V_stall_LD
+        self.V_f        = 1.23 * self.V_stall_LD
+
+
+    def get_Sg(self):
+        """Ground roll to lift-off"""
+        K_A = (self.rho / (2 * self.WS)) * (MU_ROLL * self.CL_ground - self.Cd0 - self.K * self.CL_ground**2)
+        K_T = self.TW - MU_ROLL
+
+        return ground_run(K_T, K_A, 0.0, self.V_lof)
+
+
+    def get_Sr(self):
+        """Rotation - V_lof held while the nose comes up"""
+        return self.V_lof * self.dalpha_rotation / ROTATION_RATE
+
+
+    def get_Str_Scl(self):
+        """Transition arc and climb to the obstacle - no climb segment where the arc clears it"""
+        R       = self.V_tr**2 / ((N_PULLUP - 1) * G)
+
+        with np.errstate(invalid="ignore"):
+            gamma   = np.arcsin(np.where(self.TW - 1 / self.LD_TO > 0, self.TW - 1 / self.LD_TO, np.nan))
+
+        h_tr    = R * (1 - np.cos(gamma))
+        above   = h_tr > H_OBS_TAKEOFF
+
+        with np.errstate(invalid="ignore"):
+            S_tr    = np.where(above, np.sqrt(R**2 - (R - H_OBS_TAKEOFF)**2), R * np.sin(gamma))
+            S_cl    = np.where(above, 0.0, (H_OBS_TAKEOFF - h_tr) / np.tan(gamma))
+
+        return S_tr, S_cl
+
+
+    def get_Sb(self):
+        """Braking from touchdown to a stop - reverse thrust -0.4 T_max, else 0.15 T_max residual idle"""
+        T_braking   = np.where(self.rev_thrust.astype(bool), -0.4, 0.15) * self.TW / self.landing_fraction
+        mu          = np.where(self.wheel_braking.astype(bool), MU_BRAKE, MU_ROLL)
+
+        K_A = (self.rho / (2 * self.WS_landing)) * (mu * self.CL_landing - self.Cd0 - self.K * self.CL_landing**2)
+        K_T = T_braking - mu
+
+        return ground_run(K_T, K_A, self.V_td, 0.0)
+
+
+    def get_Sfr(self):
+        """Free roll before the brakes come on"""
+        return self.V_td * T_FREE_ROLL
+
+
+    def get_Sf_hf(self):
+        """Flare distance and the height it starts at"""
+        R   = self.V_f**2 / ((N_PULLUP - 1) * G)
+
+        return R * np.sin(GAMMA_APPROACH), R * (1 - np.cos(GAMMA_APPROACH))
+
+
+    def get_Sa(self):
+        """Approach from the obstacle down to the flare height - none if the flare starts above the obstacle"""
+        _, h_f = self.get_Sf_hf()
+
+        return np.maximum(H_OBS_LAND - h_f, 0) / np.tan(GAMMA_APPROACH)
+
+
+    def evaluate(self):
+        """Every distance [m] plus the totals and FAR25 required (factored) lengths - arrays of the broadcast shape"""
+        S_g             = self.get_Sg()
+        S_r             = self.get_Sr()
+        S_tr, S_cl      = self.get_Str_Scl()
+        S_a             = self.get_Sa()
+        S_f, h_f        = self.get_Sf_hf()
+        S_fr            = self.get_Sfr()
+        S_b             = self.get_Sb()
+
+        S_TO            = S_g + S_r + S_tr + S_cl
+        S_LD            = S_a + S_f + S_fr + S_b
+
+        return {"S_g": S_g, "S_r": S_r, "S_tr": S_tr, "S_cl": S_cl, "S_TO": S_TO, "S_TO_req": TO_FACTOR * S_TO,
+                "S_a": S_a, "S_f": S_f, "h_f": h_f, "S_fr": S_fr, "S_b": S_b, "S_LD": S_LD, "S_LD_req": LD_FACTOR * S_LD}
+
+
+
+# Minimum OEI second-segment climb gradient by engine count (FAR25.121) - indexed by n_engines
+GAMMA_MIN       = np.array([np.nan, np.nan, 0.024, 0.027, 0.030])
+H_OBS_BFL       = 35 * 0.3048   # [m]
+BFL_CONSTANT    = 655 * 0.3048  # [m]       Raymer's 655 ft
+
+
+def balanced_field_length(WS, TW, n_engines=2, BPR=5.0, CL_max_TO=1.92, CL_climb=None, LD_climb=10.0,
+                          CL_max_clean=1.5, elevation=0.0, dT=0.0, flaps=True):
+    """
+    Balanced field length [m] - Raymer 17.114, over broadcast arrays of every input
+
+    WS [N/m^2] and TW (static, all engines) at the takeoff weight, n_engines in 2/3/4, elevation [m]
+    and dT [K] set the density altitude. CL_climb defaults to CL_max_TO at 1.2 V_stall. Raymer's
+    formula is in ft and lb, but its only dimensional terms are WS / (rho g CL) (a length either way)
+    and two constant lengths, so it's evaluated in SI directly. NaN where the engine-out climb
+    gradient is below the FAR25 minimum or there isn't enough thrust to accelerate.
+    """
+    n_engines   = np.asarray(n_engines)
+    CL_climb    = CL_max_TO / 1.2**2 if CL_climb is None else CL_climb
+
+    air         = atmosphere(elevation, dT)
+    sigma       = air.sigma
+
+    # Average takeoff thrust for a turbofan - Raymer 17.112
+    T_av_W      = 0.75 * TW * (5 + BPR) / (4 + BPR)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        gamma_climb = np.arcsin((n_engines - 1) / n_engines * TW - 1 / LD_climb)
+        dgamma      = gamma_climb - GAMMA_MIN[np.clip(n_engines, 0, len(GAMMA_MIN) - 1).astype(int)]
+
+        # 0.01 CL_max_clean + 0.02 with typical flaps, 0.01 CL_max_clean without
+        U           = 0.01 * CL_max_clean + np.where(flaps, 0.02, 0.0)
+        accelerate  = T_av_W - U
+
+        BFL = (0.863 / (1 + 2.3 * dgamma)) * (WS / (air.density * G * CL_climb) + H_OBS_BFL) * (1 / accelerate + 2.7) \
+              + BFL_CONSTANT / np.sqrt(sigma)
+
+    return np.where((dgamma >= 0) & (accelerate > 0), BFL, np.nan)
+
+
+def wat_limits(W, S, T_static, runway, elevation=0.0, dT=0.0, **kwargs):
+    """
+    WAT chart - the heaviest takeoff weight [N] with a BFL within runway [m] and the engine-out climb met
+
+    W is a 1D ascending weight grid, appended as the last axis - elevation, dT, runway and anything in
+    kwargs (see balanced_field_length) broadcast over the rest. The limit is interpolated between the
+    last weight that works and the first that doesn't, NaN if even the lightest doesn't.
+    Returns (limit, BFL table over the weight grid).
+    """
+    W           = np.asarray(W, dtype=float)
+    cond        = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in (S, T_static, runway, elevation, dT)])
+    S, T_static, runway, elevation, dT = (c[..., None] for c in cond)
+
+    BFL         = balanced_field_length(W / S, T_static / W, elevation=elevation, dT=dT,
+                                        **{k: np.asarray(v)[..., None] for k, v in kwargs.items()})
+    ok          = BFL <= runway
+
+    # Last feasible weight along the grid (weights are ascending, so BFL is too)
+    any_ok      = ok.any(axis=-1)
+    last        = np.where(any_ok, ok.shape[-1] - 1 - np.argmax(ok[..., ::-1], axis=-1), 0)
+    nxt         = np.minimum(last + 1, ok.shape[-1] - 1)
+
+    take        = lambda a, i: np.take_along_axis(np.broadcast_to(a, ok.shape), i[..., None], axis=-1)[..., 0]
+    W0, W1      = W[last], W[nxt]
+    B0, B1      = take(BFL, last), take(BFL, nxt)
+
+    # Interpolate to the runway length when the next weight is runway limited, else stop at the grid point
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac    = np.clip((runway[..., 0] - B0) / (B1 - B0), 0, 1)
+    limit       = np.where(np.isfinite(B1) & (nxt > last), W0 + frac * (W1 - W0), W0)
+
+    return np.where(any_ok, limit, np.nan), BFL
+
+
+def wat_plot(W, S, T_static, runway, elevation, dT=(-15, 0, 15, 30), ax=None, **kwargs):
+    """Takeoff weight limit vs airfield elevation, one line per ISA offset - returns the matplotlib axes"""
+    import matplotlib.pyplot as plt
+
+    elevation   = np.asarray(elevation, dtype=float)
+    dT          = np.asarray(dT, dtype=float)
+    limit, _    = wat_limits(W, S, T_static, runway, elevation[:, None], dT[None, :], **kwargs)
+    ax          = ax or plt.subplots()[1]
+
+    for j, offset in enumerate(dT):
+        ax.plot(elevation, limit[:, j] / G, label=f"ISA{offset:+.0f}")
+
+    ax.set_xlabel("Airfield elevation [m]")
+    ax.set_ylabel("Takeoff mass limit [kg]")
+    ax.legend()
+
+    return ax
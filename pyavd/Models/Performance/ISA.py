@@ -0,0 +1,101 @@
+import functools
+
+import numpy as np
+
+
+# Air and ISA constants - the same ones ambiance uses, so the table matches it at dT = 0
+R_AIR           = 287.05287     # [J/kg/K]      Specific gas constant
+GAMMA           = 1.4           # [-]           Ratio of specific heats
+SUTHERLAND_BETA = 1.458e-6      # [kg/m/s/K^0.5]
+SUTHERLAND_S    = 110.4         # [K]
+RHO0            = 1.225         # [kg/m^3]      Sea level density
+T0              = 288.15        # [K]           Sea level temperature
+P0              = 101325.0      # [Pa]          Sea level pressure
+G0              = 9.80665       # [m/s^2]
+R_EARTH         = 6356766.0     # [m]           Radius used for geopotential height
+LAPSE           = -0.0065       # [K/m]         Troposphere lapse rate
+
+TABLE_CEILING   = 20000         # [m]
+TABLE_STEP      = 10            # [m]
+
+
+class Air:
+    """
+    Atmospheric properties at one or more altitudes - SI arrays shaped like the altitude
+
+    Attribute names follow ambiance.Atmosphere, so either can be used as State.atmosphere.
+    """
+
+    def __init__(self, h, temperature, pressure):
+        self.h                  = h
+        self.temperature        = temperature
+        self.pressure           = pressure
+        self.density            = pressure / (R_AIR * temperature)
+        self.speed_of_sound     = np.sqrt(GAMMA * R_AIR * temperature)
+        self.dynamic_viscosity  = SUTHERLAND_BETA * temperature**1.5 / (temperature + SUTHERLAND_S)
+        self.sigma              = self.density / RHO0
+
+
+
+def standard(h):
+    """
+    ISA temperature [K] and pressure [Pa] at geometric altitudes h [m] - troposphere and lower
+    stratosphere only (up to 20 km), so the model never has to import ambiance (and scipy) for them
+    """
+    H       = R_EARTH * h / (R_EARTH + h)
+    H11     = np.minimum(H, 11000.0)
+
+    T       = T0 + LAPSE * H11
+    p       = P0 * (T / T0) ** (-G0 / (LAPSE * R_AIR))
+    p       = p * np.exp(-G0 * np.maximum(H - 11000.0, 0) / (R_AIR * T))
+
+    return T, p
+
+
+
+class AtmosphereTable:
+    """
+    ISA temperature and pressure tabulated once over [0, ceiling] m, interpolated on lookup
+
+    Pressure is interpolated in log space, which is exact within an isothermal layer and far
+    below 1e-6 relative elsewhere at the default 10 m step. Everything else is derived from T
+    and p, so an ISA+dT day (pressure altitude unchanged, temperature offset) costs nothing extra.
+    Altitudes off the table go straight to ambiance (imported then, it pulls in scipy).
+    """
+
+    def __init__(self, ceiling=TABLE_CEILING, step=TABLE_STEP):
+        if ceiling > 20000:
+            raise ValueError("The ISA table only covers 0-20 km - use ambiance above that")
+
+        self.h                      = np.arange(0, ceiling + step, step, dtype=float)
+        self.temperature, pressure  = standard(self.h)
+        self.log_pressure           = np.log(pressure)
+
+
+    def __call__(self, alt, dT=0):
+        """Air at alt [m] (float, array or Quantity) on an ISA+dT [K] day"""
+        h       = np.asarray(alt.to("m").magnitude if hasattr(alt, "to") else alt, dtype=float)
+        T       = np.array(np.interp(h, self.h, self.temperature))
+        p       = np.array(np.exp(np.interp(h, self.h, self.log_pressure)))
+
+        outside = (h < self.h[0]) | (h > self.h[-1])
+        if outside.any():
+            from ambiance import Atmosphere
+
+            off_table       = Atmosphere(h[outside])
+            T[outside]      = off_table.temperature
+            p[outside]      = off_table.pressure
+
+        return Air(h, T + dT, p)
+
+
+
+@functools.lru_cache(maxsize=None)
+def default_table():
+    """The shared 0-20 km table - built on first use"""
+    return AtmosphereTable()
+
+
+def atmosphere(alt, dT=0):
+    """Air at alt [m] (float, array or Quantity) on an ISA+dT [K] day - see AtmosphereTable"""
+    return default_table()(alt, dT)
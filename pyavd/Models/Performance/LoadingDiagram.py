@@ -0,0 +1,155 @@
+import math
+from itertools import permutations
+
+import numpy as np
+
+from ..Components.Payload import CG_STATIONS, M_CREW, M_PAX, M_LUGGAGE
+
+
+# Fuel tanks in fill order (burnt in reverse) - capacity share of the total fuel
+FUEL_TANKS  = [("wing fuel", 0.8), ("self-sealing fuel", 0.2)]
+
+# Passenger seats either side of the passengers' station
+SEAT_PITCH  = 0.9           # [m]
+ABREAST     = 2
+
+
+def payload_items(pax=4, crew=2, m_pax=M_PAX, m_luggage=M_LUGGAGE, m_crew=M_CREW, stations=CG_STATIONS):
+    """
+    Every loadable payload item as (names, mass, x, z) arrays - one entry per person / bag
+
+    Passengers are seated in rows of ABREAST, SEAT_PITCH apart and centred on their station,
+    so the order they board in matters. Crew and luggage sit at their station.
+    """
+    rows        = np.arange(pax) // ABREAST
+    x_seats     = stations["passengers"][0] + (rows - rows.mean()) * SEAT_PITCH if pax else np.zeros(0)
+
+    names       = [f"crew {i + 1}" for i in range(crew)] + [f"passenger {i + 1}" for i in range(pax)] + [f"bag {i + 1}" for i in range(pax)]
+    mass        = np.array([m_crew] * crew + [m_pax] * pax + [m_luggage] * pax, dtype=float)
+    x           = np.concatenate([np.full(crew, stations["crew"][0]), x_seats, np.full(pax, stations["luggage"][0])])
+    z           = np.concatenate([np.full(crew, stations["crew"][1]), np.full(pax, stations["passengers"][1]), np.full(pax, stations["luggage"][1])])
+
+    return names, mass, x, z
+
+
+
+class LoadingDiagram:
+    """
+    Loading diagram and CG envelope - mass / moment accumulation over boarding orders and fuel states
+
+    Starts from the empty aircraft (M_empty [kg] at x_empty, z_empty [m]) and loads the payload items
+    one at a time in every boarding order (all of them if there are few enough, else random ones
+    plus front-to-back and back-to-front), then fuels / burns fuel tank by tank (FUEL_TANKS).
+    Everything is one cumulative sum over a (orders, items) array, so thousands of orders take
+    milliseconds - cheap enough to run on every design of a sweep.
+
+    >>> diagram = LoadingDiagram(M_empty=3500, x_empty=6.4, fuel_max=2000)
+    >>> diagram.envelope({"Takeoff": (2000, 1940), "Cruise": (1900, 800)})
+    """
+
+    def __init__(self, M_empty, x_empty, z_empty=0.0, fuel_max=0.0, items=None, tanks=FUEL_TANKS, stations=CG_STATIONS):
+        self.M_empty    = float(M_empty)
+        self.x_empty    = float(x_empty)
+        self.z_empty    = float(z_empty)
+        self.fuel_max   = float(fuel_max)
+
+        self.names, self.mass, self.x, self.z = items if items is not None else payload_items(stations=stations)
+
+        # Tank capacities and stations, in fill order
+        self.capacity   = np.array([share for _, share in tanks]) * self.fuel_max
+        self.tank_x     = np.array([stations[name][0] for name, _ in tanks])
+        self.tank_z     = np.array([stations[name][1] for name, _ in tanks])
+
+
+    def orders(self, n=4096, seed=0):
+        """Boarding orders as an (orders, items) index array"""
+        count = len(self.mass)
+
+        if math.factorial(count) <= n:
+            return np.array(list(permutations(range(count))), dtype=int).reshape(-1, count)
+
+        front_to_back   = np.argsort(self.x, kind="stable")
+        shuffled        = np.random.default_rng(seed).random((n - 2, count)).argsort(axis=1)
+
+        return np.vstack([front_to_back, front_to_back[::-1], shuffled])
+
+
+    def boarding(self, orders=None):
+        """
+        Mass and CG after each item boards, for every order - {"mass", "x_cg", "z_cg"} shaped
+        (orders, items + 1), column 0 being the empty aircraft
+        """
+        orders  = self.orders() if orders is None else np.asarray(orders)
+        m       = self.mass[orders]
+
+        mass    = self.M_empty + np.cumsum(np.pad(m, ((0, 0), (1, 0))), axis=1)
+        Mx      = self.M_empty * self.x_empty + np.cumsum(np.pad(m * self.x[orders], ((0, 0), (1, 0))), axis=1)
+        Mz      = self.M_empty * self.z_empty + np.cumsum(np.pad(m * self.z[orders], ((0, 0), (1, 0))), axis=1)
+
+        return {"mass": mass, "x_cg": Mx / mass, "z_cg": Mz / mass, "x_moment": Mx, "z_moment": Mz}
+
+
+    def fuel(self, fuel):
+        """Mass and x / z moments of the fuel on board for fuel masses [kg] (any shape) - tanks fill in order"""
+        fuel    = np.clip(np.asarray(fuel, dtype=float), 0, self.fuel_max)
+        before  = np.concatenate([[0], np.cumsum(self.capacity)[:-1]])
+        in_tank = np.clip(fuel[..., None] - before, 0, self.capacity)
+
+        return fuel, in_tank @ self.tank_x, in_tank @ self.tank_z
+
+
+    def envelope(self, segments, orders=None, fuel_steps=17):
+        """
+        Forward and aft CG per segment - segments is {name: (fuel at start, fuel at end)} [kg]
+
+        Every payload state reached while boarding (any order, partly loaded included) is combined
+        with fuel_steps fuel masses across the segment. Returns {name: {"forward", "aft", "z_min",
+        "z_max"}} [m]; the payload states are the same for every segment, so they're found once.
+        """
+        board   = self.boarding(orders)
+
+        # Different orders pass through the same partial loads - only the distinct ones matter
+        states  = np.stack([board[k].ravel().round(9) for k in ("mass", "x_moment", "z_moment")])
+        states  = states[:, np.lexsort(states[::-1])]
+        states  = states[:, np.concatenate([[True], (np.diff(states, axis=1) != 0).any(axis=0)])]
+        mass, Mx, Mz = (row[:, None] for row in states)
+
+        out = {}
+        for name, (start, end) in segments.items():
+            fuel, Fx, Fz    = self.fuel(np.linspace(start, end, fuel_steps))
+            total           = mass + fuel
+            x_cg            = (Mx + Fx) / total
+            z_cg            = (Mz + Fz) / total
+
+            out[name] = {"forward": x_cg.min(), "aft": x_cg.max(), "z_min": z_cg.min(), "z_max": z_cg.max()}
+
+        return out
+
+
+    @staticmethod
+    def segment_fuel(M_segments, M_zero_fuel, names):
+        """{name: (fuel at start, fuel at end)} from the mission's segment boundary masses (e.g. a solution's Mission.M)"""
+        fuel = np.asarray(M_segments, dtype=float) - M_zero_fuel
+
+        return {name: (fuel[i], fuel[i + 1]) for i, name in enumerate(names)}
+
+
+    def plot(self, orders=None, ax=None, max_lines=50):
+        """Boarding lines (mass vs x_cg) for the first max_lines orders, plus fuelling at full payload"""
+        import matplotlib.pyplot as plt
+
+        board   = self.boarding(orders)
+        ax      = ax or plt.subplots()[1]
+
+        for x, m in zip(board["x_cg"][:max_lines], board["mass"][:max_lines]):
+            ax.plot(x, m, "b-", alpha=0.3, linewidth=0.8)
+
+        fuel, Fx, _ = self.fuel(np.linspace(0, self.fuel_max, 50))
+        mass        = board["mass"][0, -1] + fuel
+        ax.plot((board["x_moment"][0, -1] + Fx) / mass, mass, "r-", label="Fuel")
+
+        ax.set_xlabel("x_cg [m]")
+        ax.set_ylabel("Mass [kg]")
+        ax.legend()
+
+        return ax
@@ -1,66 +1,196 @@
+import inspect
+
 from gpkit import Model, Vectorize, VectorVariable, constraints, parse_variables, ureg as u
 from gpkit.constraints.tight import Tight
 import numpy as np
-from ambiance import Atmosphere
 # from functools import reduce
 
 from .Segments import *
+from .ISA import atmosphere
+
+
+# Target Mission Profile - (segment, kwargs) in flight order, see Segment for the kwargs of each type.
+# Array-valued kwargs (one value per leg, e.g. cruise_range=[...]*u.km) expand into that many legs in a row.
+# Cruise also takes sublegs=K - K conservative sub-legs in place of the Taylor series Breguet (see Cruise).
+MISSION_PROFILE = [
+    ("Takeoff",             {}),
+    ("Climb",               {"dCd0": 0.04, "de": 0.05, "climb_gradient": 0.1}),
+    ("Cruise",              {"cruise_range": 2500*u.km, "alt": 40000*u.ft, "mach": 0.75, "alpha": 0.955, "n": 1}),
+    ("Climb (Go Around)",   {"dCd0": 0.04, "de": 0.05, "climb_gradient": 0.1}),
+    ("Cruise",              {"cruise_range": 370*u.km, "alt": 26000*u.ft, "mach": 0.4, "alpha": 0.955, "n": 1}),
+    ("Landing",             {}),
+]
+
+# Missions the aircraft is sized for together (see Missions) - {name: (profile, payload fraction carried)}
+# The first is the sizing mission and takes off at M_0, the others at or under it
+MISSIONS = {
+    "design":       (MISSION_PROFILE, 1),
+    "ferry":        ([("Takeoff",   {}),
+                      ("Climb",     {"dCd0": 0.04, "de": 0.05, "climb_gradient": 0.1}),
+                      ("Cruise",    {"cruise_range": 3500*u.km, "alt": 40000*u.ft, "mach": 0.75, "alpha": 0.955, "n": 1}),
+                      ("Landing",   {})], 0),
+    "short hop":    ([("Takeoff",   {}),
+                      ("Climb",     {"dCd0": 0.04, "de": 0.05, "climb_gradient": 0.1}),
+                      ("Cruise",    {"cruise_range": 500*u.km, "alt": 26000*u.ft, "mach": 0.6, "alpha": 0.955, "n": 1}),
+                      ("Climb (Go Around)", {"dCd0": 0.04, "de": 0.05, "climb_gradient": 0.1}),
+                      ("Cruise",    {"cruise_range": 370*u.km, "alt": 26000*u.ft, "mach": 0.4, "alpha": 0.955, "n": 1}),
+                      ("Landing",   {})], 1),
+}
+
+FUEL_RESERVE    = 1.06          # [-]       Landing mass / dry mass - 6% fuel margin for ullage
+
+# Segment's own defaults - what a leg that leaves a kwarg out gets
+SEGMENT_DEFAULTS = {k: p.default for k, p in inspect.signature(Segment.setup).parameters.items() if p.default is not p.empty}
+
+
+def expand_legs(profile):
+    """Flattens a profile into one (segment, kwargs) per leg - array kwargs are split leg by leg"""
+    legs = []
+
+    for segment, kwargs in profile:
+        count = max([np.size(getattr(v, "magnitude", v)) for v in kwargs.values()] + [1])
+
+        for i in range(count):
+            legs.append((segment, {k: v[i] if np.size(getattr(v, "magnitude", v)) > 1 else v for k, v in kwargs.items()}))
+
+    return legs
+
+
+def stack_kwargs(legs):
+    """
+    Per-leg kwargs of one segment type --> one kwarg per name holding an array (or Quantity array) over the
+    legs - legs that don't set a kwarg the others do get Segment's default, and if it has none (e.g. mach)
+    every leg has to set it
+    """
+    names   = set().union(*(kwargs for _, kwargs in legs))
+    stacked = {}
+
+    for name in names:
+        missing = [i for i, (_, kwargs) in enumerate(legs) if name not in kwargs]
+        if missing and name not in SEGMENT_DEFAULTS:
+            raise ValueError(f"'{name}' is set on some {legs[0][0]} legs but not legs {missing} of them, and has no default - set it on every leg")
+
+        values  = [kwargs.get(name, SEGMENT_DEFAULTS.get(name)) for _, kwargs in legs]
+        units   = next((v.units for v in values if hasattr(v, "units")), None)
+
+        if units is not None:
+            stacked[name] = np.array([v.to(units).magnitude if hasattr(v, "units") else v for v in values], dtype=float) * units
+        else:
+            stacked[name] = np.array(values, dtype=float)
+
+    return stacked
 
 
 class Mission(Model):
     """A sequence of flight segments in accordance with the Target Mission Profile
 
+    Legs of the same segment type are built as one vectorized Segment (gpkit Vectorize), wherever
+    they sit in the profile - a 20-leg cruise is one Cruise model, not twenty. That keeps the model
+    tree small, but build time is still linear in the legs (each brings its own State values and
+    constraint rows) - roughly 0.08 s for 2 cruise legs, 0.17 s for 20 and 0.54 s for 60.
+
     Variables
     ---------
     aggregate           [-]         End / Takeoff Mass ratio
 
     """
     @parse_variables(__doc__, globals())
-    def setup(self, aircraft=None):
+    def setup(self, aircraft=None, profile=MISSION_PROFILE, payload=1, sizing=True):
         self.aircraft   = aircraft
+        self.payload    = payload
+        self.sizing     = sizing
         constraints     = self.constraints   = []
         mission         = self.mission       = []
 
-        # TODO: 1,7 is hardcoded. This should be a parameter!
-        M_segments = VectorVariable(7, "M", "kg", "Mass at end of each segment")
+        legs            = self.legs          = expand_legs(profile)
+        n_legs          = len(legs)
 
+        # Mass at the start of the mission and at the end of every leg
+        M_segments = self.M_segments = VectorVariable(n_legs + 1, "M", "kg", "Mass at end of each segment")
+
+        # The sizing mission takes off at M_0 - any other (see Missions) at or under it
         # All M_segments[i] must be greater than M_segments[i-1]
-        constraints += [M_segments[0] == aircraft.M_0]       
-        constraints += [M_segments[i] <= M_segments[i-1] for i in range(1, 7)]
-        
-        
-        # TODO: link to Streamlit frontend - session_state.mission_profile
-        takeoff = self.takeoff  = Segment("Takeoff", M_segments[:2], aircraft=aircraft)     
-        climb   = self.climb    = Segment("Climb", M_segments[1:3], dCd0=0.04, de=0.05, climb_gradient=0.1, aircraft=aircraft)       
-        cruise  = self.cruise   = Segment("Cruise", M_segments[2:4], cruise_range=2500*u.km, alt=40000*u.ft, vel=self.mach_to_speed((40000*u.ft).to(u.m).magnitude, 0.75),
-                                                    alpha=0.955, n=1, aircraft=aircraft)
-        # descent = self.descent  = Descent(aircraft=aircraft)
-        climb2 = self.climb2    = Segment("Climb (Go Around)", M_segments[3:5], dCd0=0.04, de=0.05, climb_gradient=0.1, aircraft=aircraft)
-        cruise2 = self.cruise2  = Segment("Cruise", M_segments[4:6], cruise_range=370*u.km, alt=26000*u.ft, vel=self.mach_to_speed((26000*u.ft).to(u.m).magnitude, 0.4),
-                                                    alpha=0.955, n=1, aircraft=aircraft)
-        # loiter = self.loiter   = Segment("Loiter", M_segments[5:7], time=45*u.min, aircraft=aircraft)
-        landing = self.landing  = Segment("Landing", M_segments[5:], aircraft=aircraft)
-
-
-        mission += [takeoff, climb, cruise, climb2, cruise2, landing]
-
-        # Aggregate fuel fraction 
-        # ag = reduce(lambda x, y: x * y, [fs.fuel_frac for fs in mission])
-        # constraints += Tight([M_segments[0] >= M_segments[-1] + aircraft.M_fuel/1.01])
+        constraints += [M_segments[0] == aircraft.M_0] if sizing else [M_segments[0] <= aircraft.M_0]
+        constraints += [M_segments[1:] <= M_segments[:-1]]
+
+        # One (vectorized) Segment per segment type - legs[i] runs from M_segments[i] to M_segments[i+1]
+        segments = self.segments = {}
+        for segment in dict.fromkeys(name for name, _ in legs):
+            self.build_segment(segment)
+
+        mission += list(segments.values())
 
         # Final mass must be greater than M_dry - note that a 6% fuel margin is added for ullage
-        constraints += Tight([M_segments[-1] >= aircraft.M_dry * 1.06])
+        if payload == 1:
+            constraints += Tight([M_segments[-1] >= aircraft.M_dry * FUEL_RESERVE]) if sizing else [M_segments[-1] >= aircraft.M_dry * FUEL_RESERVE]
+        else:
+            # Part payload - M_dry with the payload mass scaled, crew always on board (built from the components, as M_dry - x isn't a GP)
+            zero_fuel = sum(c.M for c in aircraft.components if c is not aircraft.payload) + sum(s.M for s in aircraft.systems) + aircraft.payload.M_crew
+            if payload:
+                zero_fuel += payload * aircraft.payload.M
+
+            constraints += [M_segments[-1] >= zero_fuel * FUEL_RESERVE]
 
         return {"Top-level constraints": constraints}, mission
 
 
+    def build_segment(self, segment):
+        """(Re)builds the Segment flying every leg of one type, from self.legs - one vectorized model if there are several"""
+        idx     = self.leg_index(segment)
+        kwargs  = self.leg_kwargs(stack_kwargs([self.legs[i] for i in idx]))
+        M       = self.M_segments
+
+        if len(idx) == 1:
+            self.segments[segment] = Segment(segment, (M[idx[0]], M[idx[0] + 1]), aircraft=self.aircraft, **{k: v[0] for k, v in kwargs.items()})
+        else:
+            with Vectorize(len(idx)):
+                self.segments[segment] = Segment(segment, (M[idx], M[idx + 1]), aircraft=self.aircraft, **kwargs)
+
+        return self.segments[segment]
+
+
+    def leg_index(self, segment):
+        """Indices of the legs of one segment type, in flight order"""
+        return np.array([i for i, (name, _) in enumerate(self.legs) if name == segment])
+
+
+    def leg_kwargs(self, kwargs):
+        """Mach --> true airspeed at each leg's altitude (everything else passes straight through to Segment)"""
+        if "mach" in kwargs:
+            mach        = kwargs.pop("mach")
+            kwargs["vel"] = self.mach_to_speed(kwargs["alt"].to(u.m).magnitude, mach)
+
+        return kwargs
+
+
     # Task for later - put this somewhere more sensible
     def mach_to_speed(self, altitude, mach):
         """
         Converts Mach number to speed as a function of altitude (m)
         """
-        #print(Atmosphere(altitude).speed_of_sound)
-        return Atmosphere(altitude).speed_of_sound * mach * (u.m/u.s) 
+        return atmosphere(altitude).speed_of_sound * mach * (u.m/u.s)
+
+
+
+
+class Missions(Model):
+    """Several missions flown by one aircraft - sized for all of them in one solve
+
+    Every mission is a full Mission (its own M chain, each segment type vectorized over its legs)
+    on the shared Aircraft. The first is the sizing mission; the rest take off at or under M_0
+    and carry their own payload fraction, so M_0 comes out as whatever the hardest one needs.
+    Fuel tank capacity isn't a constraint (burn <= M_fuel isn't a GP) - see PayloadRange for that.
+
+    >>> missions = Missions(AC, MISSIONS)
+    >>> sol(missions.missions["ferry"].M_segments)
+
+    """
+    def setup(self, aircraft, missions=MISSIONS):
+        self.aircraft   = aircraft
+        self.missions   = {name: Mission(aircraft, profile=profile, payload=payload, sizing=i == 0)
+                           for i, (name, (profile, payload)) in enumerate(missions.items())}
+
+        return list(self.missions.values())
 
 
 
@@ -0,0 +1,194 @@
+import math
+
+import numpy as np
+
+from .ISA import atmosphere
+from .Mission import MISSION_PROFILE, FUEL_RESERVE, expand_legs
+from .Segments import Cruise, FUEL_FRAC, LD_CRUISE
+from ..Components.Payload import M_PAX, M_LUGGAGE
+
+
+# Sweep / batch outputs the diagram is built from - {PayloadRange kwarg: variable}
+# No fuel_max - Aircraft.M_fuel is only bounded by M_0 - M_dry, so the tanks are taken as the design mission's fuel
+OUTPUTS = {
+    "M_dry":        "Aircraft.M_dry",
+    "payload_max":  "Aircraft.Payload.M",
+    "MTOW":         "Aircraft.M_0",
+    "LD_max":       "Aircraft.LD_max",
+    "sfc":          "Aircraft.Engine.sfc_cruise",
+}
+
+
+def breguet_x(fraction, sublegs=None, iterations=8):
+    """
+    R*c/(V*LD) for an end / start cruise mass fraction - inverse of Cruise.fuel_fraction, so the
+    diagram burns exactly what the GP would. Sub-legs invert in closed form, the Taylor series by
+    Newton from the exact Breguet guess (it's within 1e-6 of exp for the x of any real cruise).
+    """
+    f = np.asarray(fraction, dtype=float)
+
+    if sublegs:
+        return sublegs * (1 - f ** (1 / sublegs))
+
+    x = -np.log(f)
+    for _ in range(iterations):
+        series  = sum(x**i / math.factorial(i) for i in range(9))
+        x       = x - (series + x**9 / math.factorial(9) - 1 / f) / series
+
+    return x
+
+
+
+class PayloadRange:
+    """
+    Payload-range diagram from a sized aircraft - closed-form Breguet over the mission profile
+
+    M_empty, MTOW, fuel_max (tank capacity) and payload_max [kg] define the weight limits; the
+    design cruise (the profile's first Cruise leg) flies whatever range the fuel allows, at
+    LD_CRUISE * LD_max and sfc [1/hr]. Every other leg burns what it burns in the GP (FUEL_FRAC,
+    or Breguet at its own range) and the mission ends with FUEL_RESERVE * zero fuel mass, like
+    Mission. All inputs broadcast, so a sweep's worth of designs is one diagram call.
+
+    >>> diagram = PayloadRange.from_table(Sweep(outputs=OUTPUTS.values()).run(points))
+    >>> diagram.corners()["ferry"]
+    """
+
+    def __init__(self, M_empty, MTOW, fuel_max, payload_max, LD_max, sfc, profile=MISSION_PROFILE):
+        # One shape for every design parameter, so the curve's points axis stacks onto it
+        M_empty, MTOW, fuel_max, payload_max, LD_max, sfc = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in
+                                                                                  (M_empty, MTOW, fuel_max, payload_max, LD_max, sfc)))
+        self.M_empty        = M_empty
+        self.MTOW           = MTOW
+        self.fuel_max       = fuel_max
+        self.payload_max    = payload_max
+        self.LD             = LD_CRUISE * LD_max
+        self.c              = sfc / 3600
+        self.profile        = profile
+
+        legs                = expand_legs(profile)
+        design              = next(i for i, (segment, _) in enumerate(legs) if segment == "Cruise")
+
+        # End / start mass of everything but the design cruise
+        fractions           = [self.leg_fraction(kwargs) if segment == "Cruise" else FUEL_FRAC[segment]
+                               for i, (segment, kwargs) in enumerate(legs) if i != design]
+        self.fixed          = np.prod(np.broadcast_arrays(self.c, *fractions)[1:], axis=0)
+
+        self.V              = self.speed(legs[design][1])
+        self.sublegs        = legs[design][1].get("sublegs")
+
+
+    @staticmethod
+    def speed(kwargs):
+        """True airspeed [m/s] of a Cruise leg from its profile kwargs"""
+        alt = kwargs["alt"].to("m").magnitude if hasattr(kwargs["alt"], "to") else kwargs["alt"]
+
+        return atmosphere(alt).speed_of_sound * kwargs["mach"]
+
+
+    def leg_fraction(self, kwargs):
+        R = kwargs["cruise_range"].to("m").magnitude if hasattr(kwargs["cruise_range"], "to") else kwargs["cruise_range"]
+
+        return Cruise.fuel_fraction(R * self.c / (self.speed(kwargs) * self.LD), kwargs.get("sublegs"))
+
+
+    @classmethod
+    def from_table(cls, table, profile=MISSION_PROFILE):
+        """From a Sweep table (or batch rows as columns) with the OUTPUTS columns - one diagram per design"""
+        values = {name: np.asarray(table[column], dtype=float) for name, column in OUTPUTS.items()}
+        M_dry  = values.pop("M_dry")
+
+        return cls(M_empty=M_dry - values["payload_max"], fuel_max=values["MTOW"] - M_dry, profile=profile, **values)
+
+
+    def range(self, payload, fuel):
+        """
+        Design cruise range [m] for payload and fuel [kg] (any broadcastable shapes) - 0 where the
+        other legs use up the fuel, NaN over MTOW or the tanks
+        """
+        M_zero_fuel = self.M_empty + payload
+        M_0         = M_zero_fuel + fuel
+        fraction    = FUEL_RESERVE * M_zero_fuel / (M_0 * self.fixed)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            R = breguet_x(np.minimum(fraction, 1), self.sublegs) * self.V * self.LD / self.c
+
+        return np.where((M_0 <= self.MTOW * (1 + 1e-9)) & (fuel <= self.fuel_max * (1 + 1e-9)), R, np.nan)
+
+
+    def corners(self):
+        """{"max payload", "fuel limited", "ferry"}: (payload [kg], range [m]) - the diagram's corner points"""
+        fuel_mtow       = np.minimum(self.fuel_max, self.MTOW - self.M_empty - self.payload_max)
+        payload_full    = np.clip(self.MTOW - self.M_empty - self.fuel_max, 0, self.payload_max)
+        fuel_ferry      = np.minimum(self.fuel_max, self.MTOW - self.M_empty)
+
+        return {
+            "max payload":  (self.payload_max, self.range(self.payload_max, fuel_mtow)),
+            "fuel limited": (payload_full, self.range(payload_full, np.minimum(self.fuel_max, self.MTOW - self.M_empty - payload_full))),
+            "ferry":        (np.zeros_like(payload_full), self.range(0.0, fuel_ferry)),
+        }
+
+
+    def curve(self, points=200):
+        """
+        (payload [kg], range [m]) along the diagram's upper edge, points first then any design axes -
+        from max payload at zero range, along MTOW, then the tank limit out to ferry range
+        """
+        t           = np.linspace(1, 0, points).reshape(-1, *np.ones(np.ndim(self.payload_max), dtype=int))
+        payload     = t * self.payload_max
+        fuel        = np.minimum(self.fuel_max, self.MTOW - self.M_empty - payload)
+
+        corners     = self.corners()
+        payload     = np.concatenate([[self.payload_max], payload, [corners["fuel limited"][0]]])
+        fuel        = np.concatenate([[np.zeros_like(self.fuel_max)], fuel, [np.minimum(self.fuel_max, self.MTOW - self.M_empty - payload[-1])]])
+        R           = self.range(payload, fuel)
+        order       = np.argsort(R, axis=0, kind="stable")
+
+        return np.take_along_axis(payload, order, axis=0), np.take_along_axis(R, order, axis=0)
+
+
+    def gp_check(self, payloads, ranges, workers=None, builder=None):
+        """
+        Sizes the design GP for a few (payload [kg], range [m]) points in parallel and checks the
+        closed form against each - rows from Batch.solve_cases with the OUTPUTS columns, plus
+        "range_closed_form" [m] (the max payload corner of that sized design's own diagram) and
+        "range_error" (closed form / GP range - 1, NaN where the GP failed). One design only.
+
+        Payload (passengers and luggage - crew are part of M_empty) is scaled through m_pax / m_luggage
+        (a substitution, so cases at the same range share one built model per worker); range is the
+        design cruise_range. builder defaults to design_model.
+        """
+        from ..Analysis.Batch import solve_cases
+        from ..Analysis.Sweep import design_model
+
+        scale   = np.ravel(payloads) / self.payload_max.item()
+        cases   = [{"cruise_range": R / 1000, "m_pax": M_PAX * k, "m_luggage": M_LUGGAGE * k} for k, R in zip(scale, np.ravel(ranges))]
+        rows    = sorted(solve_cases(cases, outputs=tuple(OUTPUTS.values()), workers=workers, builder=builder or design_model),
+                         key=lambda row: row["case"])
+
+        # The sized design flies its own payload at MTOW, so the corner should land on the range it was sized for
+        table   = {column: [row[column] for row in rows] for column in OUTPUTS.values()}
+        R_gp    = np.array([row["cruise_range"] * 1000 for row in rows])
+        R       = PayloadRange.from_table(table, self.profile).corners()["max payload"][1]
+
+        for row, R_closed, error in zip(rows, R, R / R_gp - 1):
+            row.update({"range_closed_form": float(R_closed), "range_error": float(error)})
+
+        return rows
+
+
+    def plot(self, ax=None, points=200):
+        """Payload [kg] vs range [km] with the corners marked - one design only"""
+        import matplotlib.pyplot as plt
+
+        ax          = ax or plt.subplots()[1]
+        payload, R  = self.curve(points)
+
+        ax.plot(R / 1000, payload, "b-")
+        for name, (P, R_corner) in self.corners().items():
+            ax.plot(R_corner / 1000, P, "ko")
+            ax.annotate(name, (R_corner / 1000, P), textcoords="offset points", xytext=(4, 4))
+
+        ax.set_xlabel("Range [km]")
+        ax.set_ylabel("Payload [kg]")
+
+        return ax
@@ -1,4 +1,5 @@
 import logging
+import math
 from functools import reduce
 
 from gpkit import Model, Variable, Vectorize, VectorVariable, parse_variables, ureg as u
@@ -6,8 +7,19 @@ from gpkit.constraints.tight import Tight
 import numpy as np
 
 from .State import State
+from ..Components.Aircraft import CL_BLEND
 
 
+# Empirical coefficients - shared by the GP constraints below and the closed-form boundaries (see ConstraintDiagram.py)
+K_TOP           = 37.5          # [ft^3/lb]     Takeoff parameter constant
+TOP_MARGIN      = 1.21          # [-]           Takeoff parameter margin
+K_LANDING       = 0.5136        # [ft/kts^2]    Landing empirical constant
+LAPSE_TROPO     = 0.7           # [-]           Thrust lapse exponent on sigma | Troposphere
+LAPSE_STRATO    = 1.439         # [-]           Thrust lapse factor on sigma | Stratosphere
+TROPOPAUSE      = 11000         # [m]
+LD_CRUISE       = 0.866         # [-]           Cruise / maximum L/D
+FUEL_FRAC       = {"Takeoff": 0.97, "Climb": 0.985, "Climb (Go Around)": 0.985, "Landing": 0.995}     # [-]   End / start mass
+
 
 class Segment(Model):
     """
@@ -36,7 +48,6 @@ class Takeoff(Segment):
     ---------
     TOP                             [kg/m^2]      Takeoff Parameter
     FL              fl              [m]           Field Length
-    CL_max_TO                       [-]           Maximum Lift Coefficient | Takeoff
     g               9.81            [m/s^2]       Gravitational Acceleration
     
     """
@@ -55,20 +66,19 @@ class Takeoff(Segment):
         constraints     = self.constraints  = {}
         
         # Takeoff Parameter - TOP
-        k1 = self.k1 = Variable('k', 37.5, 'ft^3/lb', 'Some Random Constant')
+        k1 = self.k1 = Variable('k', K_TOP, 'ft^3/lb', 'Some Random Constant')
         constraints.update({"Takeoff Parameter" : [
                     TOP == FL / k1                                                        ]})
         
-        # CL max at takeoff
-        constraints.update({"Lift Coeffcient | Takeoff" : [
-                    CL_max_TO == CL_clean + 0.7 * (CL_max - CL_clean)                     ]})
+        # CL max at takeoff - a linked Variable of the aircraft (posynomial differences aren't GP)
+        CL_max_TO   = self.CL_max_TO    = aircraft.CL_max_TO
 
         # Thrust to Weight ratio
         constraints.update({"Thrust to Weight constraint" : [
-                    TW >= WS / ((CL_max_TO * g * TOP) / 1.21)                             ]})
+                    TW >= WS / ((CL_max_TO * g * TOP) / TOP_MARGIN)                       ]})
 
-        # Fuel fraction for takeoff
-        fuel_frac = self.fuel_frac = 0.97
+        # Fuel fraction for takeoff - a Variable, so sweeps can substitute it
+        fuel_frac = self.fuel_frac = Variable("fuel_frac", FUEL_FRAC["Takeoff"], "", "Fuel Fraction | Takeoff")
 
         # Ensure M_end / aircraft.M_start == fuel_frac
         constraints.update({"Fuel Fraction | Takeoff" : [
@@ -93,6 +103,15 @@ class Takeoff(Segment):
 
         self.constraints.update({"Boundaries": constraints})
 
+
+    @staticmethod
+    def boundary(WS, CL_max, CL_clean, fl=1200, g=9.81):
+        """Minimum T/W over wing loadings WS [N/m^2] - closed form of the constraint above, broadcasts over arrays"""
+        TOP         = (fl * u.m / (K_TOP * u.ft**3 / u.lb)).to(u.kg / u.m**2).magnitude
+        CL_max_TO   = CL_clean + CL_BLEND * (CL_max - CL_clean)
+
+        return WS / ((CL_max_TO * g * TOP) / TOP_MARGIN)
+
     # Debug
     logging.info("Takeoff model is configured")
 
@@ -120,13 +139,13 @@ class Climb(Model):
     
         logging.info("Aircraft() parameters are now linked")
 
-        Cd0_climb   = self.Cd0_climb   = Variable("Cd0_climb",      Cd0 + dCd0,     "",     "Variation in Cd0")
-        e_climb     = self.e_climb     = Variable("e_climb",        e + de,         "",     "Variation in Oswald efficiency")
-        
+        Cd0_climb   = self.Cd0_climb   = Variable("Cd0_climb",      lambda c: c[Cd0] + dCd0,                "",     "Variation in Cd0")
+        e_climb     = self.e_climb     = Variable("e_climb",        lambda c: c[e] + de,                    "",     "Variation in Oswald efficiency")
+
         constraints = self.constraints = {}
         
         # Switch between initial climb vs go-around climb
-        CL_climb = {"Go-around CL|CLimb" : [CL == CL_max]} if goAround else {"Initial CL|Climb" : [CL == CL_clean + 0.7 * (CL_max - CL_clean)]}
+        CL_climb = {"Go-around CL|CLimb" : [CL == CL_max]} if goAround else {"Initial CL|Climb" : [CL == aircraft.CL_climb]}
         constraints.update(CL_climb)
 
         # Induced Drag Coefficient
@@ -138,7 +157,7 @@ class Climb(Model):
                     TW >= (Cd0_climb + CDi_climb) / CL + climb_gradient/100                                    ]})
 
         # Fuel Fraction for climb
-        fuel_frac = self.fuel_frac = 0.985
+        fuel_frac = self.fuel_frac = Variable("fuel_frac", FUEL_FRAC["Climb (Go Around)" if goAround else "Climb"], "", "Fuel Fraction | Climb")
 
         # Ensure M_end / aircraft.M_start == fuel_frac
         constraints.update({"Fuel Fraction | Climb" : [
@@ -160,11 +179,24 @@ class Climb(Model):
         self.constraints.update({"Boundaries": constraints})
 
 
+    @staticmethod
+    def boundary(WS, CL_max, CL_clean, AR, e, Cd0, dCd0, de, climb_gradient, goAround=False):
+        """Minimum T/W over wing loadings WS [N/m^2] - independent of WS, broadcast to its shape"""
+        CL  = CL_max if goAround else CL_clean + CL_BLEND * (CL_max - CL_clean)
+        CDi = CL**2 / (np.pi * AR * (e + de))
+
+        return np.broadcast_to((Cd0 + dCd0 + CDi) / CL + climb_gradient / 100, np.shape(WS))
+
+
 
 class Climb_GoAround(Climb):
     def setup(self, state, M_segment, dCd0, de, climb_gradient, aircraft):
         return super().setup(state, M_segment, dCd0, de, climb_gradient, aircraft, goAround=True)
 
+    @staticmethod
+    def boundary(WS, CL_max, CL_clean, AR, e, Cd0, dCd0, de, climb_gradient):
+        return Climb.boundary(WS, CL_max, CL_clean, AR, e, Cd0, dCd0, de, climb_gradient, goAround=True)
+
 
 
 class Cruise(Model):
@@ -177,9 +209,12 @@ class Cruise(Model):
     R           cruise_range        [km]            Cruise Range
     M_end                           [kg]            End Mass | Cruise
 
+    sublegs=None keeps the 9-term Taylor series for the Breguet fuel fraction. sublegs=K splits the
+    leg into K sub-legs instead, each with M_next/M_prev + x/K <= 1 (x = R*c/(V*LD)) - see fuel_fraction.
+
     """
     @parse_variables(__doc__, globals())
-    def setup(self, state, M_segment, cruise_range, alpha, n, aircraft):
+    def setup(self, state, M_segment, cruise_range, alpha, n, aircraft, sublegs=None):
 
         self.aircraft = aircraft
 
@@ -195,16 +230,20 @@ class Cruise(Model):
         rho             = state.rho
         sigma           = state.sigma
         V_inf           = state.U
-        alt             = state.alt
-        climb_rate      = state.climb_rate
+        alt             = state.atmosphere.h
 
         constraints = {}
         
-        # Switch Thrust Lapse calculations depending on altitude
-        beta_Calculated = {"Thrust Lapse Troposphere" : [beta == sigma ** 0.7]} if alt <= 11000*u.m else {"Thrust Lapse Stratosphere" : [beta == 1.439 * sigma ]}
+        # Switch Thrust Lapse calculations depending on altitude - vectorized legs either side of the tropopause
+        # can't share one monomial, but sigma is fixed by the atmosphere so beta is just evaluated leg by leg
+        if np.all(alt <= TROPOPAUSE):       beta_Calculated = {"Thrust Lapse Troposphere" : [beta == sigma ** LAPSE_TROPO]}
+        elif np.all(alt > TROPOPAUSE):      beta_Calculated = {"Thrust Lapse Stratosphere" : [beta == LAPSE_STRATO * sigma ]}
+        else:
+            sigma_leg   = state.atmosphere.sigma
+            beta_Calculated = {"Thrust Lapse" : [beta == np.where(alt <= TROPOPAUSE, sigma_leg ** LAPSE_TROPO, LAPSE_STRATO * sigma_leg)]}
         constraints.update(beta_Calculated)
 
-        term1 = (1.0 / V_inf) * climb_rate
+        # Neglect term 1 of S 2.2.9 - cruise legs are level (State has no climb rate)
 
         # Neglect term 2 of S 2.2.9
 
@@ -213,23 +252,59 @@ class Cruise(Model):
 
         # Applying constraint
         constraints.update({"Thrust to Weight Constraint | Cruise" : [
-                    TW >= (alpha / beta) * (term1 + term3 + term4)                                                 ]})
+                    TW >= (alpha / beta) * (term3 + term4)                                                          ]})
 
 
         # Fuel fraction for cruise - Breguet Range relation (S 1.3-2)
-        constraints.update({"Optimum LD": [LD  == 0.866 * aircraft.LD_max]})
+        constraints.update({"Optimum LD": [LD  == LD_CRUISE * aircraft.LD_max]})
         c   = self.c    = aircraft.engine.sfc_cruise
 
-        # 4th order taylor approximation for e^x - because apparently e^x is not allowed in GP :(        
         ln_breguet      = R * c / (V_inf * LD)
-        fuel_frac       = self.fuel_frac = 1 + reduce(lambda x,y: x+y, [ln_breguet**i/np.math.factorial(i) for i in range(1, 10)])
 
-        # Ensure M_end / aircraft.M_start == fuel_frac -----> EXCEPTION HERE!!! -ve sign in Breguet, so I'm flipping the order...
-        constraints.update({"Fuel Fraction | Cruise" : Tight([
+        # One K per vectorized group, the finest asked for (stacked legs without one come through as NaN)
+        K               = np.asarray(sublegs if sublegs is not None else 0, dtype=float)
+        K               = self.sublegs  = int(K[np.isfinite(K)].max(initial=0))
+
+        if K:
+            # Burn each sub-leg's fuel at its start mass: 1 - x/K <= exp(-x/K), so this always over-estimates fuel
+            # 2 monomials per sub-leg rather than 9 per leg
+            M_sub       = self.M_sub    = VectorVariable(K - 1, "M_sub", "kg", "Mass at end of each sub-leg | Cruise") if K > 1 else []
+            masses      = [M_segment[0], *M_sub, M_segment[1]]
+
+            constraints.update({"Fuel Fraction | Cruise" : Tight([
+                    masses[i + 1] / masses[i] + ln_breguet / K <= 1 for i in range(K)                               ])})
+
+        else:
+            # 9th order taylor approximation for e^x - because apparently e^x is not allowed in GP :(
+            fuel_frac   = self.fuel_frac = 1 + reduce(lambda x,y: x+y, [ln_breguet**i/math.factorial(i) for i in range(1, 10)])
+
+            # Ensure M_end / aircraft.M_start == fuel_frac -----> EXCEPTION HERE!!! -ve sign in Breguet, so I'm flipping the order...
+            constraints.update({"Fuel Fraction | Cruise" : Tight([
                     M_segment[0]/M_segment[1] >= fuel_frac                                                          ])})
 
         return constraints
 
+
+    @staticmethod
+    def fuel_fraction(ln_breguet, sublegs=None):
+        """End / start mass the GP allows for a given R*c/(V*LD) - exact Breguet is exp(-ln_breguet), broadcasts over arrays"""
+        x = np.asarray(ln_breguet, dtype=float)
+
+        if sublegs:
+            return (1 - x / sublegs) ** sublegs
+
+        return 1 / sum(x**i / math.factorial(i) for i in range(10))
+
+
+    @staticmethod
+    def boundary(WS, alt, vel, rho, AR, e, Cd0, alpha, n=1, climb_rate=0, rho0=1.225):
+        """Minimum T/W over wing loadings WS [N/m^2] - SI floats (alt [m], vel [m/s], rho [kg/m^3]), broadcasts over arrays"""
+        sigma   = rho / rho0
+        beta    = np.where(alt <= TROPOPAUSE, sigma ** LAPSE_TROPO, LAPSE_STRATO * sigma)
+        q       = 0.5 * rho * vel**2
+
+        return (alpha / beta) * (climb_rate / vel + q * Cd0 / (alpha * WS) + alpha * n**2 * WS / (q * np.pi * AR * e))
+
     # For reference, the following is from the original codebase
     # def __Breguet_range(self, segment_state, c, LD):
     #     '''Evaluates weight fraction for a given flight regime'''
@@ -250,7 +325,7 @@ class Landing(Model):
     ---------
     V_stall                              [m/s]              Target Stall Speed | Landing
     FL                   1200            [m]                Field Length | Landing
-    k                    0.5136          [ft/kts^2]         Landing Empirical Constant 
+    k                    K_LANDING       [ft/kts^2]         Landing Empirical Constant 
 
     """
     @parse_variables(__doc__, globals())
@@ -271,7 +346,7 @@ class Landing(Model):
                     WS <= (0.5 * state.rho0 * (V_stall**2) * CL_max)      ]})
 
         # Fuel Fraction for landing
-        fuel_frac = self.fuel_frac = 0.995
+        fuel_frac = self.fuel_frac = Variable("fuel_frac", FUEL_FRAC["Landing"], "", "Fuel Fraction | Landing")
 
         # Ensure M_end / aircraft.M_start == fuel_frac
         constraints.update({"Fuel Fraction | Landing" : [
@@ -281,6 +356,15 @@ class Landing(Model):
         return constraints
 
 
+    @staticmethod
+    def boundary(WS, CL_max, fl=1200, rho0=1.225):
+        """Landing is a wing loading limit - required T/W is 0 up to the max WS [N/m^2], infinite beyond it"""
+        V_stall = (fl * u.m / (K_LANDING * u.ft / u.knot**2)) ** 0.5
+        WS_max  = 0.5 * rho0 * V_stall.to(u.m / u.s).magnitude**2 * CL_max
+
+        return np.where(WS <= WS_max, 0.0, np.inf)
+
+
 # TODO: Implement following models
 # Descent
 # Loiter
@@ -291,16 +375,27 @@ class Segment(Model):
     """
     Segment model - combines a flight context (state) with the aircraft model
 
+    Built inside gpkit's Vectorize(N), a Segment is N legs of the same type at once: every keyword
+    argument can then hold one value per leg, and M_segment is a (start, end) pair of length-N mass
+    vectors. The number of submodels then grows with segment types rather than legs (see Mission).
+
     """
     # Very dumb initialisation values for params but unfortunately required - must be in R+ set
-    def setup(self, segment, M_segment, aircraft, alt=10*u.ft, vel=10*(u.m/u.s), time=10*u.s, dCd0=0, de=0.1, climb_gradient=0.1, cruise_range=10*u.m, alpha=0.1, n=1):
+    def setup(self, segment, M_segment, aircraft, alt=10*u.ft, vel=10*(u.m/u.s), time=10*u.s, dCd0=0, de=0.1, climb_gradient=0.1, cruise_range=10*u.m, alpha=0.1, n=1, sublegs=None, dT=0):
         self.aircraft = aircraft
 
         # Initialise the aircraft performance models for this segment       --> If a performance model needs a segment specific state, it should be passed in here
-        state       = self.state        = State(alt, vel, climb_gradient)
+        # (States are shared between the aircraft's segments flown in the same conditions - dT [K] is the ISA temperature offset)
+        state       = self.state        = State.cached(alt, vel, climb_gradient, dT, aircraft.states)
         aircraftp   = self.aircraftp    = aircraft.dynamic(aircraft, state)
 
- 
+        if segment == "Takeoff":                model = self.model = Takeoff(state, M_segment, aircraft)
+        elif segment == "Climb":                model = self.model = Climb(state, M_segment, dCd0, de, climb_gradient, aircraft)
+        elif segment == "Climb (Go Around)":    model = self.model = Climb_GoAround(state, M_segment, dCd0, de, climb_gradient, aircraft)
+        elif segment == "Cruise":               model = self.model = Cruise(state, M_segment, cruise_range, alpha, n, aircraft, sublegs)
+        elif segment == "Landing":              model = self.model = Landing(state, M_segment, aircraft)
+        else:
+            raise ValueError(f"Unknown segment type '{segment}'")
 
         # Add the segment specific constraints + the aircraft dynamical constraints
         return {"Segment" : [model], "Aircraft Performance" : aircraftp}
@@ -308,9 +403,6 @@ class Segment(Model):
 
 
 
-
-
-
 '''
 dumb stuff
 
@@ -0,0 +1,146 @@
+import numpy as np
+
+from .ClimbPerformance import best_climb
+from .Envelope import thrust_lapse
+from .ISA import atmosphere
+from .Mission import MISSION_PROFILE, expand_legs
+from .Segments import FUEL_FRAC
+
+
+STEPS   = 50            # [-]       RK4 steps per climb / cruise leg
+
+
+def rk4(f, y, s0, s1, steps=STEPS):
+    """
+    Fixed-step RK4 of dy/ds = f(s, y) from s0 to s1 - y is a stacked (..., states) array, so every
+    design integrates at once; s0 and s1 broadcast over its leading axes
+    """
+    s0, s1  = np.asarray(s0, dtype=float)[..., None], np.asarray(s1, dtype=float)[..., None]
+    h       = (s1 - s0) / steps
+
+    for i in range(steps):
+        s   = s0 + i * h
+        k1  = f(s, y)
+        k2  = f(s + h / 2, y + h / 2 * k1)
+        k3  = f(s + h / 2, y + h / 2 * k2)
+        k4  = f(s + h, y + h * k3)
+        y   = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    return y
+
+
+
+class MissionSimulator:
+    """
+    Time-stepping check of the GP's mission fuel burn - integrates the profile leg by leg
+
+    The state is (mass [kg], altitude [m], distance [m], time [s]) for every design at once, shape
+    (..., 4). Climbs integrate over altitude at the best climb speed, full thrust, up to the next
+    cruise altitude (a go-around starts from the ground); cruises integrate over distance at the leg's
+    altitude and Mach with the drag polar's own L/D rather than the GP's LD_CRUISE * LD_max. Both
+    burn sfc [1/hr] on the thrust used. Takeoff and landing aren't flown - they're the same FUEL_FRAC
+    the GP uses - and, like the GP, there's no descent.
+
+    WS [N/m^2], TW, sfc, Cd0, AR and e broadcast over the design axes, like M_0.
+
+    >>> sim = MissionSimulator(WS=table["Aircraft.W0_S"], TW=table["Aircraft.T0_W0"], sfc=0.8)
+    >>> sim.compare(table["Mission.M"])["burn_error"]
+    """
+
+    def __init__(self, WS, TW, sfc, Cd0=0.02, AR=7.5, e=0.9, profile=MISSION_PROFILE, steps=STEPS):
+        self.WS     = np.asarray(WS, dtype=float)
+        self.TW     = np.asarray(TW, dtype=float)
+        self.c      = np.asarray(sfc, dtype=float) / 3600
+        self.Cd0    = Cd0
+        self.AR     = AR
+        self.e      = e
+        self.legs   = expand_legs(profile)
+        self.steps  = steps
+
+
+    def climb(self, y, M_0, alt, kwargs):
+        """d(state)/d(altitude) at full thrust and the best climb speed - NaN where it can't climb"""
+        Cd0, e  = self.Cd0 + kwargs.get("dCd0", 0), self.e + kwargs.get("de", 0)
+
+        def f(h, y):
+            alpha       = y[..., 0] / M_0
+            V, rate     = best_climb(h[..., 0], self.WS, self.TW, alpha, Cd0, self.AR, e)
+            rate        = np.where(rate > 0, rate, np.nan)
+            fuel_flow   = self.c * thrust_lapse(h[..., 0], atmosphere(h[..., 0]).sigma) * self.TW * M_0
+
+            return np.stack([-fuel_flow / rate, np.ones_like(rate), np.sqrt(V**2 - rate**2) / rate, 1 / rate], axis=-1)
+
+        return rk4(f, y, y[..., 1], alt, self.steps)
+
+
+    def cruise(self, y, M_0, kwargs):
+        """d(state)/d(distance) in level flight at the leg's altitude and Mach"""
+        alt     = kwargs["alt"].to("m").magnitude if hasattr(kwargs["alt"], "to") else kwargs["alt"]
+        R       = kwargs["cruise_range"].to("m").magnitude if hasattr(kwargs["cruise_range"], "to") else kwargs["cruise_range"]
+
+        air     = atmosphere(alt)
+        V       = air.speed_of_sound * kwargs["mach"]
+        q       = 0.5 * air.density * V**2
+        K       = 1 / (np.pi * self.AR * self.e)
+
+        def f(x, y):
+            W_S     = y[..., 0] / M_0 * self.WS
+            D_W     = q * self.Cd0 / W_S + K * W_S / q
+            dm      = -self.c * y[..., 0] * D_W / V
+
+            return np.stack([dm, np.zeros_like(dm), np.ones_like(dm), np.full_like(dm, 1 / V)], axis=-1)
+
+        y = np.concatenate([y[..., :1], np.broadcast_to(alt, y[..., 1:2].shape), y[..., 2:]], axis=-1)
+
+        return rk4(f, y, y[..., 2], y[..., 2] + R, self.steps)
+
+
+    def run(self, M_0):
+        """
+        Flies the profile from takeoff mass M_0 [kg] - {"M", "alt", "distance", "time"} at the start
+        and the end of every leg, shaped (..., legs + 1)
+        """
+        M_0     = np.broadcast_to(np.asarray(M_0, dtype=float), np.broadcast(M_0, self.WS, self.TW, self.c).shape)
+        y       = np.stack([M_0, *np.zeros((3, *M_0.shape))], axis=-1)
+        states  = [y]
+
+        for i, (segment, kwargs) in enumerate(self.legs):
+            if segment == "Cruise":
+                y = self.cruise(y, M_0, kwargs)
+
+            elif segment in ("Climb", "Climb (Go Around)"):
+                target = next((kw["alt"] for s, kw in self.legs[i + 1:] if s == "Cruise"), 0)
+                target = target.to("m").magnitude if hasattr(target, "to") else target
+
+                # A go-around starts from the approach, and descents aren't flown
+                start   = np.zeros_like(M_0) if segment == "Climb (Go Around)" else y[..., 1]
+                y       = np.concatenate([y[..., :1], start[..., None], y[..., 2:]], axis=-1)
+                y       = self.climb(y, M_0, np.maximum(target, start), kwargs)
+
+            else:
+                y = np.concatenate([y[..., :1] * FUEL_FRAC[segment], np.zeros_like(y[..., 1:2]), y[..., 2:]], axis=-1)
+
+            states.append(y)
+
+        states = np.stack(states, axis=-2)
+
+        return {name: states[..., j] for j, name in enumerate(("M", "alt", "distance", "time"))}
+
+
+    def compare(self, M_segments):
+        """
+        Simulated vs GP segment masses - M_segments [kg] is the Mission's (e.g. Sweep output "Mission.M"),
+        legs last. Returns the simulation plus "burn_error", the relative error of each leg's fuel
+        burn ((sim - GP) / GP, positive where the GP under-burns), and "M_error" on the final mass.
+        """
+        M_segments  = np.asarray(M_segments, dtype=float)
+        sim         = self.run(M_segments[..., 0])
+
+        burn_sim    = -np.diff(sim["M"], axis=-1)
+        burn_gp     = -np.diff(M_segments, axis=-1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sim["burn_error"]   = (burn_sim - burn_gp) / burn_gp
+            sim["M_error"]      = (sim["M"][..., -1] - M_segments[..., -1]) / M_segments[..., -1]
+
+        return sim
@@ -1,6 +1,5 @@
 from gpkit import ureg as u
 import numpy as np
-import sympy as sym
 
 
 
@@ -100,7 +99,7 @@ class Stability:
         H_tailAero  = H_tail.dynamic
 
         # Note: all CL_alpha are evaluated at the flight AoA ----> Do u mean cruise? No? All the flight segments including landing and takeoff
-        self.htailplane_adj_cl = H_tail.eta_h  * H_tail.CL_alpha_h * (1 - H_TailAero.depsilon_dalpha) * (H_tail.s_h / wing.Sref)
+        self.htailplane_adj_cl = H_tail.eta_h  * H_tail.CL_alpha_h * (1 - H_tailAero.depsilon_dalpha) * (H_tail.s_h / wing.Sref)
 
         numerator   = wing.CL_alpha_w * (aircraft.ac_w / wing.c) - self.CM_f + self.htailplane_adj_cl * (aircraft.x_ac_h / wing.c)
         denominator = wingAero.CL_alpha_w + self.htailplane_adj_cl
@@ -143,34 +142,89 @@ class Stability:
         H_tail      = aircraft.H_tail
         H_tailAero  = H_tail.dynamic
         
-        return H_tail.CL_alpha_h * ((a_infty + wingAero.i_w - wingAero.alpha_0)*(1 - H_TailAero.depsilon_dalpha) + (i_h - wing.i_w)-(H_tailAero.alpha_0 - wingAero.alpha_0)) + H_tailAero.CL_delta_e * H_tailAero.delta_e
+        return H_tail.CL_alpha_h * ((a_infty + wingAero.i_w - wingAero.alpha_0)*(1 - H_tailAero.depsilon_dalpha) + (i_h - wing.i_w)-(H_tailAero.alpha_0 - wingAero.alpha_0)) + H_tailAero.CL_delta_e * H_tailAero.delta_e
 
     # Get alpha and setting angle (elevator angle)
     def calc_iH_alphaInfty(self, state):
+        """Trimmed (i_h, alpha_infty) for state - see trim"""
+        result = self.result = self.trim(state)
+
+        self.i_h, self.alpha_infty = result["i_h"], result["alpha_infty"]
+
+        return self.i_h, self.alpha_infty
+
+
+    def trim(self, state, x_cg=None, tol=1e-10, max_iter=20):
+        """
+        Solves L = W and D = T for (i_h, alpha_infty) with Newton's method, batched over NumPy arrays
+
+        state needs M, rho, U and T - each a float or an array, broadcast together, so thousands of
+        flight conditions / masses trim in one go. Everything is plain floats in SI units, angles in
+        radians. calc_CL_w and calc_CL_h are linear in their arguments, so their value and slopes
+        are taken from three evaluations and the Jacobian is exact.
+
+        Returns {"i_h", "alpha_infty", "converged", "iterations"} - plus "z_t" (thrust line height for
+        zero pitching moment, see calc_Zt - needs CM_0w) at each CG position when x_cg is given.
+        Points without a real trim are NaN with converged=False. Of the two roots, Newton finds the
+        one nearest the tail-off start.
+        """
         aircraft    = self.aircraft
         wing        = aircraft.wing 
-        wingAero    = wing.dynamic
         H_tail      = aircraft.H_tail
         H_tailAero  = H_tail.dynamic
 
-        i_h, alpha_infty = sym.symbols('i, a')          
+        # CL_w = CLw_0 + CLw_a * a,  CL_h = CLh_0 + CLh_a * a + CLh_i * i_h
+        CLw_0       = self.calc_CL_w(0.0)
+        CLw_a       = self.calc_CL_w(1.0) - CLw_0
+        CLh_0       = self.calc_CL_h(0.0, 0.0)
+        CLh_a       = self.calc_CL_h(1.0, 0.0) - CLh_0
+        CLh_i       = self.calc_CL_h(0.0, 1.0) - CLh_0
+
+        K_w         = 1 / (np.pi * wing.AR * wing.e)
+        K_h         = 1 / (np.pi * H_tail.AR * H_tail.e_h)
+        r_L         = H_tailAero.eta_h * H_tailAero.S_h / wing.Sref
+        r_D         = H_tail.eta_h * K_h * H_tail.S_h / wing.Sref
+
+        # L = W and D = T as required lift / drag coefficients
+        q_S         = 0.5 * state.rho * state.U**2 * wing.Sref
+        CL_req      = state.M * self.g / q_S
+        CD_req      = state.T / q_S
+        CL_req, CD_req = np.broadcast_arrays(np.asarray(CL_req, dtype=float), np.asarray(CD_req, dtype=float))
+
+        # Start from the tail-off lift solution with the tail at zero incidence
+        a           = (CL_req - CLw_0) / CLw_a
+        i_h         = np.zeros_like(a)
+        converged   = np.zeros(a.shape, dtype=bool)
+
+        for iteration in range(1, max_iter + 1):
+            CL_w    = CLw_0 + CLw_a * a
+            CL_h    = CLh_0 + CLh_a * a + CLh_i * i_h
+
+            F1      = CL_w + r_L * CL_h - CL_req
+            F2      = aircraft.Cd0 + K_w * CL_w**2 + r_D * CL_h**2 - CD_req
 
-        # L = W
-        # mass here is the mass at current flight segment (state.M)
-        eq1 = sym.Eq(self.calc_CL_w(alpha_infty) + H_tailAero.eta_h * H_tailAero.S_h / wing.Sref * self.calc_CL_h(alpha_infty, i_h), 2 * state.M * self.g / (state.rho * state.U**2 * wing.Sref))
+            # 2x2 Jacobian in (a, i_h), solved by Cramer's rule for every point at once
+            J11, J12 = CLw_a + r_L * CLh_a, r_L * CLh_i
+            J21, J22 = 2 * K_w * CL_w * CLw_a + 2 * r_D * CL_h * CLh_a, 2 * r_D * CL_h * CLh_i
+            det     = J11 * J22 - J12 * J21
 
+            with np.errstate(divide="ignore", invalid="ignore"):
+                da  = np.where(converged, 0, (F1 * J22 - F2 * J12) / det)
+                di  = np.where(converged, 0, (J11 * F2 - J21 * F1) / det)
 
-        K_w = 1 / (np.pi * wing.AR * wing.e)
-        K_h = 1 / (np.pi * H_tail.AR * H_tail.e_h)
+            a, i_h      = a - da, i_h - di
+            converged   = converged | ((np.abs(da) < tol) & (np.abs(di) < tol))
 
-        # D = T
-        # Fast syntax check pls 
-        # Also cant extract Thrust from Engine model, will exist in the Mission model somewhere in the engine performance model for a given flight regime
-        eq2 = sym.Eq(aircraft.Cd0 + K_w * self.calc_CL_w(alpha_infty)**2 + H_tail.eta_h * K_h * H_tail.S_h / wing.Sref * self.calc_CL_h(alpha_infty, i_h)**2, 2 * state.T / (state.rho * state.U**2 * wing.Sref))
+            if converged.all():
+                break
 
-        result = self.result = sym.solve([eq1, eq2], (i_h, alpha_infty))
+        # No real root means T is below the least drag the aircraft can trim with at that lift
+        i_h, a      = np.where(converged, i_h, np.nan), np.where(converged, a, np.nan)
+        result      = {"i_h": i_h, "alpha_infty": a, "converged": converged, "iterations": iteration}
 
-        [self.i_h, self.alpha_infty] = result
+        if x_cg is not None:
+            self.i_h, self.alpha_infty = i_h, a
+            result["z_t"] = self.calc_Zt(state, x_cg)
 
         return result
 
@@ -183,13 +237,14 @@ class Stability:
         self.CM_0w = (wing.CM0_af * (wing.AR * np.cos(wing.sweep.to(u.radians))**2)/(wing.AR + 2 * np.cos(wing.sweep.to(u.radians))) - 0.01 * wing.twist.to(u.degrees)) * self.correction_factor
     
 
-    def calc_Zt(self, state):
+    def calc_Zt(self, state, x_cg=None):
         aircraft    = self.aircraft
         wing        = aircraft.wing
         H_tail   = aircraft.H_tail
+        x_cg        = aircraft.x_cg if x_cg is None else x_cg
 
-        lift_term =  - self.calc_CL_w(self.alpha_infty) * (wing.ac_w- aircraft.x_cg) / wing.c
-        tailplane_term = - H_tail.eta_h * self.calc_CL_h(self.alpha_infty) * ((H_tail.S) / wing.Sref) * (aircraft.x_ac_h - aircraft.cg) / wing.c
+        lift_term =  - self.calc_CL_w(self.alpha_infty) * (aircraft.ac_w - x_cg) / wing.c
+        tailplane_term = - H_tail.eta_h * self.calc_CL_h(self.alpha_infty, self.i_h) * ((H_tail.S_h) / wing.Sref) * (aircraft.x_ac_h - x_cg) / wing.c
         q = 0.5 * state.U**2 * state.rho
 
         self.z_t = -wing.Sref * wing.c * q * (lift_term + self.CM_0w + self.CM_f * self.alpha_infty + tailplane_term) / state.T             # Change T after finishing segments class
@@ -3,7 +3,7 @@ from gpkit import Model, Vectorize, VectorVariable, parse_variables,  ureg as u
 from gpkit.constraints.tight import Tight
 from gpkit.nomials.variables import Variable
 import numpy as np
-from ambiance import Atmosphere
+from .ISA import atmosphere as isa
 # from .. import sealevel
 
 '''
@@ -20,9 +20,9 @@ class State:
     h                     alt          [m]             Altitude
     U                     vel          [m/s]           Velocity
     climb_gradient        grad         [-]             Climb gradient
-    rho                                [kg/m^3]        Air density
-    mu                                 [kg/m/s]        Dynamic viscosity
-    sigma                              [-]             Ratio of density to sea level density
+    rho                   isa(alt,dT).density             [kg/m^3]        Air density
+    mu                    isa(alt,dT).dynamic_viscosity   [kg/m/s]        Dynamic viscosity
+    sigma                 isa(alt,dT).sigma               [-]             Ratio of density to sea level density
     rho0                  1.225        [kg/m^3]        Sea level density
     """
 
@@ -31,27 +31,61 @@ class State:
     # # rho0            = sealevel.density      * (u.kg / u.m**3)
     # rho0 = Variable("rho0", sealevel.density, "kg/m^3", "Sea level air density")
 
+    # Most States kept in one cache - see State.cached
+    cache_size  = 256
+
     @parse_variables(__doc__, globals())
-    def __init__(self, alt, vel, grad):
+    def __init__(self, alt, vel, grad, dT=0):
         # h                   = self.h                    = alt
         # U                   = self.U                    = vel
         # climb_gradient      = self.climb_gradient       = climb_gradient
         constraints = []
 
-        # Standard atmosphere model for given altitude
-        atmosphere  = Atmosphere(alt.to(u.m).magnitude)
+        # Standard atmosphere (+ dT [K]) for given altitude - interpolated from the shared table in ISA.py
+        atmosphere  = self.atmosphere   = isa(alt, dT)
 
         # Maybe better to have a vector for atmospheric states?
         # rho         = self.rho        = atmosphere.density              * (u.kg / u.m**3)
         # mu          = self.mu         = atmosphere.dynamic_viscosity    * (u.kg / (u.m * u.s))
         # sigma       = self.sigma      = rho / rho0
 
-        rho     = Variable("rho",       atmosphere.density,                 "kg/m^3",           "Air density")
-        mu      = Variable("mu",        atmosphere.dynamic_viscosity,       "kg/m/s",           "Dynamic viscosity")
-        # sigma   = Variable("sigma",     rho / rho0,                         "",                 "Ratio of density to sea level density")
-        constraints += [sigma == rho / rho0]
+        # rho, mu and sigma are fixed from the same table above, in the Variables - State isn't a Model, so a
+        # constraint here (e.g. sigma == rho / rho0) would never reach the GP
 
         # Debugging
-        print(f'State: alt={alt}, vel={vel}, climb_gradient={grad}')
+        logging.debug("State: alt=%s, vel=%s, climb_gradient=%s, dT=%s", alt, vel, grad, dT)
         
-        return None
\ No newline at end of file
+        return None
+
+
+    @classmethod
+    def cached(cls, alt, vel, grad, dT=0, cache=None):
+        """
+        State(alt, vel, grad, dT), built once per flight condition and vectorization in cache (a dict)
+        and then shared - no cache, no sharing
+
+        Every variable of a State is fixed by its arguments, so segments flown in the same conditions
+        (e.g. takeoff and landing) can share one - but only inside one model tree, as building a model
+        takes the values out of its variables. Hence a cache per Aircraft (Aircraft.states) rather than
+        per process. Oldest entries are dropped past cache_size.
+        """
+        if cache is None:
+            return cls(alt, vel, grad, dT)
+
+        key = (hashable(alt, u.m), hashable(vel, u.m/u.s), hashable(grad), float(dT), Vectorize.vectorization)
+
+        if key not in cache:
+            if len(cache) >= cls.cache_size:
+                cache.pop(next(iter(cache)))
+            cache[key] = cls(alt, vel, grad, dT)
+
+        return cache[key]
+
+
+def hashable(value, units=None):
+    """Quantity / array / float --> (shape, values) in the given units"""
+    if hasattr(value, "to"):
+        value = value.to(units).magnitude
+
+    value = np.asarray(value, dtype=float)
+    return value.shape, value.tobytes()
\ No newline at end of file
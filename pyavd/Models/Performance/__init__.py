@@ -1,4 +1,12 @@
-from .Mission import Mission
+from .Mission import Mission, Missions
 from .State import State
 from .Stability import Stability
-from .Segments import *
\ No newline at end of file
+from .Segments import *
+from .ConstraintDiagram import ConstraintDiagram
+from .ISA import AtmosphereTable, atmosphere
+from .LoadingDiagram import LoadingDiagram
+from .Field import FieldPerformance, balanced_field_length, wat_limits
+from .Envelope import FlightEnvelope
+from .ClimbPerformance import climb, best_climb, ceiling, far25_gradients
+from .PayloadRange import PayloadRange
+from .Simulator import MissionSimulator
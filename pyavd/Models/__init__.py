@@ -2,3 +2,4 @@ from .Components import *
 from .Subsystems import *
 from .Regulations import *
 from .Performance import *
+from .Analysis import *
\ No newline at end of file
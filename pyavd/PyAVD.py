@@ -46,17 +46,23 @@ AVD Group 11, Department of Aeronautics, Imperial College London.
 
 """
 
+import uuid
+
 import gpkit
 import streamlit as st
 from streamlit import session_state as sesh
 
 from Models import *
+from Models.Analysis.Cache import solution_cache
+from Models.Analysis.Worker import solve_worker
+from Models.Performance.ConstraintDiagram import aircraft_defaults
 from gpkit import Model, ureg
 from gpkit.constraints.bounded import Bounded
 
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+
+
+PROGRESS_INTERVAL = 0.25        # [s]       How often a running solve's progress is redrawn
 
 
 # Set up the page config
@@ -83,17 +89,53 @@ st.set_page_config(page_title="PyAVD",
 
 #     print(M.program.results)
 
-AC = Aircraft()
-# print(AC)
-
-MISSION = Mission(AC)
-# print(MISSION)
-
+# AC = Aircraft()
+# MISSION = Mission(AC)
 # M = Model(AC.M_0 * AC.T0_W0, [Bounded(MISSION), Bounded(AC)])
-M = Model(AC.M_0 * AC.T0_W0, [MISSION, AC])
-print(M)
-
-print(M.variables_byname('AR'))
 
-sol = M.solve(verbosity=1)
-print(sol.table())
\ No newline at end of file
+# Streamlit reruns this whole script on every interaction - solutions are cached per process (so shared by
+# every session) by their inputs, and a design that's been solved before comes straight back, unbuilt
+# (PYAVD_SOLUTION_CACHE=dir keeps them on disk too). Anything new is solved by the background worker, so the
+# page keeps going while it runs - changing an input mid-solve reruns this, which supersedes the session's old job
+
+# Aircraft hyperparameters - substituted into the one built model, defaults from Aircraft itself
+defaults    = aircraft_defaults(names=("CL_max", "CL_clean", "AR", "e"))
+
+with st.sidebar:
+    st.header("Aircraft")
+    AR          = st.slider("Aspect ratio", 5.0, 12.0, defaults["AR"], 0.1)
+    e           = st.slider("Oswald efficiency", 0.6, 1.0, defaults["e"], 0.01)
+    CL_max      = st.slider("CL max (takeoff / landing)", 1.5, 3.0, defaults["CL_max"], 0.05)
+    CL_clean    = st.slider("CL max (clean)", 1.0, 2.0, defaults["CL_clean"], 0.05)
+    emp_config  = st.selectbox("Empennage", ("T-Tail", "Low-Tail"))
+
+inputs      = {"Aircraft.AR": AR, "Aircraft.e": e, "Aircraft.CL_max": CL_max, "Aircraft.CL_clean": CL_clean}
+cache       = solution_cache()
+key         = cache.key(inputs, emp_config=emp_config)
+sol         = cache.get(key)
+
+if sol is None:
+    # Sessions share the worker, so each only supersedes its own solves
+    if "solve_owner" not in sesh:
+        sesh.solve_owner = uuid.uuid4().hex
+
+    job     = solve_worker().submit(inputs, owner=sesh.solve_owner, emp_config=emp_config)
+    status  = st.empty()
+
+    # Blocks on the job's finished event - the timeout only sets how often the progress line is redrawn
+    while not job.done():
+        cost = "-" if job.cost is None else f"{job.cost:.4g}"
+        best = "-" if not job.best else f"{job.best.get('Aircraft.M_0', float('nan')):.0f} kg"
+        status.info(f"Solving... GP {job.gp}, iteration {job.iteration}, cost {cost}, best M_0 {best}")
+        job.wait(PROGRESS_INTERVAL)
+
+    status.empty()
+    if job.status != "done":
+        st.error(f"Solve {job.status}: {job.error or ''}")
+        st.stop()
+
+    sol = job.result
+    cache.put(key, sol)
+
+st.metric("Total Mass", f"{sol['variables']['Aircraft.M_0']:.0f} kg")
+st.table({"Variable": list(sol["variables"]), "Value": list(sol["variables"].values())})
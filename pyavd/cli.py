@@ -0,0 +1,51 @@
+"""Console script for pyavd - headless batch solves, no UI libraries imported."""
+import logging
+import os
+import sys
+
+import click
+
+
+@click.group(invoke_without_command=True)
+@click.pass_context
+def main(ctx):
+    """
+    PyAVD aircraft design - headless tools.
+
+    Set PYAVD_PROFILE=profile.json to profile model builds and solves (with -j 1, workers aren't profiled).
+    """
+    if os.environ.get("PYAVD_PROFILE") and ctx.invoked_subcommand:
+        from .Models.Analysis.Profiler import from_env
+        ctx.with_resource(from_env())
+
+    if ctx.invoked_subcommand is None:
+        click.echo("pyavd.cli.main - nothing to do, see pyavd --help (e.g. pyavd solve cases.csv -o results.csv)")
+
+
+@main.command()
+@click.argument("cases", type=click.Path(exists=True, dir_okay=False))
+@click.option("-o", "--output", default="-", show_default=True, help="Results file - .csv or .parquet, - for stdout.")
+@click.option("-j", "--workers", type=int, default=None, help="Worker processes  [default: one per core]")
+@click.option("--outputs", default="Aircraft.M_0,Aircraft.T0_W0", show_default=True, help="Comma separated variables to report.")
+@click.option("--chunksize", type=int, default=4, show_default=True, help="Cases handed to a worker at a time.")
+@click.option("-v", "--verbose", is_flag=True, help="Log progress to stderr.")
+def solve(cases, output, workers, outputs, chunksize, verbose):
+    """
+    Solves the design cases in CASES (CSV or JSON) and streams one result row per case.
+
+    Columns are Aircraft hyperparameters (CL_max, CL_clean, AR, e, emp_config), the design cruise
+    (cruise_range [km], cruise_alt [ft], cruise_mach) or any other model variable by name.
+    """
+    logging.basicConfig(level=logging.INFO if verbose else logging.WARNING, stream=sys.stderr)
+
+    # Model imports are deferred so --help stays instant
+    from .Models.Analysis.Batch import read_cases, run_batch
+
+    cases           = read_cases(cases)
+    solved, failed  = run_batch(cases, output, [o.strip() for o in outputs.split(",") if o.strip()], workers, chunksize)
+
+    logging.info(f"{solved} of {len(cases)} cases solved, {failed} failed")
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
@@ -0,0 +1 @@
+"""Main module."""
@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+
+"""The setup script - installs the pyavd package and its console command."""
+
+from pathlib import Path
+
+from setuptools import find_namespace_packages, setup
+
+requirements = [line.strip() for line in Path(__file__).with_name("requirements.txt").read_text().splitlines() if line.strip()]
+
+setup(
+    name="pyavd",
+    version="0.1.0",
+    description="PyAVD - The Cool Plane Designer",
+    long_description=Path(__file__).with_name("README.md").read_text(),
+    long_description_content_type="text/markdown",
+    license="Apache Software License 2.0",
+    python_requires=">=3.8",
+    packages=find_namespace_packages(include=["pyavd", "pyavd.*"]),
+    install_requires=requirements,
+    extras_require={"parquet": ["pyarrow"]},
+    entry_points={"console_scripts": ["pyavd=pyavd.cli:main"]},
+)
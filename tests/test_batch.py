@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+
+"""Tests for headless batch solves."""
+
+
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from click.testing import CliRunner
+from gpkit import Model, Variable, ureg as u
+
+from pyavd import cli
+from pyavd.Models.Analysis.Batch import read_cases, run_batch, split_case
+
+
+def toy():
+    """min x + y s.t. x*y >= a - cost 2*sqrt(a)."""
+    x, y, a = Variable("x"), Variable("y"), Variable("a", 1)
+    return Model(x + y, [x * y >= a])
+
+
+class TestBatch(unittest.TestCase):
+    """Tests for `read_cases`, `split_case` and `run_batch`."""
+
+    def setUp(self):
+        """A two case CSV file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.cases = Path(self.directory.name) / "cases.csv"
+        self.cases.write_text("AR,cruise_range,emp_config\n8,2500,T-tail\n9,,\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_split_case(self):
+        """Hyperparameters are substituted, mission columns and emp_config change the structure."""
+        first, second = read_cases(self.cases)
+        structure, substitutions = split_case(first)
+
+        assert substitutions == {"Aircraft.AR": 8.0}
+        assert dict(structure)["emp_config"] == "T-tail"
+        cruise = dict(next(kwargs for segment, kwargs in dict(structure)["profile"] if segment == "Cruise"))
+        assert cruise["cruise_range"] == 2500 * u.km
+        assert split_case(second) == ((), {"Aircraft.AR": 9.0})
+
+    def batch(self, cases, **kwargs):
+        output = Path(self.directory.name) / "results.csv"
+        counts = run_batch(cases, output, **kwargs)
+
+        with open(output, newline="") as f:
+            return counts, list(csv.DictReader(f))
+
+    def test_one_row_per_case(self):
+        """Every case gets a row with its solution."""
+        (solved, failed), rows = self.batch([{"a": 4.0}, {"a": 9.0}, {"a": 16.0}], outputs=("x",), workers=1, builder=toy)
+
+        assert (solved, failed) == (3, 0)
+        rows.sort(key=lambda row: int(row["case"]))
+        assert all(row["feasible"] == "True" and not row["error"] for row in rows)
+        assert np.allclose([float(row["cost"]) for row in rows], [4, 6, 8], rtol=1e-4)
+        assert np.allclose([float(row["x"]) for row in rows], [2, 3, 4], rtol=1e-3)
+
+    def test_process_pool(self):
+        """Cases solved on worker processes come back the same."""
+        (solved, _), rows = self.batch([{"a": float(a)} for a in range(1, 9)], workers=2, chunksize=3, outputs=(), builder=toy)
+
+        assert solved == 8
+        assert np.allclose(sorted(float(row["cost"]) for row in rows), 2 * np.sqrt(np.arange(1, 9)), rtol=1e-4)
+
+    def test_failures_are_rows(self):
+        """A case that can't be solved is a row with its error, not an exception."""
+        (solved, failed), rows = self.batch([{"a": 4.0}, {"b": 1.0}], outputs=(), workers=1, builder=toy)
+
+        assert (solved, failed) == (1, 1)
+        assert [bool(row["error"]) for row in sorted(rows, key=lambda row: row["case"])] == [False, True]
+
+    def test_cli_design_model(self):
+        """pyavd solve on the design model - the infeasible case's row carries the solver's error."""
+        self.cases.write_text("AR,cruise_range\n8,\n9,1000000\n")
+        output = Path(self.directory.name) / "results.csv"
+
+        result = CliRunner().invoke(cli.main, ["solve", str(self.cases), "-o", str(output), "-j", "2"])
+        assert result.exit_code == 0, result.output
+
+        with open(output, newline="") as f:
+            solved, failed = sorted(csv.DictReader(f), key=lambda row: int(row["case"]))
+
+        assert solved["feasible"] == "True" and not solved["error"]
+        assert 3000 < float(solved["Aircraft.M_0"]) < 10000
+        assert failed["feasible"] == "False" and "Infeasible" in failed["error"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""Tests for the compiled program cache."""
+
+
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from gpkit import Model, Variable, ureg as u
+from gpkit.exceptions import Infeasible, UnboundedGP
+from gpkit.globals import NamedVariables
+
+from pyavd.Models.Analysis.Cache import CompiledProgram, ProgramCache, structure_key
+from pyavd.Models.Analysis.Incremental import IncrementalModel
+from pyavd.Models.Analysis.Sweep import design_model
+from pyavd.Models.Components.Aircraft import CL_BLEND
+
+
+def blended(variables):
+    return variables["Aircraft.CL_clean"] + CL_BLEND * (variables["Aircraft.CL_max"] - variables["Aircraft.CL_clean"])
+
+
+class TestCompiledProgram(unittest.TestCase):
+    """Tests for `CompiledProgram` and `ProgramCache` on the design model."""
+
+    @classmethod
+    def setUpClass(cls):
+        NamedVariables.reset_modelnumbers()
+        cls.program = CompiledProgram.from_model(design_model())
+
+    def test_solves_design_model(self):
+        """The whole design model solves, with linked variables (module globals and all) evaluated."""
+        sol = self.program.solve()
+        assert np.isfinite(sol["cost"]) and sol["cost"] > 0
+        assert np.isclose(sol["variables"]["Aircraft.CL_max_TO"], blended(sol["variables"]))
+
+        sol = self.program.solve({"Aircraft.CL_max": 2.4})
+        assert np.isclose(sol["variables"]["Aircraft.CL_max_TO"], blended(sol["variables"]))
+
+    def setUp(self):
+        NamedVariables.reset_modelnumbers()
+
+    def test_round_trip(self):
+        """A program loaded from disk solves to the same answer - no code is stored, only numbers."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ProgramCache(directory)
+            cache.load()
+            NamedVariables.reset_modelnumbers()
+            program = cache.load()
+
+        assert cache.hits == 1
+        assert np.isclose(program.solve({"Aircraft.CL_max": 2.4})["cost"], self.program.solve({"Aircraft.CL_max": 2.4})["cost"])
+
+    def test_incremental_program_solves(self):
+        """The spliced program solves before and after an edit."""
+        model = IncrementalModel()
+        assert np.isfinite(model.program.solve()["cost"])
+
+        model.edit_leg(2, cruise_range=model.mission.legs[2][1]["cruise_range"] * 0.8)
+        assert np.isfinite(model.program.solve()["cost"])
+
+    def test_fixed_values_in_their_units(self):
+        """Substitutions of fixed values outside A are converted to the variable's units too."""
+        assert "Aircraft.x_ac_w" not in self.program.index
+        assert np.isclose(self.program.values({"Aircraft.x_ac_w": 665 * u.cm})["Aircraft.x_ac_w"], 6.65)
+
+    def test_fails_like_gpkit(self):
+        """Unbounded and infeasible programs raise the same errors gpkit's solve does."""
+        x, y = Variable("x"), Variable("y")
+
+        unbounded = Model(x, [x * y >= 1])
+        with self.assertRaises(UnboundedGP):
+            unbounded.solve(verbosity=0)
+        with self.assertRaises(UnboundedGP):
+            CompiledProgram.from_model(unbounded).solve()
+
+        infeasible = Model(x, [x >= 2, x <= 1])
+        with self.assertRaises(Infeasible):
+            infeasible.solve(verbosity=0)
+        with self.assertRaises(Infeasible):
+            CompiledProgram.from_model(infeasible).solve()
+
+    def test_key_covers_builder_source(self):
+        """Editing the builder's own file invalidates its programs."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "builder.py"
+            keys = []
+
+            for source in ("def build():\n    return 1\n", "def build():\n    return 2\n"):
+                path.write_text(source)
+                spec = importlib.util.spec_from_file_location("builder", path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                keys.append(structure_key(module.build))
+
+        assert keys[0] != keys[1]
+
+
+if __name__ == "__main__":
+    unittest.main()
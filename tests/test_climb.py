@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+
+"""Tests for the vectorized climb performance and ceilings."""
+
+
+import unittest
+
+import numpy as np
+
+from pyavd.Models.Performance.ClimbPerformance import SERVICE_ROC, best_climb, ceiling, climb, far25_gradients
+from pyavd.Models.Performance.Mission import MISSION_PROFILE
+
+
+class TestClimbPerformance(unittest.TestCase):
+    """Tests for `climb`, `best_climb` and `ceiling`."""
+
+    def setUp(self):
+        """A spread of designs, climbing at 95% of the takeoff weight."""
+        self.TW = np.linspace(0.2, 0.4, 101)
+
+    def test_best_climb_is_the_maximum(self):
+        """The closed-form best climb speed beats a dense speed sweep."""
+        V = np.linspace(60, 350, 2000)[:, None, None]
+        alt = np.array([0, 5000, 10000])[:, None]
+        rate, _ = climb(V, alt, 4500, self.TW, alpha=0.95)
+        _, best = best_climb(alt, 4500, self.TW, alpha=0.95)
+
+        assert np.all(best >= rate.max(axis=0) - 1e-9)
+        assert np.allclose(best, rate.max(axis=0), rtol=1e-4)
+
+    def test_ceilings(self):
+        """Every design climbs at SERVICE_ROC at its service ceiling, which is under the absolute one."""
+        service = ceiling(4500, self.TW, alpha=0.95)
+        absolute = ceiling(4500, self.TW, rate=0, alpha=0.95)
+
+        assert np.all(service < absolute) and np.all(np.diff(service) > 0)
+        assert np.allclose(best_climb(service, 4500, self.TW, alpha=0.95)[1], SERVICE_ROC, atol=1e-2)
+        assert np.isnan(ceiling(4500, 0.01))
+
+    def test_far25_at_segment_weights(self):
+        """Gradient checks come back per design, and more thrust passes more of them."""
+        M = np.array([30000, 29100, 28660, 25000, 24600, 24000, 23800]) * np.ones((2, 1))
+        checks = far25_gradients(M, MISSION_PROFILE, 4500, np.array([0.2, 0.3]))
+
+        assert set(checks) == {"Climb second segment", "Climb (Go Around) approach", "Climb (Go Around) landing"}
+        for check in checks.values():
+            assert check["ok"].shape == (2,) and check["gradient"][1] > check["gradient"][0]
+        assert not checks["Climb second segment"]["ok"][0] and checks["Climb second segment"]["ok"][1]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+
+"""Tests for the NumPy constraint diagram."""
+
+
+import unittest
+
+import numpy as np
+
+from pyavd.Models.Analysis.Cache import CompiledProgram
+from pyavd.Models.Analysis.Sweep import design_model
+from pyavd.Models.Performance.ConstraintDiagram import ConstraintDiagram
+from pyavd.Models.Performance.Segments import Landing, Takeoff
+
+
+def evaluate(nomial, values):
+    """A posynomial's (or hmap's) value in its own units, from {name: value} in each variable's units."""
+    return sum(c * np.prod([values[str(vk)] ** x for vk, x in exp.items()]) for exp, c in getattr(nomial, "hmap", nomial).items())
+
+
+class TestConstraintDiagram(unittest.TestCase):
+    """Tests for `ConstraintDiagram`."""
+
+    def setUp(self):
+        """Dense wing loading grid."""
+        self.WS = np.linspace(100, 8000, 100000)
+        self.diagram = ConstraintDiagram()
+
+    def test_takeoff_is_linear_in_wing_loading(self):
+        """T/W >= WS / (CL_TO g TOP / 1.21) is a straight line through the origin."""
+        TW = Takeoff.boundary(self.WS, 2.1, 1.5)
+        assert np.allclose(TW / self.WS, TW[0] / self.WS[0])
+
+    def test_landing_limits_wing_loading(self):
+        """Beyond the landing W/S limit nothing is feasible."""
+        result = self.diagram.evaluate(self.WS)
+        TW = Landing.boundary(self.WS, 2.1)
+        assert not result["feasible"][np.isinf(TW)].any()
+
+    def test_optimum_on_envelope(self):
+        """The design point is the lowest T/W of the feasible envelope."""
+        result = self.diagram.evaluate(self.WS)
+        optimum = result["optimum"]
+        assert optimum["TW"] == result["envelope"][result["feasible"]].min()
+        assert optimum["active"] in result["boundaries"]
+
+    def test_matches_gp_constraints(self):
+        """At the solved W/S, each boundary's T/W makes its segment's GP constraint active - and the highest is the solved T/W."""
+        model = design_model()
+        values = CompiledProgram.from_model(model).solve()["variables"]
+        WS, TW = values["Aircraft.W0_S"], values["Aircraft.T0_W0"]
+        boundaries = self.diagram.boundaries(np.array([WS]))
+        segments = model[0].segments
+
+        for label, segment, leg in (("Takeoff", "Takeoff", None), ("Cruise", "Cruise", 0), ("Cruise 2", "Cruise", 1)):
+            gp = segments[segment].model
+            point = {**values, "Aircraft.T0_W0": float(boundaries[label][0])}
+
+            constraint = next(c for c in gp.flat() if "Aircraft.T0_W0" in str(c) and (leg is None or f"[{leg}]" in str(c)))
+            (hmap,) = constraint.as_hmapslt1({})
+            assert np.isclose(evaluate(hmap, point), 1), label
+
+        assert np.isclose(max(TW[0] for TW in boundaries.values()), TW, rtol=1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""Tests for the sub-segmented cruise fuel fraction."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import ureg as u
+
+from pyavd.Models.Analysis.Sweep import design_model
+from pyavd.Models.Components.Aircraft import Aircraft
+from pyavd.Models.Performance.Mission import MISSION_PROFILE, Mission, stack_kwargs
+from pyavd.Models.Performance.Segments import Cruise
+
+
+class TestCruiseSublegs(unittest.TestCase):
+    """Tests for `Cruise` with sublegs."""
+
+    def setUp(self):
+        """R*c/(V*LD) up to well past a 2500 km cruise."""
+        self.x = np.linspace(0, 0.6, 61)
+
+    def test_sublegs_are_conservative(self):
+        """Every K burns at least the exact Breguet fuel, and converges on it."""
+        exact = np.exp(-self.x)
+        errors = [np.max(exact - Cruise.fuel_fraction(self.x, K)) for K in (1, 2, 4, 8, 16)]
+
+        for K in (1, 2, 4, 8, 16):
+            assert np.all(Cruise.fuel_fraction(self.x, K) <= exact + 1e-15)
+        assert np.all(np.diff(errors) < 0)
+        assert errors[-1] < errors[0] / 10
+
+    def test_mission_builds_sublegs(self):
+        """sublegs in the profile gives K - 1 intermediate masses per cruise leg."""
+        profile = [(s, {**kw, "sublegs": 4}) if s == "Cruise" else (s, kw) for s, kw in MISSION_PROFILE]
+        mission = Mission(Aircraft(), profile=profile)
+        cruise = mission.segments["Cruise"].model
+
+        assert cruise.sublegs == 4
+        assert cruise.M_sub.shape == (3, 2)
+
+    def test_mixed_sublegs(self):
+        """Only one cruise leg setting sublegs builds, the other leg's coming through as NaN."""
+        profile = [(s, {**kw, "sublegs": 4}) if i == 2 else (s, kw) for i, (s, kw) in enumerate(MISSION_PROFILE)]
+        model = design_model(profile)
+        assert model[0].segments["Cruise"].model.sublegs == 4
+
+    def test_stack_missing_quantities(self):
+        """A kwarg missing from a leg stacks as Segment's default, in the other legs' units - one with no default is an error."""
+        stacked = stack_kwargs([("Cruise", {"cruise_range": 2 * u.km}), ("Cruise", {}), ("Cruise", {"cruise_range": 500 * u.m})])
+        assert np.allclose(stacked["cruise_range"].to(u.km).magnitude, [2, 0.01, 0.5])
+
+        with self.assertRaises(ValueError):
+            stack_kwargs([("Cruise", {"mach": 0.75}), ("Cruise", {"vel": 200 * u.m / u.s})])
+
+
+if __name__ == "__main__":
+    unittest.main()
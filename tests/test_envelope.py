@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""Tests for the Ps / flight envelope generator."""
+
+
+import time
+import unittest
+
+import numpy as np
+
+from pyavd.Models.Performance.Envelope import FlightEnvelope
+
+
+class TestFlightEnvelope(unittest.TestCase):
+    """Tests for `FlightEnvelope`."""
+
+    def setUp(self):
+        """A 500 x 500 grid of a typical jet."""
+        self.envelope = FlightEnvelope(WS=4500, TW=0.3, alpha=0.9)
+
+    def test_max_speed_is_zero_Ps(self):
+        """Ps is zero on both thrust-limited speeds, positive between them."""
+        M_min, M_max = self.envelope.thrust_limits()
+        i = np.flatnonzero(np.isfinite(M_max))[::50]
+
+        for M in (M_min[i], M_max[i], 0.5 * (M_min[i] + M_max[i])):
+            point = FlightEnvelope(4500, 0.3, alpha=0.9, alt=self.envelope.alt[i], mach=M)
+            Ps = np.diag(point.Ps())
+            assert np.allclose(Ps, 0, atol=1e-9) or np.all(Ps > 0)
+
+    def test_ceiling_and_stall(self):
+        """Lighter aircraft stall slower and have more Ps; no level flight above the absolute ceiling."""
+        heavy = FlightEnvelope(WS=4500, TW=0.15).contours()
+        light = self.envelope.contours()
+
+        assert np.all(light["M_stall"] < heavy["M_stall"])
+        assert np.nanmax(light["Ps"]) > np.nanmax(heavy["Ps"])
+        assert np.isnan(heavy["M_max"][-1]) and np.isfinite(heavy["M_max"][0])
+
+    def test_dense_grid_is_fast(self):
+        """A 500 x 500 grid is well under a second."""
+        start = time.perf_counter()
+        FlightEnvelope(WS=4500, TW=0.3).contours()
+
+        assert time.perf_counter() - start < 0.5
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""Tests for the design-space exploration grid."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import Model, Variable
+
+from pyavd.Models.Analysis.Explore import carpet, collect, explore
+
+
+def toy():
+    """min x + y s.t. x*y >= a, x <= b, y <= 4 - infeasible where 4 b < a."""
+    x, y = Variable("x"), Variable("y")
+    a, b = Variable("a", 1), Variable("b", 1)
+    return Model(x + y, [x * y >= a, x <= b, y <= 4])
+
+
+class TestExplore(unittest.TestCase):
+    """Tests for `explore`, `collect` and `carpet`."""
+
+    def setUp(self):
+        """a down the first axis, b along the second - the small b is only feasible for a = 1."""
+        self.axes = {"a": [1, 4, 9], "b": [0.5, 10]}
+        self.rows = list(explore(self.axes, outputs=("x",), builder=toy, workers=2, chunksize=2))
+
+    def test_rows(self):
+        """One row per grid point, indexed C-order like the grid."""
+        rows = sorted(self.rows, key=lambda row: row["index"])
+
+        assert [row["index"] for row in rows] == list(range(6))
+        assert [(row["a"], row["b"]) for row in rows] == [(a, b) for a in self.axes["a"] for b in self.axes["b"]]
+        assert [row["feasible"] for row in rows] == [True, True, False, True, False, True]
+
+    def test_collect(self):
+        """Rows land back on the grid, NaN where infeasible."""
+        cost = collect(self.rows, self.axes, output="cost")
+        x = collect(self.rows, self.axes, output="x")
+
+        assert np.allclose(cost, [[2.5, 2], [np.nan, 4], [np.nan, 6]], rtol=1e-4, equal_nan=True)
+        assert np.allclose(x, [[0.5, 1], [np.nan, 2], [np.nan, 3]], rtol=1e-4, equal_nan=True)
+
+    def test_carpet(self):
+        """Constant-a and constant-b lines share the cheater axis, with the infeasible gaps kept."""
+        cost = collect(self.rows, self.axes, output="cost")
+        lines = carpet(cost, self.axes["a"], self.axes["b"], cheater=0.5)
+
+        assert [value for value, _, _ in lines["a"]] == self.axes["a"]
+        assert [value for value, _, _ in lines["b"]] == self.axes["b"]
+
+        value, x, z = lines["b"][0]
+        assert np.allclose(x, [0, 1, 2]) and np.isnan(z[1:]).all()
+
+        value, x, z = lines["a"][2]
+        assert np.allclose(x, [2, 2.5]) and np.allclose(z, cost[2], equal_nan=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
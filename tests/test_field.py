@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+"""Tests for the vectorized field performance."""
+
+
+import unittest
+
+import numpy as np
+
+from pyavd.Models.Performance.Field import H_OBS_TAKEOFF, FieldPerformance, balanced_field_length, wat_limits
+
+
+class TestFieldPerformance(unittest.TestCase):
+    """Tests for `FieldPerformance`."""
+
+    def setUp(self):
+        """W/S x T/W x elevation x ISA offset grid."""
+        self.WS = np.linspace(2000, 7000, 30)[:, None, None, None]
+        self.TW = np.linspace(0.15, 0.6, 30)[None, :, None, None]
+        self.elevation = np.array([0, 1500])[None, None, :, None]
+        self.dT = np.array([0, 25])[None, None, None, :]
+        self.grid = FieldPerformance(self.WS, self.TW, 2.1, self.elevation, self.dT).evaluate()
+
+    def test_grid_matches_pointwise(self):
+        """One pass over the grid gives what each point gives on its own - both transition branches included."""
+        S_tr, S_cl = self.grid["S_tr"], self.grid["S_cl"]
+        assert (S_cl == 0).any() and (S_cl > 0).any()
+
+        for i, j, k, l in [(0, 0, 0, 0), (29, 29, 1, 1), (10, 20, 1, 0), (25, 3, 0, 1)]:
+            point = FieldPerformance(self.WS.ravel()[i], self.TW.ravel()[j], 2.1, self.elevation.ravel()[k],
+                                     self.dT.ravel()[l]).evaluate()
+            for name, value in point.items():
+                assert np.allclose(value, self.grid[name][i, j, k, l], equal_nan=True), name
+
+    def test_hot_and_high_is_longer(self):
+        """Less dense air means longer takeoff and landing."""
+        S_TO, S_LD = self.grid["S_TO"], self.grid["S_LD"]
+
+        assert np.all(S_TO[:, :, 1, :] > S_TO[:, :, 0, :])
+        assert np.all(S_TO[:, :, :, 1] > S_TO[:, :, :, 0])
+        assert np.all(S_LD[:, :, 1, :] > S_LD[:, :, 0, :])
+
+    def test_transition_clears_obstacle(self):
+        """With no climb segment the transition arc alone reaches the obstacle height."""
+        field = FieldPerformance(self.WS, self.TW, 2.1)
+        S_tr, S_cl = field.get_Str_Scl()
+        R = field.V_tr**2 / (0.2 * 9.81)
+        cleared = S_cl == 0
+
+        assert np.allclose((R - np.sqrt(R**2 - S_tr**2))[cleared], H_OBS_TAKEOFF)
+
+
+class TestBalancedFieldLength(unittest.TestCase):
+    """Tests for `balanced_field_length` and `wat_limits`."""
+
+    def test_engine_out_climb_limit(self):
+        """Too little thrust for the engine-out climb is NaN, more engines lose less to the failure."""
+        BFL = balanced_field_length(5000, np.array([0.1, 0.3]), n_engines=np.array([2, 4])[:, None])
+
+        assert np.isnan(BFL[:, 0]).all()
+        assert BFL[1, 1] < BFL[0, 1]
+
+    def test_wat_limit_meets_runway(self):
+        """The limit weight just fits the runway, and drops with elevation and temperature."""
+        W = np.linspace(3e4, 8e4, 51)
+        elevation, dT = np.array([0, 1000, 2000])[:, None], np.array([0, 20])
+        limit, _ = wat_limits(W, 20, 2e4, 1500, elevation, dT)
+
+        assert np.all(np.diff(limit, axis=0) < 0) and np.all(limit[:, 1] < limit[:, 0])
+        assert np.allclose(balanced_field_length(limit / 20, 2e4 / limit, elevation=elevation, dT=dT), 1500, rtol=1e-3)
+        assert np.isnan(wat_limits(W, 20, 2e4, 100)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
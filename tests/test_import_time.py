@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+
+"""Import-time benchmark for the core models."""
+
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+# Seconds for a cold `import pyavd.Models` (gpkit + pint alone take ~0.6 s) - override on slow machines
+IMPORT_BUDGET = float(os.environ.get("PYAVD_IMPORT_BUDGET", 2.0))
+
+# Only loaded by the features that need them
+HEAVY = ("sympy", "scipy.sparse", "scipy.optimize", "ambiance", "matplotlib", "streamlit", "pandas")
+
+PROBE = f"""
+import json, sys, time
+tic = time.perf_counter()
+import pyavd.Models
+print(json.dumps({{"seconds": time.perf_counter() - tic, "loaded": [m for m in {HEAVY!r} if m in sys.modules]}}))
+"""
+
+
+def cold_import():
+    """Imports the models in a fresh interpreter - returns {"seconds", "loaded"}"""
+    root = Path(__file__).resolve().parent.parent
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=root, capture_output=True, text=True, check=True)
+
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+    """Tests for cold import of `pyavd.Models`."""
+
+    def test_heavy_dependencies_are_lazy(self):
+        """No optional heavy dependency is loaded on import."""
+        assert cold_import()["loaded"] == []
+
+    def test_import_budget(self):
+        """Best of three cold imports fits the budget."""
+        seconds = min(cold_import()["seconds"] for _ in range(3))
+        assert seconds < IMPORT_BUDGET, f"import pyavd.Models took {seconds:.2f} s (budget {IMPORT_BUDGET} s)"
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""Tests for the incrementally rebuilt design model."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import ureg as u
+from gpkit.globals import NamedVariables
+
+from pyavd.Models.Analysis.Cache import CompiledProgram
+from pyavd.Models.Analysis.Incremental import IncrementalModel
+from pyavd.Models.Analysis.Sweep import design_model
+from pyavd.Models.Performance.Mission import MISSION_PROFILE
+
+
+def fresh(profile=MISSION_PROFILE, **hyperparameters):
+    """The same model built and compiled from scratch - model numbers reset so the names line up."""
+    NamedVariables.reset_modelnumbers()
+    return CompiledProgram.from_model(design_model(profile, **hyperparameters))
+
+
+class TestIncrementalModel(unittest.TestCase):
+    """Tests for `IncrementalModel`."""
+
+    def setUp(self):
+        NamedVariables.reset_modelnumbers()
+        self.model = IncrementalModel()
+
+    def assertSameProgram(self, a, b):
+        assert set(a.names) == set(b.names)
+        assert np.allclose(sorted(a.c), sorted(b.c))
+        assert a.k.sum() == b.k.sum() and len(a.meq) == len(b.meq)
+        assert all(np.isclose(a.defaults[n], b.defaults[n]) for n in a.names if n in a.defaults)
+
+    def test_blocks_make_the_whole_program(self):
+        """Spliced blocks compile to the same program as the whole model."""
+        self.assertSameProgram(self.model.program, fresh())
+
+    def test_edit_leg(self):
+        """A cruise leg edit only rebuilds the Cruise segment, and matches a full rebuild."""
+        self.model.edit_leg(2, cruise_range=3000 * u.km)
+        assert {key[:2] for key in self.model.rebuilt} == {("segment", "Cruise"), ("dynamic", "Cruise")}
+
+        profile = [(s, {**kw, "cruise_range": 3000 * u.km}) if i == 2 else (s, kw) for i, (s, kw) in enumerate(MISSION_PROFILE)]
+        self.assertSameProgram(self.model.program, fresh(profile))
+
+    def test_edit_component(self):
+        """A tail change rebuilds the tail and its dynamic models only, and matches a full rebuild."""
+        self.model.edit_component("H_tail", "Low-Tail")
+        assert {key[-1] for key in self.model.rebuilt} == {"H_Tail"}
+        assert len(self.model.rebuilt) == 1 + len(self.model.mission.segments)
+
+        self.assertSameProgram(self.model.program, fresh(emp_config="Low-Tail"))
+
+
+if __name__ == "__main__":
+    unittest.main()
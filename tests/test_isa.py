@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+"""Tests for the tabulated ISA atmosphere."""
+
+
+import unittest
+
+import numpy as np
+from ambiance import Atmosphere
+from gpkit import ureg as u
+
+from pyavd.Models.Analysis.Sweep import design_model
+from pyavd.Models.Performance.ISA import atmosphere
+from pyavd.Models.Performance.State import State
+
+
+class TestAtmosphereTable(unittest.TestCase):
+    """Tests for `atmosphere` and `State.cached`."""
+
+    def setUp(self):
+        """Altitudes over the whole table, plus one above it."""
+        self.h = np.append(np.linspace(0, 20000, 997), 25000)
+
+    def test_matches_ambiance(self):
+        """Interpolated properties agree with ambiance to 1e-4."""
+        air, standard = atmosphere(self.h), Atmosphere(self.h)
+
+        for name in ("density", "speed_of_sound", "dynamic_viscosity"):
+            assert np.allclose(getattr(air, name), getattr(standard, name), rtol=1e-4)
+
+    def test_hot_day(self):
+        """ISA+dT keeps the pressure and lowers the density."""
+        hot, standard = atmosphere(self.h, dT=20), atmosphere(self.h)
+
+        assert np.allclose(hot.pressure, standard.pressure)
+        assert np.all(hot.density < standard.density)
+        assert np.allclose(hot.temperature - standard.temperature, 20)
+
+    def test_states_are_shared(self):
+        """Same flight condition, same State - in any units."""
+        cache = {}
+        state = State.cached(1000 * u.m, 100 * u.m / u.s, 0.1, cache=cache)
+
+        assert State.cached(1 * u.km, 100 * u.m / u.s, 0.1, cache=cache) is state
+        assert State.cached(1000 * u.m, 100 * u.m / u.s, 0.1, dT=10, cache=cache) is not state
+        assert State.cached(1000 * u.m, 100 * u.m / u.s, 0.1) is not state
+
+    def test_not_shared_between_models(self):
+        """A second design model gets States of its own, with their fixed values."""
+        first, second = design_model(), design_model()
+        fixed = lambda model: {vk.name for vk in model.substitutions if vk.name in ("rho0", "h", "U", "rho", "mu", "sigma")}
+
+        assert fixed(second) == fixed(first) == {"rho0", "h", "U", "rho", "mu", "sigma"}
+
+    def test_solved_density(self):
+        """The solved design flies each leg at the table's density - rho, mu and sigma are fixed, not chosen by the GP."""
+        model = design_model()
+        sol = model.solve(verbosity=0)
+
+        for segment in model[0].segments.values():
+            state = segment.state
+            assert np.allclose(sol(state.rho).to("kg/m^3").magnitude, state.atmosphere.density)
+            assert np.allclose(sol(state.mu).to("kg/m/s").magnitude, state.atmosphere.dynamic_viscosity)
+            assert np.allclose(sol(state.sigma), state.atmosphere.sigma)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+
+"""Tests for the loading diagram / CG envelope."""
+
+
+import itertools
+import unittest
+
+import numpy as np
+
+from pyavd.Models.Performance.LoadingDiagram import LoadingDiagram, payload_items
+
+
+class TestLoadingDiagram(unittest.TestCase):
+    """Tests for `LoadingDiagram`."""
+
+    def setUp(self):
+        """Two passengers, one crew - few enough items for every boarding order."""
+        self.diagram = LoadingDiagram(3500, 6.4, 0.5, fuel_max=2000, items=payload_items(pax=2, crew=1))
+
+    def test_every_order_is_boarded(self):
+        """All 5! orders, each ending at the same fully loaded mass."""
+        board = self.diagram.boarding()
+
+        assert board["mass"].shape == (120, 6)
+        assert np.allclose(board["mass"][:, -1], 3500 + 3 * 100 + 2 * 27)
+
+    def test_envelope_matches_brute_force(self):
+        """Forward / aft limits agree with a plain loop over orders and fuel states."""
+        d = self.diagram
+        fuel = np.linspace(1900, 800, 17)
+        x_cg = []
+
+        for order in itertools.permutations(range(len(d.mass))):
+            for n in range(len(order) + 1):
+                picked = list(order[:n])
+                for f in fuel:
+                    mass, Fx, _ = d.fuel(f)
+                    total = d.M_empty + d.mass[picked].sum() + mass
+                    x_cg.append((d.M_empty * d.x_empty + (d.mass[picked] * d.x[picked]).sum() + Fx) / total)
+
+        limits = d.envelope({"Cruise": (1900, 800)})["Cruise"]
+        assert np.isclose(limits["forward"], min(x_cg))
+        assert np.isclose(limits["aft"], max(x_cg))
+
+
+if __name__ == "__main__":
+    unittest.main()
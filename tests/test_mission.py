@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+"""Tests for the vectorized mission legs."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import ureg as u
+
+from pyavd.Models.Components.Aircraft import Aircraft
+from pyavd.Models.Performance.Mission import Mission, expand_legs
+
+
+CRUISE = {"alt": 30000 * u.ft, "mach": 0.7, "alpha": 0.955, "n": 1}
+CLIMB = {"dCd0": 0.04, "de": 0.05, "climb_gradient": 0.1}
+
+
+class TestMission(unittest.TestCase):
+    """Tests for `Mission` and `expand_legs`."""
+
+    def setUp(self):
+        """Cruise legs either side of a climb - a segment type that isn't contiguous in the profile."""
+        self.profile = [
+            ("Takeoff", {}),
+            ("Cruise",  {**CRUISE, "cruise_range": [500, 800, 300] * u.km}),
+            ("Climb",   CLIMB),
+            ("Cruise",  {**CRUISE, "cruise_range": 200 * u.km}),
+            ("Landing", {}),
+        ]
+        self.mission = Mission(Aircraft(), profile=self.profile)
+
+    def test_expand_legs(self):
+        """Array kwargs split into one leg each, scalars repeat on every leg."""
+        legs = expand_legs(self.profile)
+
+        assert [name for name, _ in legs] == ["Takeoff", "Cruise", "Cruise", "Cruise", "Climb", "Cruise", "Landing"]
+        assert [kw["cruise_range"].to(u.km).magnitude for name, kw in legs if name == "Cruise"] == [500, 800, 300, 200]
+        assert all(kw["mach"] == 0.7 for name, kw in legs if name == "Cruise")
+
+    def test_one_segment_per_type(self):
+        """Every Cruise leg, wherever it sits, is one Segment vectorized over them in flight order."""
+        assert list(self.mission.segments) == ["Takeoff", "Cruise", "Climb", "Landing"]
+        assert list(self.mission.leg_index("Cruise")) == [1, 2, 3, 5]
+
+        cruise = self.mission.segments["Cruise"].model
+        ranges = self.mission.substitutions[cruise.R[0].key.veckey]
+        assert np.allclose(getattr(ranges, "magnitude", ranges), [500, 800, 300, 200])
+
+    def test_mass_chain(self):
+        """Leg i runs from M[i] to M[i + 1] - every boundary mass is shared by consecutive legs."""
+        M = self.mission.M_segments
+        assert M.shape == (len(expand_legs(self.profile)) + 1,)
+
+        for segment, model in self.mission.segments.items():
+            masses = {vk for vk in model.model.varkeys if vk.veckey == M[0].key.veckey}
+            legs = self.mission.leg_index(segment)
+            assert masses == {M[i].key for i in legs} | {M[i + 1].key for i in legs}, segment
+
+
+if __name__ == "__main__":
+    unittest.main()
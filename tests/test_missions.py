@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+
+"""Tests for sizing one aircraft over several missions."""
+
+
+import unittest
+
+from pyavd.Models.Analysis.Sweep import design_model
+from pyavd.Models.Performance.Mission import MISSIONS, expand_legs
+
+
+class TestMissions(unittest.TestCase):
+    """Tests for `Missions`."""
+
+    def setUp(self):
+        self.model = design_model(missions=MISSIONS)
+        self.missions = self.model[0].missions
+
+    def test_one_chain_per_mission(self):
+        """Every mission has its own mass chain over its own legs, on the one aircraft."""
+        for name, (profile, _) in MISSIONS.items():
+            assert self.missions[name].M_segments.shape == (len(expand_legs(profile)) + 1,)
+
+        assert len([vk for vk in self.model.varkeys if vk.name == "M_0"]) == 1
+
+    def test_is_one_gp(self):
+        """Off-design takeoff and part-payload reserves keep it a single GP."""
+        assert self.missions["design"].sizing and not self.missions["ferry"].sizing
+        assert self.model.gp(checkbounds=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
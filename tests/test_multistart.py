@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""Tests for the multi-start signomial driver."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import Model, Variable, VectorVariable, SignomialsEnabled
+
+from pyavd.Models.Analysis.MultiStart import _init_worker, _localsolve, multistart, starts
+
+
+def toy():
+    """min x s.t. x + y >= 1, y <= 0.5 - a signomial constraint, optimum x = 0.5."""
+    x, y = Variable("x"), Variable("y")
+    with SignomialsEnabled():
+        return Model(x, [x + y >= 1, y <= 0.5, x >= 0.1])
+
+
+def vector_toy():
+    """toy with x a 2-vector - min x_0 + x_1, optimum x = [0.5, 0.5]."""
+    x, y = VectorVariable(2, "x"), Variable("y")
+    with SignomialsEnabled():
+        return Model(x.sum(), [x + y >= 1, y <= 0.5, x >= 0.1])
+
+
+class TestMultiStart(unittest.TestCase):
+    """Tests for `multistart`."""
+
+    bounds = {"x": (0.1, 10), "y": (0.01, 0.5)}
+
+    def test_starts_fill_the_box(self):
+        """Initial guesses stay inside the bounds and spread over them."""
+        x0 = starts(self.bounds, n=16)
+        assert (x0["x"] >= 0.1).all() and (x0["x"] <= 10).all()
+        assert np.ptp(np.log(x0["x"])) > 0.8 * np.log(100)
+
+    def test_stops_on_duplicates(self):
+        """Once enough starts agree on the best cost the rest aren't solved."""
+        result = multistart(toy, n=8, bounds=self.bounds, duplicates=2, workers=1)
+
+        assert np.isclose(result["best"]["cost"], 0.5, rtol=1e-3)
+        assert len(result["starts"]) == 2
+        assert all(r["iterations"] > 0 and not r["error"] for r in result["starts"])
+
+    def test_process_pool(self):
+        """The pool path gives the same optimum, failures are recorded rather than raised."""
+        result = multistart(toy, n=4, bounds={**self.bounds, "z": (1, 2)}, duplicates=4, workers=2)
+
+        assert result["best"] is None
+        assert all("z" in r["error"] for r in result["starts"])
+
+        result = multistart(toy, n=4, bounds=self.bounds, duplicates=4, workers=2)
+        assert np.isclose(result["best"]["cost"], 0.5, rtol=1e-3) and len(result["starts"]) == 4
+
+    def test_vector_variables(self):
+        """Vector variables come back as lists."""
+        result = multistart(vector_toy, n=2, bounds={"y": (0.01, 0.5)}, duplicates=2, workers=1)
+
+        assert np.isclose(result["best"]["cost"], 1, rtol=1e-3)
+        assert np.allclose(result["best"]["variables"]["x[:]"], [0.5, 0.5], rtol=1e-3)
+
+    def test_failed_start_iterations(self):
+        """A start that fails before solving reports no iterations, not the last start's."""
+        _init_worker(toy, {})
+
+        assert _localsolve(0, {"x": 1.0, "y": 0.1})["iterations"] > 0
+        failed = _localsolve(1, {"z": 1.0})
+        assert failed["error"] and failed["iterations"] == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
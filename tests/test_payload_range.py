@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""Tests for the payload-range diagram."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import Model, Variable, ureg as u
+
+from pyavd.Models.Analysis.Sweep import Sweep, design_model
+from pyavd.Models.Performance.Mission import FUEL_RESERVE, MISSION_PROFILE
+from pyavd.Models.Performance.PayloadRange import OUTPUTS, PayloadRange, breguet_x
+from pyavd.Models.Performance.Segments import Cruise
+
+
+def sized(profile=MISSION_PROFILE, burn=1.0):
+    """
+    Toy sizing GP with the OUTPUTS names - an 11000 kg airframe and 200 kg of crew plus the payload
+    (508 kg at the default m_pax / m_luggage), burning burn x the closed form's fuel over the profile.
+    """
+    LD_max, sfc = 17, 0.6
+    diagram     = PayloadRange(M_empty=1, MTOW=1, fuel_max=1, payload_max=1, LD_max=LD_max, sfc=sfc, profile=profile)
+    cruise      = next(kw for segment, kw in profile if segment == "Cruise")
+    x           = cruise["cruise_range"].to("m").magnitude * diagram.c / (diagram.V * diagram.LD)
+    fraction    = float(diagram.fixed * Cruise.fuel_fraction(x, diagram.sublegs)) ** burn
+
+    m_pax, m_luggage            = Variable("m_pax", 100, "kg"), Variable("m_luggage", 27, "kg")
+    M_0, M_fuel, M_dry, payload = (Variable(name, "kg") for name in ("Aircraft.M_0", "Aircraft.M_fuel", "Aircraft.M_dry", "Aircraft.Payload.M"))
+
+    return Model(M_0, [payload >= 4 * m_pax + 4 * m_luggage, M_dry >= payload + 11200 * u.kg,
+                       M_0 >= M_fuel + M_dry, M_fuel >= (FUEL_RESERVE / fraction - 1) * M_dry,
+                       Variable("Aircraft.LD_max", LD_max) >= 1, Variable("Aircraft.Engine.sfc_cruise", sfc, "1/hr") >= 0.1 / u.hr])
+
+
+def thirsty(profile=MISSION_PROFILE):
+    """sized, burning 10% more fuel than the closed form expects."""
+    return sized(profile, burn=1.1)
+
+
+class TestPayloadRange(unittest.TestCase):
+    """Tests for `PayloadRange`."""
+
+    def setUp(self):
+        """A business jet sized light on fuel, and a second one heavier with a thirstier engine."""
+        self.diagram = PayloadRange(M_empty=[12000, 13000], MTOW=22000, fuel_max=8500, payload_max=2000,
+                                    LD_max=17, sfc=[0.6, 0.7])
+
+    def test_breguet_x_inverts_the_gp(self):
+        """breguet_x undoes Cruise.fuel_fraction, Taylor series and sub-legs alike."""
+        x = np.linspace(0.01, 0.6, 13)
+
+        for sublegs in (None, 1, 4):
+            assert np.allclose(breguet_x(Cruise.fuel_fraction(x, sublegs), sublegs), x, atol=1e-12)
+
+    def test_corners(self):
+        """Corners sit on the weight limits, range grows from max payload out to ferry."""
+        corners = self.diagram.corners()
+        (P_max, R_max), (P_fuel, R_fuel), (P_ferry, R_ferry) = corners.values()
+
+        assert np.allclose(P_fuel, [1500, 500]) and np.all(P_ferry == 0)
+        assert np.all(R_max < R_fuel) and np.all(R_fuel < R_ferry)
+        assert np.all(R_ferry[1] < R_ferry[0])
+
+    def test_curve_is_the_upper_edge(self):
+        """The curve starts at max payload and zero range, ends at ferry, and payload never rises with range."""
+        payload, R = self.diagram.curve(50)
+
+        assert payload.shape == R.shape == (52, 2)
+        assert np.all(R[0] == 0) and np.allclose(R[-1], self.diagram.corners()["ferry"][1])
+        assert np.all(np.diff(payload, axis=0) <= 0) and np.all(np.diff(R, axis=0) >= 0)
+
+    def test_gp_check(self):
+        """The GP's sized designs fly the range they were sized for by the closed form - and a thirstier GP shows up."""
+        diagram = PayloadRange(M_empty=11200, MTOW=20000, fuel_max=8000, payload_max=508, LD_max=17, sfc=0.6)
+        rows = diagram.gp_check([508, 254, 508], [2e6, 3e6, 4e6], workers=1, builder=sized)
+
+        assert [row["case"] for row in rows] == [0, 1, 2] and all(row["feasible"] for row in rows)
+        assert np.allclose([row["Aircraft.Payload.M"] for row in rows], [508, 254, 508], rtol=1e-4)
+        assert np.allclose([row["range_error"] for row in rows], 0, atol=1e-4)
+
+        (row,) = diagram.gp_check([508], [3e6], workers=1, builder=thirsty)
+        assert row["range_error"] > 0.05
+
+    def test_gp_check_aircraft(self):
+        """On the design model, only the passengers and luggage scale - and the closed form still flies the sized range."""
+        sweep = Sweep(design_model(), outputs=OUTPUTS.values())
+        diagram = PayloadRange.from_table(sweep.run({"Aircraft.AR": [7.5]}))
+
+        assert np.isclose(diagram.corners()["max payload"][1][0], 2.5e6, rtol=1e-4)
+
+        rows = diagram.gp_check([508, 254], [2.5e6, 2.5e6], workers=1)
+        assert all(row["feasible"] for row in rows)
+        assert np.allclose([row["Aircraft.Payload.M"] for row in rows], [508, 254], rtol=1e-4)
+        assert np.allclose([row["range_error"] for row in rows], 0, atol=1e-4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""Tests for the model build / solve profiler."""
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from gpkit import Model, Variable
+
+from pyavd.Models.Analysis.Profiler import profiled, profile_model
+from pyavd.Models.Analysis.Sweep import design_model
+
+
+def walk(node):
+    yield node
+    for child in node["children"]:
+        yield from walk(child)
+
+
+class TestProfiler(unittest.TestCase):
+    """Tests for `profiled` and `profile_model`."""
+
+    def test_model_tree(self):
+        """Every model node is in the tree, and the constraint counts add up to the flattened model."""
+        report = profile_model(solve=False)
+        nodes = [node for root in report["models"] for node in walk(root)]
+        names = {node["name"] for node in nodes}
+
+        assert {"Aircraft", "Payload", "Fuselage", "Wing", "Engine", "H_Tail", "V_Tail", "UC", "Mission", "Segment", "Cruise"} <= names
+        assert sum(node["constraints"] for node in nodes) == len(list(design_model().flat()))
+        assert all(node["self"] <= node["build"] + 1e-9 for node in nodes)
+
+    def test_solve_and_outputs(self):
+        """Compile and solve are recorded with iterations, and both files are written; gpkit is restored after."""
+        init = Model.__init__
+        x = Variable("x")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            with profiled(path):
+                Model(x, [x >= 2]).solve(verbosity=0)
+
+            report = json.load(open(path))
+            folded = open(path + ".folded").read().splitlines()
+
+        program, = report["programs"]
+        assert program["iterations"] > 0 and program["solve"] > 0 and program["compile"] > 0
+        assert any(line.startswith("solve;") for line in folded) and folded[0].split()[0] == "Model"
+        assert Model.__init__ is init
+
+
+if __name__ == "__main__":
+    unittest.main()
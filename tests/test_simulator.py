@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+"""Tests for the time-stepping mission simulator."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import ureg as u
+
+from pyavd.Models.Performance.ISA import atmosphere
+from pyavd.Models.Performance.Mission import MISSION_PROFILE
+from pyavd.Models.Performance.Simulator import MissionSimulator
+
+
+class TestMissionSimulator(unittest.TestCase):
+    """Tests for `MissionSimulator`."""
+
+    def setUp(self):
+        """A spread of wing loadings on one engine."""
+        self.WS = np.linspace(3500, 5500, 5)
+        self.sim = MissionSimulator(WS=self.WS, TW=0.32, sfc=0.6)
+
+    def test_cruise_matches_analytic(self):
+        """Level cruise at fixed speed has a closed form with the parabolic polar - RK4 lands on it."""
+        sim = MissionSimulator(WS=4500, TW=0.32, sfc=0.6, profile=[("Cruise", MISSION_PROFILE[2][1])])
+        m0, m1 = sim.run(25000)["M"][..., [0, 1]].T
+
+        air = atmosphere((40000 * u.ft).to(u.m).magnitude)
+        V = 0.75 * air.speed_of_sound
+        q = 0.5 * air.density * V**2
+        S = 25000 * 9.81 / 4500
+        A, B = q * S * 0.02, (9.81**2) / (np.pi * 7.5 * 0.9 * q * S)
+
+        x = (np.arctan(m0 * np.sqrt(B / A)) - np.arctan(m1 * np.sqrt(B / A))) / np.sqrt(A * B) * 9.81 * V / (0.6 / 3600)
+        assert np.isclose(x, 2500e3, rtol=1e-8)
+
+    def test_batched_is_per_design(self):
+        """Designs integrate independently - the stacked run matches one design at a time."""
+        batch = self.sim.run(25000)
+
+        for i, WS in enumerate(self.WS):
+            single = MissionSimulator(WS=WS, TW=0.32, sfc=0.6).run(25000)
+            for name in ("M", "alt", "distance", "time"):
+                assert np.allclose(batch[name][i], single[name])
+
+        assert np.all(np.diff(batch["M"], axis=-1) < 0)
+
+    def test_compare(self):
+        """Comparing against its own masses is no error; a GP burning less shows up as positive error."""
+        M = self.sim.run(25000)["M"]
+        assert np.allclose(self.sim.compare(M)["burn_error"], 0)
+
+        under = M.copy()
+        under[:, 3:] += 0.1 * (M[:, 2:3] - M[:, 3:4])
+        assert np.all(self.sim.compare(under)["burn_error"][:, 2] > 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
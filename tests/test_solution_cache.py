@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""Tests for the LRU + disk solution cache."""
+
+
+import tempfile
+import threading
+import unittest
+
+from gpkit import Model, Variable, ureg as u
+
+from pyavd.Models.Analysis.Cache import ProgramCache, SolutionCache
+
+
+def toy(n=1):
+    """min x + y s.t. x*y >= n*a, y >= b/x^0.5 - structure n scales the first constraint."""
+    x, y = Variable("x", "m"), Variable("y", "m")
+    a, b = Variable("a", 2, "m^2"), Variable("b", 3, "m^1.5")
+    return Model(x + y, [x * y >= n * a, y >= b / x**0.5])
+
+
+class TestSolutionCache(unittest.TestCase):
+    """Tests for `SolutionCache`."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.programs = ProgramCache(f"{self.dir.name}/programs")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def cache(self, **kwargs):
+        return SolutionCache(programs=self.programs, **kwargs)
+
+    def test_hits_and_canonical_keys(self):
+        """Equal inputs in other units or order hit; other substitutions and structure miss."""
+        cache = self.cache(directory=None)
+        sol = cache.solve({"a": 4 * u.m**2, "b": 3}, builder=toy)
+
+        assert cache.solve({"b": 3.0, "a": 4e4 * u.cm**2}, builder=toy) is sol
+        cache.solve({"a": 5}, builder=toy)
+        cache.solve({"a": 4 * u.m**2, "b": 3}, builder=toy, n=3)
+        assert (cache.hits, cache.misses) == (1, 3)
+        assert self.programs.misses == 2
+
+    def test_lru_and_disk(self):
+        """The oldest entry goes first, and comes back from disk in a new process's cache."""
+        cache = self.cache(max_entries=2, directory=f"{self.dir.name}/solutions")
+        first = cache.solve({"a": 1}, builder=toy)
+        cache.solve({"a": 2}, builder=toy)
+        cache.solve({"a": 1}, builder=toy)
+        cache.solve({"a": 3}, builder=toy)
+
+        assert len(cache.entries) == 2 and cache.key({"a": 2}, toy) not in cache.entries
+
+        other = self.cache(directory=f"{self.dir.name}/solutions")
+        assert other.solve({"a": 1}, builder=toy) == first
+        assert other.hits == 1
+
+    def test_shared_between_threads(self):
+        """Sessions on other threads share one cache."""
+        cache = self.cache(directory=None)
+        threads = [threading.Thread(target=cache.solve, args=({"a": a},), kwargs={"builder": toy}) for a in (1, 2) * 4]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(cache.entries) == 2 and cache.hits + cache.misses == 8
+
+
+if __name__ == "__main__":
+    unittest.main()
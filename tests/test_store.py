@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+
+"""Tests for the columnar sweep result store."""
+
+
+import tempfile
+import unittest
+
+import numpy as np
+from gpkit import Model, Variable
+
+from pyavd.Models.Analysis.Batch import results_writer
+from pyavd.Models.Analysis.Store import ResultStore
+from pyavd.Models.Analysis.Sweep import Sweep
+
+
+class TestResultStore(unittest.TestCase):
+    """Tests for `ResultStore`."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = f"{self.dir.name}/sweep.store"
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_sweep_round_trip(self):
+        """A Sweep table, sensitivities included, reads back column for column from a second instance."""
+        x, y = Variable("x"), Variable("y")
+        a, b = Variable("a", 2), Variable("b", 3)
+        model = Model(x + y, [x * y >= a, y >= b / x**0.5])
+
+        table = Sweep(model, outputs=["x"], sensitivities=["a"]).run(Sweep.grid(a=[1, 2, 4], b=[1, 3]))
+        assert (table["sensitivity.a"] > 0).all()
+
+        store = ResultStore(self.path)
+        store.append(table)
+        store.append(table)
+
+        reader = ResultStore(self.path)
+        assert len(reader) == 12
+        assert np.allclose(reader["x"][6:], table["x"])
+        assert reader["feasible"].dtype == bool and reader["warm_start"].dtype == np.int64
+        assert isinstance(reader["cost"], np.memmap)
+
+    def test_rows_text_and_new_columns(self):
+        """Rows with errors and late columns stay row aligned; text goes to the side file."""
+        writer = results_writer(self.path, columns=None)
+        writer.write({"case": 0, "Mission.M": [3.0, 2.0], "feasible": True, "error": ""})
+        writer.write({"case": 1, "Mission.M": None, "feasible": False, "error": "UnboundedGP"})
+        writer.flush()
+
+        reader = ResultStore(self.path)
+        writer.write({"case": 2, "Mission.M": [5.0, 4.0], "feasible": True, "error": "", "extra": 7.0})
+        assert len(reader.refresh()) == 2
+        writer.close()
+
+        reader.refresh()
+        assert len(reader) == 3
+        assert "error" not in reader.columns
+        assert reader.text() == {1: {"error": "UnboundedGP"}}
+        assert np.isnan(reader["Mission.M"][1]).all() and reader["Mission.M"][2, 1] == 4
+        assert np.isnan(reader["extra"][:2]).all() and reader["extra"][2] == 7
+        assert list(reader["case"]) == [0, 1, 2]
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+"""Tests for the warm-started parameter sweep."""
+
+
+import unittest
+
+import numpy as np
+from gpkit import Model, Variable
+
+from pyavd.Models.Analysis.Sweep import Sweep, design_model
+from pyavd.Models.Components.Aircraft import MASS_FRACTIONS
+from pyavd.Models.Performance.Mission import FUEL_RESERVE
+
+
+class TestSweep(unittest.TestCase):
+    """Tests for `Sweep`."""
+
+    def setUp(self):
+        """Small GP with two fixed parameters."""
+        self.x = x = Variable("x")
+        self.y = y = Variable("y")
+        self.a = a = Variable("a", 2)
+        self.b = b = Variable("b", 3)
+        self.model = Model(x + y, [x * y >= a, y >= b / x**0.5])
+
+    def test_grid(self):
+        """Full factorial points come back as flat columns."""
+        points = Sweep.grid(a=[1, 2, 4], b=[1, 3])
+        assert len(points["a"]) == 6
+        assert list(points["b"][:2]) == [1, 3]
+
+    def test_run_matches_cold_solves(self):
+        """Each row matches a separate cold solve, in input order."""
+        points = Sweep.grid(a=[1, 4], b=[1, 3])
+        table = Sweep(self.model, outputs=["x"]).run(points)
+
+        for i in range(4):
+            self.model.substitutions.update({self.a: points["a"][i], self.b: points["b"][i]})
+            cost = self.model.solve(verbosity=0)["cost"]
+            assert np.isclose(table["cost"][i], cost, rtol=1e-4)
+
+        assert table["feasible"].all()
+
+    def test_substitutions_restored(self):
+        """The sweep leaves the model's substitutions as it found them."""
+        Sweep(self.model, outputs=["y"]).run({"a": [1, 5]})
+        assert self.model.substitutions[self.a] == 2
+
+    def test_free_variables_freed(self):
+        """Sweeping a free variable doesn't leave it fixed - the model solves to the same optimum afterwards."""
+        cost = self.model.solve(verbosity=0)["cost"]
+        Sweep(self.model, outputs=["y"]).run({"x": [1, 3]})
+
+        assert self.x.key not in self.model.substitutions
+        assert np.isclose(self.model.solve(verbosity=0)["cost"], cost)
+
+    def test_unbounded_rows(self):
+        """An unbounded GP (gpkit raises a ValueError for it) gives NaN rows rather than stopping the sweep."""
+        z = Variable("z")
+        table = Sweep(Model(self.x + self.y / z, [self.x * self.y >= self.a]), outputs=["x"]).run({"a": [1, 4]})
+
+        assert not table["feasible"].any() and np.isnan(table["x"]).all()
+        assert all(error.startswith("UnboundedGP(") for error in table["error"])
+
+
+class TestDesignModel(unittest.TestCase):
+    """Tests for `design_model`."""
+
+    @classmethod
+    def setUpClass(cls):
+        """gpkit's own solve, bounds checked."""
+        cls.model = design_model()
+        cls.aircraft = cls.model[1]
+        cls.sol = cls.model.solve(verbosity=0)
+
+    def value(self, variable):
+        return getattr(self.sol(variable), "magnitude", self.sol(variable))
+
+    def test_sizes_a_business_jet(self):
+        """The cost is M_0 * T0_W0 at a plausible take-off mass and T/W."""
+        M_0, TW = self.value(self.aircraft.M_0), self.value(self.aircraft.T0_W0)
+
+        assert 3000 < M_0 < 10000 and 0.1 < TW < 0.6
+        assert np.isclose(self.sol["cost"], M_0 * TW)
+
+    def test_bounded_by_the_model(self):
+        """LD_max comes from K_LD and the wetted aspect ratio, components from their mass fractions, fuel from the mission."""
+        AC = self.aircraft
+        masses = {"wing": AC.wing.M, "fuse": AC.fuse.M, "H_tail": AC.H_tail.M, "V_tail": AC.V_tail.M, "uc": AC.uc.M}
+
+        assert np.isclose(self.value(AC.LD_max), 15.5 * (7.5 / 6.0) ** 0.5)
+        for name, M in masses.items():
+            assert np.isclose(self.value(M), MASS_FRACTIONS[name] * self.value(AC.M_0), rtol=1e-4), name
+
+        M = self.value(self.model[0].M_segments)
+        assert np.isclose(M[-1], FUEL_RESERVE * self.value(AC.M_dry), rtol=1e-4)
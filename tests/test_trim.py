@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+"""Tests for the batched numeric trim."""
+
+
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from pyavd.Models.Performance.Stability import Stability
+
+
+class TestTrim(unittest.TestCase):
+    """Tests for `Stability.trim`."""
+
+    def setUp(self):
+        """Plain-float aircraft and 10000 random flight conditions."""
+        wing = SimpleNamespace(CL_alpha=5.5, i_w=0.02, alpha_0=-0.03, AR=9.0, e=0.85, Sref=120.0, c=4.0,
+                               dynamic=SimpleNamespace(i_w=0.02, alpha_0=-0.03))
+        tail = SimpleNamespace(CL_alpha_h=4.0, AR=4.5, e_h=0.8, eta_h=0.9, S_h=30.0,
+                               dynamic=SimpleNamespace(eta_h=0.9, S_h=30.0, depsilon_dalpha=0.4, alpha_0=0.0,
+                                                       CL_delta_e=0.5, delta_e=0.0))
+        aircraft = SimpleNamespace(wing=wing, H_tail=tail, Cd0=0.02, ac_w=14.0, x_ac_h=30.0, x_cg=15.0)
+        self.stability = Stability(aircraft)
+
+        rng = np.random.default_rng(0)
+        n = 10000
+        rho, U = rng.uniform(0.4, 1.2, n), rng.uniform(150, 230, n)
+        self.state = SimpleNamespace(M=rng.uniform(50e3, 70e3, n), rho=rho, U=U,
+                                     T=rng.uniform(0.03, 0.04, n) * 0.5 * rho * U**2 * wing.Sref)
+
+    def test_lift_and_drag_balance(self):
+        """Converged points satisfy L = W and D = T."""
+        st, s = self.stability, self.state
+        result = st.trim(s)
+        ok = result["converged"]
+        a, i_h = result["alpha_infty"][ok], result["i_h"][ok]
+
+        qS = 0.5 * s.rho[ok] * s.U[ok]**2 * 120.0
+        CL_w, CL_h = st.calc_CL_w(a), st.calc_CL_h(a, i_h)
+        CL = CL_w + 0.9 * 30.0 / 120.0 * CL_h
+        CD = 0.02 + CL_w**2 / (np.pi * 9.0 * 0.85) + 0.9 * 30.0 / 120.0 * CL_h**2 / (np.pi * 4.5 * 0.8)
+
+        assert ok.mean() > 0.5
+        assert np.allclose(CL * qS, s.M[ok] * st.g)
+        assert np.allclose(CD * qS, s.T[ok])
+
+    def test_no_trim_is_nan(self):
+        """Too little thrust for the drag at that lift has no real trim."""
+        s = self.state
+        result = self.stability.trim(SimpleNamespace(M=s.M[0], rho=s.rho[0], U=s.U[0], T=1.0))
+
+        assert not result["converged"]
+        assert np.isnan(result["i_h"]) and np.isnan(result["alpha_infty"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""Tests for the Monte Carlo uncertainty propagation."""
+
+
+import unittest
+
+import numpy as np
+
+from pyavd.Models.Analysis.Uncertainty import UNCERTAIN, monte_carlo, sample, settled, summarize
+
+
+class TestUncertainty(unittest.TestCase):
+    """Tests for `sample`, `summarize` and `monte_carlo`."""
+
+    def test_latin_hypercube(self):
+        """Every uniform parameter has exactly one sample per stratum, and stays in its bounds."""
+        points = sample(n=64)
+
+        assert set(points) == set(UNCERTAIN) and all(len(v) == 64 for v in points.values())
+        for name, (kind, a, b) in UNCERTAIN.items():
+            if kind == "uniform":
+                strata = np.floor((points[name] - a) / (b - a) * 64)
+                assert np.array_equal(np.sort(strata), np.arange(64))
+
+    def test_summary_settles(self):
+        """Percentiles skip infeasible rows and settle as samples accumulate."""
+        rng = np.random.default_rng(0)
+        rows = [{"M_0": m, "feasible": True} for m in rng.normal(20000, 500, 4000)] + [{"M_0": np.nan, "feasible": False}]
+
+        few, most, all_ = (summarize(rows[-n:], ["M_0"]) for n in (101, 3001, 4001))
+        assert all_["feasible"] == 4000 and np.isclose(all_["M_0"][50], 20000, rtol=1e-2)
+        assert settled(most, all_, ["M_0"], 1e-2) and not settled(few, all_, ["M_0"], 1e-3)
+
+    def test_streams_every_chunk(self):
+        """One summary per chunk, carrying every sample's row - and the design model solves for every sample."""
+        summaries = list(monte_carlo(n=8, workers=1, chunksize=4))
+        last = summaries[-1]
+
+        assert [s["samples"] for s in summaries] == [4, 8]
+        assert sorted(row["index"] for row in last["rows"]) == list(range(8))
+        assert last["feasible"] == 8 and not any(row["error"] for row in last["rows"])
+
+        M_0 = last["Aircraft.M_0"]
+        assert 3000 < M_0[5] < M_0[50] < M_0[95] < 10000
+
+
+if __name__ == "__main__":
+    unittest.main()
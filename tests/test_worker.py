@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""Tests for the background solve worker."""
+
+
+import tempfile
+import time
+import unittest
+
+import numpy as np
+from gpkit import Model, Variable, SignomialsEnabled
+
+from pyavd.Models.Analysis.Cache import ProgramCache, SolutionCache
+from pyavd.Models.Analysis.Worker import SolveWorker
+from pyavd.Models.Performance.ConstraintDiagram import aircraft_defaults
+
+
+def toy(slow=0):
+    """min x + y s.t. x*y >= a, y >= b/x^0.5 - slow seconds to build."""
+    time.sleep(slow)
+    x, y = Variable("x"), Variable("y")
+    a, b = Variable("a", 2), Variable("b", 3)
+    return Model(x + y, [x * y >= a, y >= b / x**0.5])
+
+
+def signomial():
+    """min x s.t. x + y >= 1, y <= 0.5 - optimum x = 0.5."""
+    x, y = Variable("x"), Variable("y")
+    with SignomialsEnabled():
+        return Model(x, [x + y >= 1, y <= 0.5, x >= 0.1])
+
+
+class TestSolveWorker(unittest.TestCase):
+    """Tests for `SolveWorker`."""
+
+    def setUp(self):
+        self.worker = SolveWorker()
+
+    def tearDown(self):
+        self.worker.close()
+
+    def test_progress_and_result(self):
+        """A GP reports its solver iterations and comes back with a solution by name."""
+        job = self.worker.submit({"a": 4}, builder=toy)
+
+        assert job.wait(30) is not None and job.status == "done"
+        assert job.iteration > 0 and job.gp == 1
+        assert np.isclose(job.result["variables"]["x"] * job.result["variables"]["y"], 4, rtol=1e-4)
+        assert np.isclose(job.best["x"], job.result["variables"]["x"])
+
+    def test_localsolve(self):
+        """A signomial model is localsolved, with the best solution after every GP."""
+        job = self.worker.submit(builder=signomial)
+
+        assert np.isclose(job.wait(30)["cost"], 0.5, rtol=1e-3)
+        assert job.gp > 1 and np.isclose(job.best["x"], 0.5, rtol=1e-3)
+
+    def test_supersede(self):
+        """New inputs cancel the running job and reuse its model; the same inputs get the same job."""
+        first = self.worker.submit({"a": 4}, builder=toy, slow=1)
+        while first.status == "queued":
+            time.sleep(0.01)
+
+        second = self.worker.submit({"a": 9}, builder=toy, slow=1)
+        assert self.worker.submit({"a": 9}, builder=toy, slow=1) is second
+
+        assert first.wait(30) is None and first.status == "cancelled"
+        tic = time.perf_counter()
+        assert second.wait(30)["solver"] == "cvxopt" and time.perf_counter() - tic < 1
+
+    def test_owners(self):
+        """One owner's new inputs don't cancel another owner's job."""
+        first = self.worker.submit({"a": 4}, builder=toy, owner="alice", slow=1)
+        second = self.worker.submit({"a": 9}, builder=toy, owner="bob", slow=1)
+
+        assert first.wait(30) is not None and first.status == "done"
+        assert second.wait(30) is not None and second.status == "done"
+
+    def test_free_variables_freed(self):
+        """Fixing a free variable for one job doesn't leave it fixed for the next job on the same model."""
+        free = self.worker.submit(builder=toy).wait(30)["cost"]
+        self.worker.submit({"x": 5}, builder=toy).wait(30)
+
+        assert np.isclose(self.worker.submit({"a": 2}, builder=toy).wait(30)["cost"], free, rtol=1e-4)
+
+    def test_design_model(self):
+        """The aircraft model comes back solved, with the substituted hyperparameter."""
+        result = self.worker.submit({"Aircraft.AR": 9.0}).wait(120)
+
+        assert result is not None and result["variables"]["Aircraft.AR"] == 9.0
+        assert 3000 < result["variables"]["Aircraft.M_0"] < 10000
+
+    def test_page_defaults(self):
+        """The page's default inputs solve for both empennages, agree with the compiled program and are served from the cache after."""
+        inputs = {f"Aircraft.{name}": value for name, value in aircraft_defaults(names=("CL_max", "CL_clean", "AR", "e")).items()}
+
+        with tempfile.TemporaryDirectory() as directory:
+            programs = ProgramCache(directory)
+            cache = SolutionCache(directory=None, programs=programs)
+
+            for emp_config in ("T-Tail", "Low-Tail"):
+                job = self.worker.submit(inputs, owner=emp_config, emp_config=emp_config)
+                assert job.wait(120) is not None, job.error
+
+                M_0 = job.result["variables"]["Aircraft.M_0"]
+                assert 3000 < M_0 < 10000
+                assert np.isclose(programs.load(emp_config=emp_config).solve(inputs)["variables"]["Aircraft.M_0"], M_0, rtol=1e-4)
+
+                key = cache.key(inputs, emp_config=emp_config)
+                cache.put(key, job.result)
+                assert cache.get(key) is job.result
+
+    def test_cancel(self):
+        """A cancelled job stops and comes back with no result."""
+        job = self.worker.submit(builder=toy, slow=1)
+        job.cancel()
+
+        assert job.wait(30) is None and job.status == "cancelled"
+
+
+if __name__ == "__main__":
+    unittest.main()